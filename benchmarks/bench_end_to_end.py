@@ -0,0 +1,64 @@
+"""
+Benchmarks ponta a ponta: simulação completa de cada estratégia nos cenários ct_* e nos cenários sintéticos.
+
+A carga dos arquivos fica fora da medição (os objetos são carregados uma vez e copiados a cada repetição);
+o tempo medido é o do laço de eventos com log em memória.
+"""
+import copy
+from harness import DATA_DIR
+from synthetic import synthetic_scenario
+from machines import Machines
+from simulation import Simulation, DEFAULT_START_TIME
+from simulation_log import SimulationLog
+from scenario_cache import load_execution_dataset, load_bp_scheduler, load_dynamic_queue
+from sweep import ALGORITHMS, discover_scenarios
+
+
+def _machine_names_for(scenario):
+    """
+    Máquinas do cenário: as citadas no BP Scheduler (ou uma única máquina, sem BP).
+    """
+    if scenario["bp_scheduler_file"]:
+        return load_bp_scheduler(scenario["bp_scheduler_file"]).get_machine_names()
+    return ["M1"]
+
+
+def bench_scenario(suite, scenario, algorithms=ALGORITHMS, repeat=None):
+    execution_dataset = load_execution_dataset(scenario["execution_dataset_file"])
+    machine_names = _machine_names_for(scenario)
+
+    for algorithm in algorithms:
+        if algorithm == "BP" and not scenario["bp_scheduler_file"]:
+            continue
+        if algorithm == "BP":
+            scheduler = load_bp_scheduler(scenario["bp_scheduler_file"])
+        else:
+            scheduler = load_dynamic_queue(scenario["dynamic_queue_file"], algorithm)
+
+        def setup(scheduler=scheduler):
+            return Simulation(copy.deepcopy(execution_dataset), copy.deepcopy(scheduler), Machines(machine_names),
+                              SimulationLog(None, buffer_size=10000, log_id_mode="sequential"), DEFAULT_START_TIME)
+
+        def simulate(simulation):
+            simulation.run()
+
+        # Uma execução fora da medição para registrar o tamanho da simulação
+        reference = setup()
+        reference.run()
+        suite.run(f"end_to_end.{scenario['name']}.{algorithm}", simulate, setup=setup, repeat=repeat,
+                  events=reference.events_processed, executions=len(execution_dataset.executions), machines=len(machine_names))
+
+
+def run(suite, scales=(10000, 100000), repeat=None):
+    """
+    Executa os benchmarks ponta a ponta.
+
+    :param scales: Tamanhos (execuções) dos cenários sintéticos.
+    :param repeat: Repetições (padrão: o da suite).
+    """
+    for scenario in discover_scenarios(DATA_DIR):
+        if scenario["name"].startswith("ct_"):
+            bench_scenario(suite, scenario, repeat=repeat)
+
+    for execution_count in scales:
+        bench_scenario(suite, synthetic_scenario(execution_count), repeat=repeat)
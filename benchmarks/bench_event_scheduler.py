@@ -0,0 +1,85 @@
+"""
+Compara os backends do EventScheduler (heap binário x calendário) nos cenários ct_*.
+
+Para cada cenário com BP Scheduler são medidos:
+- replay: todos os agendamentos do BP inseridos de uma vez e consumidos em ordem, com um evento de fim
+  inserido para cada início (o mesmo padrão de acesso da simulação, sem o resto do motor);
+- simulação: a simulação completa no modo BP com cada backend.
+
+Também faz parte da suíte completa (run_benchmarks.py). Uso isolado, a partir da raiz do repositório:
+    python benchmarks/bench_event_scheduler.py [--repeat 5] [--data_dir data]
+"""
+import argparse
+import copy
+import glob
+import os
+from harness import BenchmarkSuite, DATA_DIR
+from bp_scheduler import BPScheduler
+from event_scheduler import create_event_scheduler, Event, EVENT_SCHEDULER_BACKENDS, TICKS_PER_MINUTE
+from execution_dataset import ExecutionDataset
+from machines import Machines
+from simulation import Simulation, DEFAULT_START_TIME
+
+REPLAY_DURATION_MINUTES = 30  # Duração fixa das execuções no replay
+
+
+def discover_bp_scenarios(data_dir):
+    """
+    Retorna pares (nome, execution_dataset, bp_scheduler) dos cenários ct_* que têm BP Scheduler.
+    """
+    scenarios = []
+    for bp_scheduler_file in sorted(glob.glob(os.path.join(data_dir, "ct_*", "**", "*_bp_scheduler.csv"), recursive=True)):
+        execution_dataset_file = bp_scheduler_file[:-len("bp_scheduler.csv")] + "execution_dataset.csv"
+        if os.path.exists(execution_dataset_file):
+            name = os.path.relpath(os.path.dirname(bp_scheduler_file), data_dir).replace(os.sep, "/")
+            scenarios.append((name, execution_dataset_file, bp_scheduler_file))
+    return scenarios
+
+
+def replay(backend, executions):
+    """
+    Insere todos os inícios e consome a fila, inserindo um fim para cada início processado.
+    """
+    event_scheduler = create_event_scheduler(DEFAULT_START_TIME, backend)
+    for execution in executions:
+        event_scheduler.add_event(Event(execution.start_time, "start_execution", execution.robot, execution.machine_name))
+    while event_scheduler.has_pending_events():
+        event = event_scheduler.get_next_event()
+        if event.event_type == "start_execution":
+            end_tick = event.tick + REPLAY_DURATION_MINUTES * TICKS_PER_MINUTE
+            event_scheduler.add_event(Event(event_scheduler.from_tick(end_tick), "end_execution", event.robot, event.machine_name, end_tick))
+
+
+def build_simulation(backend, execution_dataset, bp_scheduler):
+    """
+    Monta a simulação completa no modo BP com o backend escolhido (cópias das entradas, fora da medição).
+    """
+    machines = Machines.from_spec("auto", bp_scheduler.get_machine_names())
+    return Simulation(copy.deepcopy(execution_dataset), copy.deepcopy(bp_scheduler), machines, event_backend=backend)
+
+
+def run(suite, data_dir=DATA_DIR):
+    """
+    Mede o replay e a simulação completa de cada cenário ct_* com BP Scheduler em cada backend.
+    """
+    for name, execution_dataset_file, bp_scheduler_file in discover_bp_scenarios(data_dir):
+        execution_dataset = ExecutionDataset(execution_dataset_file)
+        bp_scheduler = BPScheduler(bp_scheduler_file)
+        executions = bp_scheduler.get_all_executions()
+
+        for backend in EVENT_SCHEDULER_BACKENDS:
+            suite.run(f"event_scheduler.replay.{name}.{backend}", lambda: replay(backend, executions), events=2 * len(executions))
+            suite.run(f"event_scheduler.simulation.{name}.{backend}", lambda simulation: simulation.run(),
+                      setup=lambda: build_simulation(backend, execution_dataset, bp_scheduler))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark dos backends do EventScheduler")
+    parser.add_argument("--data_dir", type=str, default=DATA_DIR, help="Diretório com os cenários ct_*.")
+    parser.add_argument("--repeat", type=int, default=5, help="Repetições por medida.")
+    args = parser.parse_args(argv)
+    run(BenchmarkSuite(args.repeat), args.data_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Micro-benchmarks dos caminhos críticos do simulador:
+- ExecutionDataset.get_execution_by_robot_and_time e get_executions_expiring_before;
+- DynamicQueue.add_robot (ciclo retirar/devolver, como na simulação);
+- EventScheduler: inserção e remoção de eventos em cada backend;
+- SimulationLog.log com log em memória (uuid e sequencial) e em CSV.
+"""
+import copy
+import os
+import random
+from datetime import timedelta
+from harness import DATA_DIR, WORK_DIR
+from synthetic import synthetic_scenario, SYNTHETIC_START_TIME, SYNTHETIC_HORIZON_DAYS
+from event_scheduler import create_event_scheduler, Event, EVENT_SCHEDULER_BACKENDS, TICKS_PER_MINUTE
+from robot import Robot
+from simulation_log import SimulationLog
+from scenario_cache import load_execution_dataset, load_dynamic_queue
+from sweep import ALGORITHMS
+
+LOOKUP_QUERIES = 10000
+QUEUE_OPERATIONS = 10000
+SCHEDULER_EVENTS = 100000
+LOG_ENTRIES = 100000
+
+
+def bench_dataset_lookup(suite, execution_count):
+    """
+    Consultas por (robô, horário) sem marcar execuções como concluídas (o índice não muda entre repetições).
+    """
+    execution_dataset = load_execution_dataset(synthetic_scenario(execution_count)["execution_dataset_file"])
+    robots = sorted({execution.robot for execution in execution_dataset.executions})
+    rng = random.Random(0)
+    horizon_minutes = SYNTHETIC_HORIZON_DAYS * 24 * 60
+    queries = [(rng.choice(robots), SYNTHETIC_START_TIME + timedelta(minutes=rng.randrange(horizon_minutes)))
+               for _ in range(LOOKUP_QUERIES)]
+
+    def lookup():
+        for robot, execution_time in queries:
+            execution_dataset.get_execution_by_robot_and_time(robot, execution_time)
+
+    suite.run(f"micro.dataset_lookup.{execution_count}", lookup, queries=LOOKUP_QUERIES)
+
+    def expiring():
+        for robot, execution_time in queries:
+            execution_dataset.get_executions_expiring_before(execution_time, robot)
+
+    suite.run(f"micro.dataset_expiring.{execution_count}", expiring, queries=LOOKUP_QUERIES)
+
+
+def bench_dynamic_queue(suite):
+    for algorithm in ALGORITHMS:
+        if algorithm == "BP":
+            continue
+        dynamic_queue = load_dynamic_queue(os.path.join(DATA_DIR, "dynamic_queue.csv"), algorithm)
+
+        def cycle(queue):
+            for _ in range(QUEUE_OPERATIONS):
+                queue.add_robot(queue.get_next_robot())
+
+        suite.run(f"micro.dynamic_queue.add_robot.{algorithm}", cycle, setup=lambda dynamic_queue=dynamic_queue: copy.deepcopy(dynamic_queue),
+                  operations=QUEUE_OPERATIONS)
+
+
+def bench_event_scheduler(suite):
+    rng = random.Random(0)
+    robot = Robot("R1")
+    horizon_ticks = SYNTHETIC_HORIZON_DAYS * 24 * 60 * TICKS_PER_MINUTE
+    ticks = [rng.randrange(horizon_ticks) for _ in range(SCHEDULER_EVENTS)]
+    event_types = [rng.choice(("start_execution", "end_execution")) for _ in range(SCHEDULER_EVENTS)]
+
+    for backend in EVENT_SCHEDULER_BACKENDS:
+        def setup(backend=backend):
+            events = [Event(SYNTHETIC_START_TIME + timedelta(seconds=tick), event_type, robot, "M1", tick)
+                      for tick, event_type in zip(ticks, event_types)]
+            return create_event_scheduler(SYNTHETIC_START_TIME, backend), events
+
+        def push_pop(state):
+            event_scheduler, events = state
+            for event in events:
+                event_scheduler.add_event(event)
+            while event_scheduler.has_pending_events():
+                event_scheduler.get_next_event()
+
+        suite.run(f"micro.event_scheduler.push_pop.{backend}", push_pop, setup=setup, events=SCHEDULER_EVENTS)
+
+
+def bench_simulation_log(suite):
+    os.makedirs(WORK_DIR, exist_ok=True)
+    log_file = os.path.join(WORK_DIR, "bench_simulation_log.csv")
+    start_time = SYNTHETIC_START_TIME
+    end_time = start_time + timedelta(minutes=30)
+    cases = [("memory.uuid", None, "uuid"), ("memory.sequential", None, "sequential"), ("csv.sequential", log_file, "sequential")]
+
+    for label, file_path, log_id_mode in cases:
+        def write(file_path=file_path, log_id_mode=log_id_mode):
+            with SimulationLog(file_path, buffer_size=10000, log_id_mode=log_id_mode) as simulation_log:
+                for index in range(LOG_ENTRIES):
+                    simulation_log.log("robot_execution", "R1", "M1", start_time, end_time, index)
+
+        suite.run(f"micro.simulation_log.log.{label}", write, entries=LOG_ENTRIES)
+
+    if os.path.exists(log_file):
+        os.remove(log_file)
+
+
+def run(suite, scales=(10000, 100000)):
+    """
+    Executa os micro-benchmarks.
+
+    :param scales: Tamanhos (execuções) dos datasets sintéticos usados nas consultas ao ExecutionDataset.
+    """
+    for execution_count in scales:
+        bench_dataset_lookup(suite, execution_count)
+    bench_dynamic_queue(suite)
+    bench_event_scheduler(suite)
+    bench_simulation_log(suite)
@@ -0,0 +1,135 @@
+"""
+Utilitários comuns dos benchmarks: medição, registro dos resultados em JSON e comparação entre commits.
+"""
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+SRC_DIR = os.path.join(ROOT_DIR, "src")
+DATA_DIR = os.path.join(ROOT_DIR, "data")
+RESULTS_DIR = os.path.join(ROOT_DIR, "benchmarks", "results")
+WORK_DIR = os.path.join(ROOT_DIR, "benchmarks", ".data")  # Cenários sintéticos e arquivos temporários
+
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+
+class BenchmarkSuite:
+    def __init__(self, repeat=5, filter_text=None):
+        """
+        Executa e guarda as medidas de um conjunto de benchmarks.
+
+        :param repeat: Repetições padrão de cada benchmark (as estatísticas usam todas, a comparação usa o mínimo).
+        :param filter_text: (Opcional) Executa só os benchmarks cujo nome contém este texto.
+        """
+        self.repeat = repeat
+        self.filter_text = filter_text
+        self.results = []
+
+    def run(self, name, function, setup=None, repeat=None, number=1, **info):
+        """
+        Mede `function`. Se `setup` for informado, ele é chamado (fora da medição) antes de cada repetição e
+        o valor retornado é passado para `function`.
+
+        :param name: Nome único do benchmark (ex: 'end_to_end.ct_01/01.FIFO').
+        :param number: Chamadas de `function` por repetição (o tempo registrado é por chamada).
+        :param info: Metadados gravados junto com a medida (ex: quantidade de eventos).
+        """
+        if self.filter_text and self.filter_text not in name:
+            return None
+
+        timings = []
+        for _ in range(repeat or self.repeat):
+            state = setup() if setup is not None else None
+            start = time.perf_counter()
+            for _ in range(number):
+                function(state) if setup is not None else function()
+            timings.append((time.perf_counter() - start) / number)
+
+        result = {
+            "name": name,
+            "min": min(timings),
+            "median": statistics.median(timings),
+            "mean": statistics.fmean(timings),
+            "stdev": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+            "repeat": len(timings),
+            "number": number,
+            "info": info
+        }
+        self.results.append(result)
+        print(f"{name:<60} min {result['min'] * 1000:>10.2f}ms  mediana {result['median'] * 1000:>10.2f}ms")
+        return result
+
+
+def git_commit():
+    """
+    Retorna (commit, alterações pendentes) do repositório, ou (None, False) fora de um repositório git.
+    """
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, capture_output=True, text=True, check=True).stdout.strip()
+        status = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT_DIR, capture_output=True, text=True, check=True).stdout
+        return commit, bool(status.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return None, False
+
+
+def write_results(suite, output_file=None):
+    """
+    Grava os resultados em JSON (padrão: benchmarks/results/<commit>.json).
+
+    :return: Caminho do arquivo gravado.
+    """
+    commit, dirty = git_commit()
+    if output_file is None:
+        output_file = os.path.join(RESULTS_DIR, f"{commit or 'sem_commit'}{'-dirty' if dirty else ''}.json")
+    if os.path.dirname(output_file):
+        os.makedirs(os.path.dirname(output_file), exist_ok=True)
+
+    document = {
+        "commit": commit,
+        "dirty": dirty,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "benchmarks": suite.results
+    }
+    with open(output_file, mode="w") as file:
+        json.dump(document, file, indent=2)
+    return output_file
+
+
+def compare_results(base_file, results, threshold=0.10):
+    """
+    Compara os resultados atuais com um JSON anterior pelo tempo mínimo de cada benchmark.
+
+    :param base_file: JSON gravado por `write_results` em outro commit.
+    :param results: Lista de resultados atuais (BenchmarkSuite.results).
+    :param threshold: Variação relativa a partir da qual a diferença é destacada.
+    :return: Quantidade de regressões encontradas.
+    """
+    with open(base_file) as file:
+        base = json.load(file)
+    base_results = {result["name"]: result for result in base["benchmarks"]}
+
+    print(f"\nComparação com {base.get('commit')} ({base_file}):")
+    regressions = 0
+    for result in results:
+        previous = base_results.get(result["name"])
+        if previous is None or previous["min"] == 0:
+            continue
+        ratio = result["min"] / previous["min"]
+        if ratio > 1 + threshold:
+            label = "REGRESSÃO"
+            regressions += 1
+        elif ratio < 1 - threshold:
+            label = "melhoria"
+        else:
+            label = ""
+        print(f"{result['name']:<60} {previous['min'] * 1000:>10.2f}ms -> {result['min'] * 1000:>10.2f}ms  x{ratio:.2f} {label}")
+    return regressions
@@ -0,0 +1,58 @@
+"""
+Suíte de benchmarks do simulador.
+
+Executa os grupos selecionados, grava os resultados em JSON (um arquivo por commit em benchmarks/results/)
+e, opcionalmente, compara com o JSON de outro commit para encontrar regressões.
+
+Uso (a partir da raiz do repositório):
+    python benchmarks/run_benchmarks.py                         # suíte completa
+    python benchmarks/run_benchmarks.py --groups micro --repeat 3
+    python benchmarks/run_benchmarks.py --compare benchmarks/results/<commit>.json
+"""
+import argparse
+import sys
+from harness import BenchmarkSuite, write_results, compare_results
+import bench_end_to_end
+import bench_event_scheduler
+import bench_micro
+
+GROUPS = ("end_to_end", "micro", "event_scheduler")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks do simulador")
+    parser.add_argument("--groups", type=str, default=",".join(GROUPS), help=f"Grupos separados por vírgula ({', '.join(GROUPS)}).")
+    parser.add_argument("--filter", type=str, help="Executa só os benchmarks cujo nome contém este texto.")
+    parser.add_argument("--repeat", type=int, default=5, help="Repetições de cada benchmark.")
+    parser.add_argument("--scales", type=str, default="10000,100000", help="Tamanhos dos cenários sintéticos (execuções).")
+    parser.add_argument("--output", type=str, help="Arquivo JSON de saída (padrão: benchmarks/results/<commit>.json).")
+    parser.add_argument("--compare", type=str, help="JSON de outro commit para comparar.")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Variação relativa considerada regressão na comparação.")
+    args = parser.parse_args(argv)
+
+    groups = [group for group in args.groups.split(",") if group]
+    unknown = set(groups) - set(GROUPS)
+    if unknown:
+        parser.error(f"Grupos não reconhecidos: {', '.join(sorted(unknown))}")
+    scales = [int(scale) for scale in args.scales.split(",") if scale]
+
+    suite = BenchmarkSuite(args.repeat, args.filter)
+    if "end_to_end" in groups:
+        bench_end_to_end.run(suite, scales)
+    if "micro" in groups:
+        bench_micro.run(suite, scales)
+    if "event_scheduler" in groups:
+        bench_event_scheduler.run(suite)
+
+    output_file = write_results(suite, args.output)
+    print(f"\n{len(suite.results)} benchmarks gravados em: {output_file}")
+
+    if args.compare:
+        regressions = compare_results(args.compare, suite.results, args.threshold)
+        print(f"{regressions} regressões acima de {args.threshold:.0%}.")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
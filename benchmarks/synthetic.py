@@ -0,0 +1,33 @@
+"""
+Cenários sintéticos para os benchmarks de escala (10k / 100k execuções).
+
+Os arquivos são gerados com `scenario_generator.generate_scenario` uma única vez em `benchmarks/.data/`,
+com semente fixa, para que as medidas sejam comparáveis entre commits.
+"""
+import os
+from harness import WORK_DIR
+from scenario_generator import generate_scenario
+from simulation import DEFAULT_START_TIME
+
+SYNTHETIC_START_TIME = DEFAULT_START_TIME
+SYNTHETIC_HORIZON_DAYS = 28
+
+
+def synthetic_scenario(execution_count, seed=42):
+    """
+    Retorna (e gera, se ainda não existir) um cenário sintético com `execution_count` execuções.
+
+    :return: Dicionário com name, execution_dataset_file, bp_scheduler_file, dynamic_queue_file e machines_file.
+    """
+    prefix = f"synthetic_{execution_count}"
+    output_dir = os.path.join(WORK_DIR, f"{prefix}_{seed}")
+    files = {key: os.path.join(output_dir, f"{prefix}_{kind}.csv") for key, kind in (
+        ("execution_dataset_file", "execution_dataset"), ("bp_scheduler_file", "bp_scheduler"),
+        ("dynamic_queue_file", "dynamic_queue"), ("machines_file", "machines"))}
+    if all(os.path.exists(file_path) for file_path in files.values()):
+        return dict(files, name=prefix)
+
+    return generate_scenario(output_dir, prefix, executions=execution_count, robots=max(10, execution_count // 100),
+                             machines=max(2, execution_count // 2000), horizon_days=SYNTHETIC_HORIZON_DAYS,
+                             start_time=SYNTHETIC_START_TIME, items=(1, 20), time_per_item=(1, 5),
+                             window_minutes=(60, 480), seed=seed)
@@ -1,102 +1,280 @@
+import argparse
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
-import matplotlib.pyplot as plt
+from metrics import read_summary, summary_path
+from simulation_log import read_log_chunks, LOG_FORMATS, LOG_READ_CHUNK_ROWS
 
 # Definição do diretório de logs
 LOGS_DIR = "./logs"
+SUMMARY_FILE_NAME = "log_analysis_results.csv"
+
+# Apenas as colunas usadas na análise são lidas dos logs
+ANALYSIS_COLUMNS = ["execution_id", "event_type", "start_time", "end_time", "data"]
+SUMMARY_COLUMNS = ["method", "total_executions", "total_run_overs", "final_completion_logs", "final_completion_percentage"]
+
+
+def method_name(file_path):
+    """
+    Extrai o nome do método a partir do nome do arquivo de log.
+    """
+    name = os.path.basename(file_path).replace("simulation_log_data_", "")
+    for extension in LOG_FORMATS:
+        name = name.replace(extension, "")
+    return name
+
+
+def find_log_files(logs_dir):
+    """
+    Lista os logs de simulação do diretório (.csv, .npz, .parquet, .arrow, .feather), ignorando resultados de análises.
+    """
+    return sorted(os.path.join(logs_dir, file) for file in os.listdir(logs_dir)
+                  if file.startswith("simulation_log") and file.lower().endswith(LOG_FORMATS))
+
+
+def analyze_summary_file(file_path):
+    """
+    Obtém os agregados de um log a partir do resumo gravado ao lado dele (`<log>.summary.json`), sem ler o log.
+    O resumo não tem as séries dos gráficos.
+
+    :param file_path: Arquivo de log.
+    :return: Dicionário com os agregados do arquivo (combináveis com `merge_results`), ou None se não houver
+             resumo, se ele for de uma versão sem os contadores necessários ou se for mais antigo que o log.
+    """
+    summary_file = summary_path(file_path)
+    if not os.path.exists(summary_file) or os.path.getmtime(summary_file) < os.path.getmtime(file_path):
+        return None
+    summary = read_summary(summary_file)
+    if "completion_log_sum" not in summary:
+        return None
+
+    # Cada execução do dataset gera uma linha robot_execution e uma completion_percentage com execution_id
+    return {
+        "method": method_name(file_path),
+        "total_executions": 2 * summary["dataset_executions"],
+        "total_run_overs": summary["run_overs"],
+        "final_completion_logs": summary["dataset_executions"],
+        "completion_sum": summary["completion_log_sum"],
+        "completion_count": summary["dataset_executions"],
+        "start_time_min": pd.NaT,
+        "end_time_max": pd.NaT
+    }
+
+
+def analyze_log_file(file_path, keep_series=True, chunksize=LOG_READ_CHUNK_ROWS, use_summary=True):
+    """
+    Analisa um log em blocos, sem carregá-lo inteiro: cada bloco é reduzido a contadores e às séries
+    usadas nos gráficos (curva de completude e horários dos atropelamentos).
+
+    :param file_path: Arquivo de log.
+    :param keep_series: Se False, não guarda as séries dos gráficos (resultado menor entre processos).
+    :param chunksize: Linhas por bloco de leitura.
+    :param use_summary: Sem as séries, usa o resumo da execução quando ele existir (ver `analyze_summary_file`).
+    :return: Dicionário com os agregados parciais do arquivo (combináveis com `merge_results`).
+    """
+    if use_summary and not keep_series:
+        result = analyze_summary_file(file_path)
+        if result is not None:
+            return result
+
+    result = {
+        "method": method_name(file_path),
+        "total_executions": 0,
+        "total_run_overs": 0,
+        "final_completion_logs": 0,
+        "completion_sum": 0.0,
+        "completion_count": 0,
+        "start_time_min": pd.NaT,
+        "end_time_max": pd.NaT
+    }
+    completion_curves = []
+    run_over_times = []
+
+    for chunk in read_log_chunks(file_path, ANALYSIS_COLUMNS, chunksize):
+        # Garantindo que valores nulos sejam tratados
+        chunk = chunk.dropna(subset=["start_time", "end_time"])
+
+        # Atropelamentos não têm execution_id: são contados antes do filtro
+        is_run_over = chunk["event_type"] == "run_over"
+        result["total_run_overs"] += int(is_run_over.sum())
+        if keep_series:
+            run_over_times.append(chunk["start_time"][is_run_over])
+
+        ### FILTRANDO SOMENTE AS EXECUÇÕES VÁLIDAS (removendo execuções sem ID)
+        chunk = chunk[chunk["execution_id"].notna()]
+        if chunk.empty:
+            continue
+
+        is_completion = chunk["event_type"] == "completion_percentage"
+        completion = chunk["data"].where(is_completion)
+
+        result["total_executions"] += len(chunk)
+        result["final_completion_logs"] += int(is_completion.sum())
+        result["completion_sum"] += float(completion.sum())
+        result["completion_count"] += int(completion.count())
+        result["start_time_min"] = min(value for value in (result["start_time_min"], chunk["start_time"].min()) if pd.notna(value))
+        result["end_time_max"] = max(value for value in (result["end_time_max"], chunk["end_time"].max()) if pd.notna(value))
+
+        if keep_series:
+            completion_curves.append(pd.DataFrame({"start_time": chunk["start_time"][is_completion], "completion_percentage": completion[is_completion]}).dropna())
+
+    result["completion_curve"] = pd.concat(completion_curves, ignore_index=True) if completion_curves else pd.DataFrame(columns=["start_time", "completion_percentage"])
+    result["run_over_times"] = pd.concat(run_over_times, ignore_index=True) if run_over_times else pd.Series(dtype="datetime64[ns]")
+    return result
+
+
+def merge_results(results):
+    """
+    Combina os agregados de vários arquivos em uma tabela com uma linha por método.
+
+    :return: DataFrame com as colunas de SUMMARY_COLUMNS, ordenado pelo método.
+    """
+    merged = {}
+    for result in results:
+        method = merged.setdefault(result["method"], {"total_executions": 0, "total_run_overs": 0, "final_completion_logs": 0,
+                                                      "completion_sum": 0.0, "completion_count": 0})
+        for key in method:
+            method[key] += result[key]
+
+    rows = [{
+        "method": method,
+        "total_executions": totals["total_executions"],
+        "total_run_overs": totals["total_run_overs"],
+        "final_completion_logs": totals["final_completion_logs"],
+        "final_completion_percentage": totals["completion_sum"] / totals["completion_count"] if totals["completion_count"] else float("nan")
+    } for method, totals in sorted(merged.items())]
+    return pd.DataFrame(rows, columns=SUMMARY_COLUMNS)
+
+
+def analyze_logs(log_files, workers=None, keep_series=True, chunksize=LOG_READ_CHUNK_ROWS, use_summaries=True):
+    """
+    Analisa vários logs em paralelo (um processo por arquivo, até `workers`) e descarta os logs vazios.
+    Sem as séries dos gráficos, os logs que têm resumo não são relidos.
+
+    :param log_files: Arquivos de log.
+    :param workers: Número de processos (padrão: núcleos disponíveis; 1 analisa no próprio processo).
+    :param use_summaries: Se False, sempre relê os logs, mesmo com resumo.
+    :return: Lista com os agregados de cada arquivo, na ordem de `log_files`.
+    """
+    results = [None] * len(log_files)
+    if use_summaries and not keep_series:
+        results = [analyze_summary_file(file) for file in log_files]
+    pending = [file for file, result in zip(log_files, results) if result is None]
+
+    workers = min(workers or os.cpu_count() or 1, max(len(pending), 1))
+    if workers == 1:
+        analyzed = [analyze_log_file(file, keep_series, chunksize, use_summary=False) for file in pending]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            analyzed = list(executor.map(analyze_log_file, pending, [keep_series] * len(pending), [chunksize] * len(pending),
+                                         [False] * len(pending)))
+    analyzed = iter(analyzed)
+    results = [next(analyzed) if result is None else result for result in results]
+    return [result for result in results if result["total_executions"]]
 
-# Coleta todos os arquivos CSV no diretório de logs
-log_files = [os.path.join(LOGS_DIR, file) for file in os.listdir(LOGS_DIR) if file.endswith(".csv")]
-
-# Lista para armazenar os dados de cada arquivo
-log_data = []
-
-# Carregar os logs
-for file in log_files:
-    df = pd.read_csv(file)
-    
-    # Extraindo o nome do método a partir do nome do arquivo
-    method_name = os.path.basename(file).replace("simulation_log_data_", "").replace(".csv", "")
-    
-    # Adicionando a coluna do método no DataFrame
-    df["method"] = method_name
-    
-    # Converter as colunas de data para datetime
-    df["start_time"] = pd.to_datetime(df["start_time"], errors="coerce")
-    df["end_time"] = pd.to_datetime(df["end_time"], errors="coerce")
-    
-    # Garantindo que valores nulos sejam tratados
-    df.dropna(subset=["start_time", "end_time"], inplace=True)
-
-    # Ajuste: Extraindo completion_percentage corretamente
-    df["completion_percentage"] = df.apply(lambda row: float(row["data"]) if row["event_type"] == "completion_percentage" else None, axis=1)
-    
-    log_data.append(df)
-
-# Combinar todos os logs em um único DataFrame
-logs_df = pd.concat(log_data, ignore_index=True)
-
-### FILTRANDO SOMENTE AS EXECUÇÕES VÁLIDAS (removendo execuções sem ID)
-logs_df = logs_df[logs_df["execution_id"].notna()]
-
-# Definir os limites de tempo com base nos dados disponíveis
-start_time_min = logs_df["start_time"].min()
-end_time_max = logs_df["end_time"].max()
-
-# Criar um DataFrame com as métricas agregadas por método
-summary_df = logs_df.groupby("method").agg(
-    total_executions=pd.NamedAgg(column="execution_id", aggfunc="count"),
-    total_run_overs=pd.NamedAgg(column="event_type", aggfunc=lambda x: (x == "run_over").sum()),
-    final_completion_logs=pd.NamedAgg(column="event_type", aggfunc=lambda x: (x == "completion_percentage").sum()),
-    final_completion_percentage=pd.NamedAgg(column="completion_percentage", aggfunc="mean")
-).reset_index()
-
-# Exibir os resultados no terminal
-print(summary_df)
-
-# Salvar os resultados em CSV
-summary_file = os.path.join(LOGS_DIR, "log_analysis_results.csv")
-summary_df.to_csv(summary_file, index=False)
 
 # ========== GERAR GRÁFICOS ==========
-# Gráfico de barras comparando a completude final
-plt.figure(figsize=(10, 5))
-plt.bar(summary_df["method"], summary_df["final_completion_percentage"])
-plt.xlabel("Método")
-plt.ylabel("Porcentagem Final de Completeza")
-plt.title("Comparação de Completeza por Método")
-plt.xticks(rotation=30)
-plt.savefig(os.path.join(LOGS_DIR, "completion_comparison.png"))
-plt.show()
-
-# Gráfico de evolução da completude ao longo do tempo
-completion_logs = logs_df[logs_df["event_type"] == "completion_percentage"].dropna(subset=["completion_percentage"])
-plt.figure(figsize=(12, 6))
-
-for method, data in completion_logs.groupby("method"):
-    plt.plot(data["start_time"], data["completion_percentage"], label=method)
-
-plt.xlabel("Tempo")
-plt.ylabel("Porcentagem de Completeza")
-plt.title("Evolução da Completeza ao Longo do Tempo")
-plt.legend()
-plt.xlim(start_time_min, end_time_max)  # Limitando ao tempo dos logs
-plt.savefig(os.path.join(LOGS_DIR, "completion_evolution.png"))
-plt.show()
-
-# Gráfico de evolução dos atropelamentos ao longo do tempo
-run_over_logs = logs_df[logs_df["event_type"] == "run_over"]
-plt.figure(figsize=(12, 6))
-
-for method, data in run_over_logs.groupby("method"):
-    plt.plot(data["start_time"], range(len(data)), label=method)
-
-plt.xlabel("Tempo")
-plt.ylabel("Número Acumulado de Atropelamentos")
-plt.title("Evolução dos Atropelamentos ao Longo do Tempo")
-plt.legend()
-plt.xlim(start_time_min, end_time_max)  # Limitando ao tempo dos logs
-plt.savefig(os.path.join(LOGS_DIR, "run_over_evolution.png"))
-plt.show()
-
-print(f"✅ Análise concluída! Os resultados foram salvos em: {summary_file}")
+def plot_results(results, summary_df, output_dir):
+    """
+    Gera os gráficos de comparação em `output_dir` com o backend Agg (sem janela, não bloqueia).
+
+    :param results: Agregados retornados por `analyze_logs` (com `keep_series=True`).
+    :param summary_df: Tabela retornada por `merge_results`.
+    :return: Lista com os arquivos gerados.
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    # Definir os limites de tempo com base nos dados disponíveis
+    start_time_min = min(result["start_time_min"] for result in results)
+    end_time_max = max(result["end_time_max"] for result in results)
+    results = sorted(results, key=lambda result: result["method"])
+    plot_files = [os.path.join(output_dir, name) for name in ("completion_comparison.png", "completion_evolution.png", "run_over_evolution.png")]
+
+    # Gráfico de barras comparando a completude final
+    plt.figure(figsize=(10, 5))
+    plt.bar(summary_df["method"], summary_df["final_completion_percentage"])
+    plt.xlabel("Método")
+    plt.ylabel("Porcentagem Final de Completeza")
+    plt.title("Comparação de Completeza por Método")
+    plt.xticks(rotation=30)
+    plt.savefig(plot_files[0])
+    plt.close()
+
+    # Gráfico de evolução da completude ao longo do tempo
+    plt.figure(figsize=(12, 6))
+    for result in results:
+        data = result["completion_curve"]
+        plt.plot(data["start_time"], data["completion_percentage"], label=result["method"])
+    plt.xlabel("Tempo")
+    plt.ylabel("Porcentagem de Completeza")
+    plt.title("Evolução da Completeza ao Longo do Tempo")
+    plt.legend()
+    plt.xlim(start_time_min, end_time_max)  # Limitando ao tempo dos logs
+    plt.savefig(plot_files[1])
+    plt.close()
+
+    # Gráfico de evolução dos atropelamentos ao longo do tempo
+    plt.figure(figsize=(12, 6))
+    for result in results:
+        data = result["run_over_times"]
+        plt.plot(data, range(len(data)), label=result["method"])
+    plt.xlabel("Tempo")
+    plt.ylabel("Número Acumulado de Atropelamentos")
+    plt.title("Evolução dos Atropelamentos ao Longo do Tempo")
+    plt.legend()
+    plt.xlim(start_time_min, end_time_max)  # Limitando ao tempo dos logs
+    plt.savefig(plot_files[2])
+    plt.close()
+    return plot_files
+# ===========================================================================================
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Análise comparativa dos logs de simulação")
+    parser.add_argument("inputs", nargs="*", default=[LOGS_DIR], help="Arquivos de log ou diretórios com logs simulation_log* (padrão: ./logs).")
+    parser.add_argument("--output", type=str, help=f"Tabela de resultados (CSV). Padrão: <primeiro diretório de entrada>/{SUMMARY_FILE_NAME}.")
+    parser.add_argument("--plots", action="store_true", help="Gera os gráficos (PNG) ao lado da tabela de resultados.")
+    parser.add_argument("--plots_dir", type=str, help="Diretório dos gráficos (padrão: diretório da tabela de resultados).")
+    parser.add_argument("--workers", type=int, help="Número de processos (padrão: núcleos disponíveis).")
+    parser.add_argument("--chunksize", type=int, default=LOG_READ_CHUNK_ROWS, help="Linhas por bloco de leitura.")
+    parser.add_argument("--ignore_summaries", action="store_true",
+                        help="Relê todos os logs, mesmo os que têm resumo (<log>.summary.json).")
+    args = parser.parse_args(argv)
+
+    log_files = []
+    for path in args.inputs:
+        log_files.extend(find_log_files(path) if os.path.isdir(path) else [path])
+    if not log_files:
+        parser.error(f"Nenhum log encontrado em: {', '.join(args.inputs)}")
+
+    output_file = args.output or os.path.join(next((path for path in args.inputs if os.path.isdir(path)), os.path.dirname(log_files[0])), SUMMARY_FILE_NAME)
+    if os.path.dirname(output_file):
+        os.makedirs(os.path.dirname(output_file), exist_ok=True)
+
+    # Analisar cada log separadamente (sem concatenar todos os logs em memória) e combinar por método
+    start = time.perf_counter()
+    results = analyze_logs(log_files, args.workers, keep_series=args.plots, chunksize=args.chunksize,
+                           use_summaries=not args.ignore_summaries)
+    if not results:
+        parser.error("Nenhuma execução válida encontrada nos logs")
+    summary_df = merge_results(results)
+
+    # Exibir os resultados no terminal e salvar em CSV
+    print(summary_df)
+    summary_df.to_csv(output_file, index=False)
+
+    if args.plots:
+        plots_dir = args.plots_dir or os.path.dirname(output_file) or "."
+        os.makedirs(plots_dir, exist_ok=True)
+        for plot_file in plot_results(results, summary_df, plots_dir):
+            print(f"Gráfico gravado em: {plot_file}")
+
+    print(f"✅ Análise de {len(log_files)} logs concluída em {time.perf_counter() - start:.1f}s! Os resultados foram salvos em: {output_file}")
+    return summary_df
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""
+Simulação em lote: várias variantes sobre um único ExecutionDataset indexado.
+
+Compartilhado entre as variantes: o ExecutionIndex (registros, árvores e mapas estáticos) e os contadores de
+progresso, em arrays NumPy com uma posição por variante (BatchState). Cada variante mantém o próprio mapa de
+conclusões (bytearray do seu IndexState, consultado a cada busca), a fila ou o agendamento, as máquinas e o
+clock na sua Simulation; esses estados não são arrays NumPy compartilhados.
+"""
+import time
+import numpy as np
+from dynamic_queue import DynamicQueue
+from machines import Machines
+from simulation import Simulation, DEFAULT_START_TIME, DEFAULT_FINISH_TIME
+from simulation_log import SimulationLog
+
+
+class BatchState:
+    def __init__(self, index, variants):
+        """
+        Estado mutável de `variants` variantes sobre o mesmo ExecutionIndex: um IndexState por variante
+        (conclusões, árvores e cursores) e os contadores de progresso em arrays NumPy com uma posição por variante.
+
+        :param index: Instância de ExecutionIndex.
+        :param variants: Quantidade de variantes.
+        """
+        self.index_states = [index.new_state() for _ in range(variants)]
+        initially_completed = [record for record, completed in zip(index.records, index.initially_completed) if completed]
+        self.total_work = sum(record.work for record in index.records)
+        self.completed_work = np.full(variants, sum(record.work for record in initially_completed), dtype=np.int64)
+        self.completed_executions = np.full(variants, len(initially_completed), dtype=np.int64)
+
+    def completion_percentages(self):
+        """
+        Retorna a porcentagem de completude de todas as variantes (array).
+        """
+        if self.total_work == 0:
+            return np.zeros(len(self.completed_work))
+        return self.completed_work / self.total_work * 100
+
+
+class DatasetVariant:
+    def __init__(self, index, state, variant):
+        """
+        Visão de uma variante do lote com a interface do ExecutionDataset usada pela Simulation.
+        As buscas são as do ExecutionIndex compartilhado, sobre o IndexState da variante.
+
+        :param index: Instância de ExecutionIndex.
+        :param state: Instância de BatchState.
+        :param variant: Posição da variante no BatchState.
+        """
+        self.index = index
+        self.state = state
+        self.variant = variant
+        self._index_state = state.index_states[variant]
+
+    def get_execution_by_robot_and_time(self, robot, execution_time):
+        """
+        Ver ExecutionDataset.get_execution_by_robot_and_time.
+        """
+        robot_code = self.index.robot_codes.get(robot)
+        if robot_code is None:
+            return None
+        row = self.index.find_execution(self._index_state, robot_code, execution_time)
+        return None if row is None else self.index.execution(self._index_state, row)
+
+    def mark_execution_complete(self, execution_id):
+        """
+        Ver ExecutionDataset.mark_execution_complete.
+        """
+        row = self.index.row_by_id.get(execution_id)
+        if row is None or self._index_state.completed[row]:
+            return False
+
+        self.index.complete(self._index_state, row)
+        self.state.completed_work[self.variant] += self.index.records[row].work
+        self.state.completed_executions[self.variant] += 1
+        return True
+
+    def get_executions_expiring_before(self, execution_time, robot=None):
+        """
+        Ver ExecutionDataset.get_executions_expiring_before.
+        """
+        if robot is None:
+            rows = self.index.expiring_before(self._index_state, execution_time)
+        elif robot in self.index.robot_codes:
+            rows = self.index.expiring_before(self._index_state, execution_time, self.index.robot_codes[robot])
+        else:
+            rows = []
+        return [self.index.execution(self._index_state, row) for row in rows]
+
+    def has_satisfiable_executions(self, current_time):
+        """
+        Ver ExecutionDataset.has_satisfiable_executions.
+        """
+        return self.index.has_satisfiable_executions(self._index_state, current_time)
+
+    def all_executions_complete(self):
+        return bool(self.state.completed_executions[self.variant] == len(self.index.records))
+
+    def get_completion_percentage(self):
+        if self.state.total_work == 0:
+            return 0.0
+        return float(self.state.completed_work[self.variant] / self.state.total_work * 100)
+
+    def get_completed_work(self):
+        return int(self.state.completed_work[self.variant])
+
+    def get_remaining_work(self):
+        return self.state.total_work - self.get_completed_work()
+
+    def _progress_by(self, group_codes, groups):
+        """
+        Contadores de progresso por grupo (np.bincount sobre o mapa de conclusões da variante).
+
+        :param group_codes: Código do grupo de cada linha do índice.
+        :param groups: Chaves dos grupos, na ordem dos códigos.
+        """
+        group_codes = np.array(group_codes, dtype=np.int64)
+        work = np.array([record.work for record in self.index.records], dtype=np.int64)
+        completed = np.frombuffer(self._index_state.completed, dtype=bool)
+        total_work = np.bincount(group_codes, weights=work, minlength=len(groups))
+        completed_work = np.bincount(group_codes, weights=work * completed, minlength=len(groups))
+        total_executions = np.bincount(group_codes, minlength=len(groups))
+        completed_executions = np.bincount(group_codes, weights=completed, minlength=len(groups))
+        return {group: {
+            "completed_work": int(completed_work[code]),
+            "remaining_work": int(total_work[code] - completed_work[code]),
+            "total_work": int(total_work[code]),
+            "completed_executions": int(completed_executions[code]),
+            "total_executions": int(total_executions[code]),
+            "completion_percentage": completed_work[code] / total_work[code] * 100 if total_work[code] else 0.0
+        } for code, group in enumerate(groups)}
+
+    def get_progress_by_robot(self):
+        """
+        Ver ExecutionDataset.get_progress_by_robot.
+        """
+        return self._progress_by(self.index.robot_code, self.index.robot_names)
+
+    def get_progress_by_window(self):
+        """
+        Ver ExecutionDataset.get_progress_by_window (execuções sem janela agrupadas na chave (None, None)).
+        """
+        windows = {}
+        window_codes = [windows.setdefault((record.start_window, record.end_window) if record.has_window() else (None, None), len(windows))
+                        for record in self.index.records]
+        return self._progress_by(window_codes, list(windows))
+
+    def get_pending_executions(self):
+        """
+        Ver ExecutionDataset.get_pending_executions.
+        """
+        completed = self._index_state.completed
+        return [self.index.execution(self._index_state, row) for row in range(len(self.index.records)) if not completed[row]]
+
+    def __repr__(self):
+        return f"DatasetVariant(variant={self.variant}, completion={self.get_completion_percentage():.2f}%)"
+
+
+class BatchSimulation:
+    def __init__(self, execution_dataset, variants, start_time=DEFAULT_START_TIME, finish_time=DEFAULT_FINISH_TIME,
+                 event_backend="heap", termination_policies=(), max_events=None):
+        """
+        Executa várias variantes (estratégias ou parâmetros) sobre um único ExecutionDataset carregado.
+
+        O índice do dataset é montado uma vez e compartilhado; cada variante tem apenas seu estado em
+        BatchState, sua fila/agendamento, suas máquinas e seu log. As variantes avançam em rodízio, um
+        evento de cada por vez, até todas terminarem.
+
+        :param execution_dataset: Instância de ExecutionDataset (somente leitura).
+        :param variants: Lista de dicionários com name, scheduler (DynamicQueue ou BPScheduler), machines
+                         e, opcionalmente, simulation_log e duration_sampler (ver Simulation).
+        :param start_time: Tempo inicial da simulação (datetime).
+        :param finish_time: Tempo final da simulação (datetime).
+        :param event_backend: Backend do EventScheduler ('heap' ou 'calendar').
+        :param termination_policies: Critérios de parada antecipada de cada variante (ver Simulation).
+        :param max_events: (Opcional) Limite de eventos processados por variante.
+        :raises ValueError: Se duas variantes tiverem o mesmo nome (os resultados são identificados pelo nome).
+        """
+        self.names = [variant["name"] for variant in variants]
+        duplicated = sorted({name for name in self.names if self.names.count(name) > 1})
+        if duplicated:
+            raise ValueError(f"Nomes de variantes repetidos no lote: {', '.join(map(str, duplicated))}")
+
+        self.index = execution_dataset.index
+        self.state = BatchState(self.index, len(variants))
+        self.simulations = [
+            Simulation(DatasetVariant(self.index, self.state, position), variant["scheduler"], variant["machines"],
+                       variant.get("simulation_log"), start_time, finish_time, event_backend,
+                       duration_sampler=variant.get("duration_sampler"), termination_policies=termination_policies,
+                       max_events=max_events)
+            for position, variant in enumerate(variants)
+        ]
+        self.wall_time = 0.0
+
+    def run(self):
+        """
+        Executa todas as variantes e retorna os resultados.
+
+        :return: Dicionário {nome da variante: SimulationResult}, na ordem das variantes.
+        """
+        wall_start = time.perf_counter()
+        for simulation in self.simulations:
+            simulation.schedule_initial_events()
+
+        active = list(self.simulations)
+        while active:
+            active = [simulation for simulation in active if simulation.advance()]
+
+        results = {name: simulation.finish() for name, simulation in zip(self.names, self.simulations)}
+        self.wall_time = time.perf_counter() - wall_start
+        return results
+
+    def completion_percentages(self):
+        """
+        Retorna {nome da variante: porcentagem de completude} calculado de uma vez para todo o lote.
+        """
+        return dict(zip(self.names, self.state.completion_percentages().tolist()))
+
+
+def strategy_variants(dynamic_queue_file, sorting_algorithms, machines="M1", log_files=None):
+    """
+    Monta uma variante por algoritmo de ordenação da fila dinâmica.
+
+    :param machines: Especificação das máquinas (ver Machines.from_spec), recriadas para cada variante.
+    :param log_files: (Opcional) Arquivo de log de cada variante; sem ele o log fica em memória.
+    :return: Lista de variantes para BatchSimulation.
+    """
+    return [{
+        "name": sorting_algorithm,
+        "scheduler": DynamicQueue(dynamic_queue_file, sorting_algorithm=sorting_algorithm),
+        "machines": Machines.from_spec(machines),
+        "simulation_log": SimulationLog(log_files[position]) if log_files else None
+    } for position, sorting_algorithm in enumerate(sorting_algorithms)]
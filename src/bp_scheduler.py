@@ -1,9 +1,17 @@
 import heapq
-import pandas as pd
-from datetime import datetime
+import os
+import pickle
+import tempfile
+from operator import itemgetter
 from robot import Robot
+from scenario_loader import read_bp_schedule, iter_bp_schedule
+
+STREAM_CHUNK_SIZE = 100000  # Linhas por trecho ordenado no modo streaming (limita a memória da ordenação externa)
+STREAM_BLOCK_SIZE = 1024  # Linhas por bloco gravado nos arquivos temporários
 
 class ScheduledExecution:
+    __slots__ = ("start_time", "robot", "machine_name")
+
     def __init__(self, start_time, robot, machine_name):
         """
         Representa uma execução programada no BP Scheduler.
@@ -13,7 +21,7 @@ class ScheduledExecution:
         :param machine_name: Nome da máquina onde o robô será executado.
         """
         self.start_time = start_time
-        self.robot = robot 
+        self.robot = robot
         self.machine_name = machine_name
 
     def __lt__(self, other):
@@ -31,39 +39,163 @@ class ScheduledExecution:
 
 
 class BPScheduler:
-    def __init__(self, file_path):
+    def __init__(self, file_path, streaming=False, chunk_size=STREAM_CHUNK_SIZE):
         """
         Inicializa o BP Scheduler e carrega as execuções programadas automaticamente.
 
+        No modo streaming o arquivo não é carregado na memória: as execuções são lidas em ordem de horário
+        por `iter_executions()`. Se o arquivo já estiver ordenado ele é relido diretamente; caso contrário é
+        feita uma ordenação externa (trechos de `chunk_size` linhas ordenados e gravados em arquivos
+        temporários, depois intercalados com `heapq.merge`).
+
         :param file_path: Caminho do arquivo CSV contendo os agendamentos.
+        :param streaming: Se True, lê o agendamento sob demanda em vez de carregar tudo no MinHeap.
+        :param chunk_size: Linhas por trecho da ordenação externa (modo streaming).
         """
         self.file_path = file_path
+        self.streaming = streaming
+        self.chunk_size = chunk_size
         self.scheduled_heap = []  # MinHeap para armazenar as execuções programadas
-        self._load_schedule()
+        self.execution_count = 0
+        self._run_dir = None  # Diretório temporário com os trechos ordenados (modo streaming)
+        self._run_files = []
+        self._stream = None
+        if streaming:
+            self._index_schedule()
+        else:
+            self._load_schedule()
 
     def _load_schedule(self):
         """
         Lê o arquivo CSV e carrega as execuções programadas no MinHeap.
         """
-        df = pd.read_csv(self.file_path)
-
-        for _, row in df.iterrows():
-            robot = Robot(row["robot"], priority=0) 
-            machine_name = row["machine"]
-            start_time = datetime.strptime(f"{row['date']} {row['start_time']}", "%Y-%m-%d %H:%M")
+        rows = read_bp_schedule(self.file_path)
+        self._machine_names = list(dict.fromkeys(machine_name for _, _, machine_name in rows))
 
-            execution = ScheduledExecution(start_time, robot, machine_name)
-            heapq.heappush(self.scheduled_heap, execution)
+        # Ordenação única (estável, mantém a ordem do arquivo em horários iguais); uma lista ordenada já é um MinHeap válido
+        rows.sort(key=lambda row: row[0])
+        self.scheduled_heap = [ScheduledExecution(start_time, Robot.intern(robot_name), machine_name)
+                               for start_time, robot_name, machine_name in rows]
+        self.execution_count = len(self.scheduled_heap)
 
         print(f"{len(self.scheduled_heap)} execuções programadas carregadas no BP Scheduler.")
 
+    # =================================== MODO STREAMING ===================================
+    def _index_schedule(self):
+        """
+        Percorre o arquivo uma vez (memória constante) contando as linhas, coletando as máquinas e verificando
+        se os horários já estão em ordem. Só arquivos fora de ordem passam pela ordenação externa.
+        """
+        machine_names = {}
+        is_sorted = True
+        last_start_time = None
+        for start_time, _, machine_name in iter_bp_schedule(self.file_path):
+            machine_names.setdefault(machine_name)
+            if last_start_time is not None and start_time < last_start_time:
+                is_sorted = False
+            last_start_time = start_time
+            self.execution_count += 1
+        self._machine_names = list(machine_names)
+
+        if not is_sorted:
+            self._build_sorted_runs()
+
+        print(f"{self.execution_count} execuções programadas indexadas no BP Scheduler (streaming, "
+              f"{len(self._run_files) or 'arquivo já ordenado, sem'} trechos temporários).")
+
+    def _build_sorted_runs(self):
+        """
+        Ordena o arquivo em trechos de `chunk_size` linhas (ordenação estável) e grava cada trecho em um arquivo temporário.
+        """
+        self._run_dir = tempfile.TemporaryDirectory(prefix="bp_schedule_")
+        chunk = []
+        for row in iter_bp_schedule(self.file_path):
+            chunk.append(row)
+            if len(chunk) >= self.chunk_size:
+                self._write_run(chunk)
+                chunk = []
+        if chunk:
+            self._write_run(chunk)
+
+    def _write_run(self, rows):
+        rows.sort(key=itemgetter(0))
+        run_file = os.path.join(self._run_dir.name, f"run_{len(self._run_files):05d}.pkl")
+        with open(run_file, mode="wb") as file:
+            for start in range(0, len(rows), STREAM_BLOCK_SIZE):
+                pickle.dump(rows[start:start + STREAM_BLOCK_SIZE], file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._run_files.append(run_file)
+
+    @staticmethod
+    def _read_run(run_file):
+        with open(run_file, mode="rb") as file:
+            while True:
+                try:
+                    block = pickle.load(file)
+                except EOFError:
+                    return
+                yield from block
+
+    def iter_executions(self):
+        """
+        Gera as execuções programadas em ordem de horário (em horários iguais, na ordem do arquivo),
+        criando cada ScheduledExecution apenas quando é consumida.
+        """
+        if not self.streaming:
+            yield from sorted(self.scheduled_heap)
+            return
+
+        if self._run_files:
+            # heapq.merge é estável: em horários iguais, trechos anteriores (linhas anteriores do arquivo) saem primeiro
+            rows = heapq.merge(*(self._read_run(run_file) for run_file in self._run_files), key=itemgetter(0))
+        else:
+            rows = iter_bp_schedule(self.file_path)
+        for start_time, robot_name, machine_name in rows:
+            yield ScheduledExecution(start_time, Robot.intern(robot_name), machine_name)
+
+    def __getstate__(self):
+        """
+        No modo streaming, os arquivos temporários e o gerador em andamento não são serializados
+        (checkpoint); os trechos ordenados são refeitos a partir do arquivo ao restaurar.
+        """
+        state = self.__dict__.copy()
+        state.update({"_run_dir": None, "_run_files": [], "_stream": None, "_has_sorted_runs": bool(self._run_files)})
+        return state
+
+    def __setstate__(self, state):
+        has_sorted_runs = state.pop("_has_sorted_runs", False)
+        self.__dict__.update(state)
+        if has_sorted_runs:
+            self._build_sorted_runs()
+
+    def close(self):
+        """
+        Remove os arquivos temporários da ordenação externa (modo streaming).
+        """
+        if self._run_dir is not None:
+            self._run_dir.cleanup()
+            self._run_dir = None
+            self._run_files = []
+    # ======================================================================================
+
+    def get_machine_names(self):
+        """
+        Retorna os nomes das máquinas citadas no agendamento, na ordem em que aparecem no arquivo.
+        """
+        return list(self._machine_names)
+
     def get_all_executions(self):
+        if self.streaming:
+            return list(self.iter_executions())
         return sorted(self.scheduled_heap)
     
     def get_next_execution(self):
         """
         Retorna a próxima execução programada.
         """
+        if self.streaming:
+            if self._stream is None:
+                self._stream = self.iter_executions()
+            return next(self._stream, None)
         if self.scheduled_heap:
             return heapq.heappop(self.scheduled_heap)  # Remove e retorna a próxima execução
         return None  # Retorna None se não houver mais execuções programadas
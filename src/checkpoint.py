@@ -0,0 +1,125 @@
+import gzip
+import os
+import pickle
+from simulation_log import SimulationLog
+
+CHECKPOINT_VERSION = 5
+CHECKPOINT_COMPRESS_LEVEL = 3  # gzip: arquivos compactos sem pesar no tempo de gravação
+
+
+def default_checkpoint_file(log_file):
+    """
+    Caminho padrão do checkpoint de uma execução, ao lado do log bruto (ex: logs/x.csv -> logs/x_checkpoint.pkl.gz).
+    """
+    return f"{os.path.splitext(log_file or 'simulation_log')[0]}_checkpoint.pkl.gz"
+
+
+def save_checkpoint(simulation, file_path):
+    """
+    Grava o estado completo de uma simulação entre dois eventos: EventScheduler, fila dinâmica (com o `data`
+    dos pesos) ou BP Scheduler, execuções concluídas do dataset, estado das máquinas, métricas, clock e
+    a posição do log. O arquivo é substituído de forma atômica, então uma interrupção durante a gravação
+    preserva o checkpoint anterior.
+
+    :param simulation: Instância de Simulation (sem profiler anexado).
+    :param file_path: Arquivo do checkpoint (pickle compactado com gzip).
+    """
+    simulation_log = simulation.simulation_log
+    state = {
+        "version": CHECKPOINT_VERSION,
+        "simulation": simulation,
+        "log": {
+            "file_path": simulation_log.file_path,
+            "offset": simulation_log.tell(),
+            "sequence": simulation_log.sequence,
+            "log_id_mode": simulation_log.log_id_mode,
+            "buffer_size": simulation_log.buffer_size
+        }
+    }
+
+    if os.path.dirname(file_path):
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    temporary_file = f"{file_path}.tmp"
+    with gzip.open(temporary_file, mode="wb", compresslevel=CHECKPOINT_COMPRESS_LEVEL) as file:
+        pickle.dump(state, file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporary_file, file_path)
+
+
+def _restore_log(log_state, log_file):
+    """
+    Prepara o arquivo de log para continuar do ponto do checkpoint.
+
+    - mesmo arquivo do checkpoint: trunca o log na posição gravada (descarta o que foi escrito depois);
+    - outro arquivo (variante): copia o trecho do log original até a posição gravada, se ambos forem CSV.
+    """
+    source_file = log_state["file_path"]
+    if log_file is None or source_file is None or not log_file.lower().endswith(".csv") or not source_file.lower().endswith(".csv"):
+        return
+    if not os.path.exists(source_file):
+        raise FileNotFoundError(f"Log do checkpoint não encontrado: {source_file}")
+
+    if os.path.abspath(log_file) == os.path.abspath(source_file):
+        with open(log_file, mode="r+b") as file:
+            file.truncate(log_state["offset"])
+        return
+
+    if os.path.dirname(log_file):
+        os.makedirs(os.path.dirname(log_file), exist_ok=True)
+    with open(source_file, mode="rb") as source, open(log_file, mode="wb") as destination:
+        remaining = log_state["offset"]
+        while remaining > 0:
+            block = source.read(min(remaining, 1 << 20))
+            if not block:
+                break
+            destination.write(block)
+            remaining -= len(block)
+
+
+def load_checkpoint(file_path, log_file=None, sorting_algorithm=None, buffer_size=None, finish_time=None,
+                    termination_policies=None, max_events=None):
+    """
+    Restaura uma simulação a partir de um checkpoint, pronta para continuar com `run()`.
+
+    Sem `log_file`, retoma no próprio log do checkpoint (truncado na posição gravada). Com outro `log_file`,
+    deriva uma variante: o log começa com o trecho já simulado (logs CSV) e segue no novo arquivo.
+    Logs em memória ou colunares não guardam o trecho anterior: a variante começa com o log vazio.
+
+    O limite de eventos (`max_events`) sempre recomeça a contar na retomada; assim uma simulação interrompida
+    pelo limite pode ser continuada.
+
+    :param file_path: Arquivo do checkpoint.
+    :param log_file: (Opcional) Log da execução retomada.
+    :param sorting_algorithm: (Opcional) Novo algoritmo de ordenação da fila dinâmica (variante de estratégia).
+    :param buffer_size: (Opcional) Tamanho do buffer do SimulationLog (padrão: o do checkpoint).
+    :param finish_time: (Opcional) Novo fim da simulação (não pode ser anterior ao clock do checkpoint).
+    :param termination_policies: (Opcional) Novos critérios de parada antecipada (padrão: os do checkpoint).
+    :param max_events: (Opcional) Limite de eventos processados após a retomada (padrão: o do checkpoint).
+    :return: Instância de Simulation.
+    :raises ValueError: Se alguma das alterações não puder ser aplicada ao checkpoint.
+    """
+    with gzip.open(file_path, mode="rb") as file:
+        state = pickle.load(file)
+    if state.get("version") != CHECKPOINT_VERSION:
+        raise ValueError(f"Versão de checkpoint não suportada: {state.get('version')}")
+
+    simulation = state["simulation"]
+    log_state = state["log"]
+    if sorting_algorithm is not None and sorting_algorithm != getattr(simulation.scheduler, "sorting_algorithm", None):
+        if simulation.use_bp_scheduler:
+            raise ValueError("Um checkpoint do BP Scheduler não pode trocar o algoritmo de ordenação")
+        simulation.scheduler.change_sorting_algorithm(sorting_algorithm)
+    if finish_time is not None:
+        if finish_time < simulation.clock:
+            raise ValueError(f"O novo finish_time ({finish_time}) é anterior ao clock do checkpoint ({simulation.clock})")
+        simulation.finish_time = finish_time
+    simulation.set_termination(simulation.termination_policies if termination_policies is None else termination_policies,
+                               simulation.max_events if max_events is None else max_events)
+    simulation.termination_reason = None
+
+    log_file = log_file or log_state["file_path"]
+    _restore_log(log_state, log_file)
+    simulation_log = SimulationLog(log_file, buffer_size or log_state["buffer_size"], log_id_mode=log_state["log_id_mode"])
+    simulation_log.sequence = log_state["sequence"]
+    simulation.simulation_log = simulation_log
+    return simulation
+
@@ -1,50 +1,164 @@
-import pandas as pd
-from queue_sorting import QueueSortingAlgorithm
+import heapq
+from collections import Counter
+from queue_sorting import QueueSortingAlgorithm, WeightedPriorityAging
 from robot import Robot
+from scenario_loader import read_dynamic_queue
 
 class DynamicQueue:
     def __init__(self, file_path, sorting_algorithm="FIFO", data=None):
         """
         Inicializa a fila dinâmica de robôs.
 
+        Estratégias com chave fixa por robô (FIFO, PRIORITY) usam um heap com desempate por ordem de
+        inserção (O(log n) por inserção/remoção). O WEIGHTED_PRIORITY usa o envelhecimento preguiçoso
+        de WeightedPriorityAging. Outras estratégias mantêm a lista reordenada a cada inserção.
+
         :param file_path: Caminho do arquivo CSV contendo os robôs.
         :param sorting_algorithm: Algoritmo de ordenação da fila.
         :param data: Dicionário opcional para armazenar informações auxiliares do algoritmo.
         """
-        self.robots = self._load_queue(file_path)
+        self._data = data if data is not None else {}  # Inicializa o data
+        self._build(self._load_queue(file_path), sorting_algorithm)
+
+    def _build(self, robots, sorting_algorithm, initial=True):
+        """
+        Monta a estrutura da fila para o algoritmo de ordenação a partir dos robôs em ordem.
+
+        :param initial: Se True, aplica a regra da fila inicial do WEIGHTED_PRIORITY (último robô com peso 0).
+        """
         self.sorting_algorithm = sorting_algorithm
-        self.data = data if data is not None else {}  # Inicializa o data
-        self._apply_sorting()
+        self._sorter = QueueSortingAlgorithm(sorting_algorithm)
+        self._sequence = 0  # Contador de inserção (desempate FIFO)
+        self._popped = {}  # robô -> entrada do heap na última retirada (ver `requeue`)
+        self._heap = None
+        self._robots = None
+        self._aging = None
+
+        if sorting_algorithm == "WEIGHTED_PRIORITY":
+            self._aging = WeightedPriorityAging()
+            self._aging.load_weights(self._data)
+            self._aging.advance()
+            for position, robot in enumerate(robots):
+                # Como na ordenação original, o último robô da fila inicial começa com peso 0
+                base_weight = 0 if initial and position == len(robots) - 1 else self._data.get(robot.name, {"weight": 0})["weight"]
+                self._aging.push(robot, base_weight)
+        elif self._sorter.uses_heap():
+            self._heap = [(self._sorter.heap_key(robot, sequence), robot) for sequence, robot in enumerate(robots)]
+            heapq.heapify(self._heap)
+            self._sequence = len(robots)
+        else:
+            self._robots = robots
+            self._apply_sorting()
 
     def _load_queue(self, file_path):
         """
         Lê o arquivo CSV e carrega os robôs na fila inicial.
+
+        Cada robô aparece uma única vez: os pesos do WEIGHTED_PRIORITY e a devolução de `requeue` são
+        indexados pelo nome do robô.
+
+        :raises ValueError: Se o arquivo listar o mesmo robô mais de uma vez.
         """
-        df = pd.read_csv(file_path)
-        robots = [Robot(row["robot"], row["priority"]) for _, row in df.iterrows()]
+        robots = [Robot(robot_name, priority) for robot_name, priority in read_dynamic_queue(file_path)]
+        duplicates = sorted(name for name, count in Counter(robot.name for robot in robots).items() if count > 1)
+        if duplicates:
+            raise ValueError(f"Robôs repetidos na fila dinâmica {file_path}: {', '.join(duplicates)}")
         return robots
 
+    @property
+    def data(self):
+        """
+        Informações auxiliares do algoritmo (ex: pesos do WEIGHTED_PRIORITY, calculados sob demanda).
+        """
+        if self._aging is not None:
+            return self._aging.weights()
+        return self._data
+
+    @property
+    def robots(self):
+        """
+        Lista dos robôs na ordem em que serão retirados da fila.
+        """
+        if self._aging is not None:
+            return self._aging.ordered()
+        if self._heap is not None:
+            return [robot for _, robot in sorted(self._heap)]
+        return self._robots
+
     def _apply_sorting(self):
         """
         Aplica o algoritmo de ordenação definido e atualiza o data.
         """
-        self.robots, self.data = QueueSortingAlgorithm(self.sorting_algorithm).sort(self.robots, self.data)
+        self._robots, self._data = self._sorter.sort(self._robots, self._data)
+
+    def change_sorting_algorithm(self, sorting_algorithm):
+        """
+        Troca o algoritmo de ordenação mantendo os robôs da fila e o `data` atual
+        (ex: derivar variantes de estratégia a partir de um checkpoint).
+
+        :param sorting_algorithm: Novo algoritmo de ordenação da fila.
+        """
+        robots = self.robots
+        self._data = self.data
+        self._build(robots, sorting_algorithm, initial=False)
 
     def get_next_robot(self):
         """
         Retorna o próximo robô da fila e remove da lista.
         """
-        if self.robots:
-            return self.robots.pop(0)  # Remove e retorna o primeiro robô
+        if self._aging is not None:
+            return self._aging.pop()
+        if self._heap is not None:
+            if self._heap:
+                entry = heapq.heappop(self._heap)  # Remove e retorna o robô de menor chave
+                self._popped[entry[1].name] = entry
+                return entry[1]
+            return None
+        if self._robots:
+            return self._robots.pop(0)  # Remove e retorna o primeiro robô
         return None  # Retorna None se a fila estiver vazia
 
     def add_robot(self, robot):
         """
         Adiciona um novo robô à fila e reordena.
         """
-        self.robots.append(robot)
+        if self._aging is not None:
+            # Uma reordenação: avança o tick e o robô volta com peso zerado
+            self._aging.advance()
+            self._aging.push(robot)
+            return
+        if self._heap is not None:
+            heapq.heappush(self._heap, (self._sorter.heap_key(robot, self._sequence), robot))
+            self._sequence += 1
+            return
+        self._robots.append(robot)
         self._apply_sorting()  # Ordena a fila novamente
 
+    def requeue(self, robot):
+        """
+        Devolve à fila um robô retirado por `get_next_robot` que não pôde ser executado (ex: nenhuma máquina
+        compatível ociosa). Diferente de `add_robot`, não é uma nova chegada: o robô volta para a mesma posição
+        e, no WEIGHTED_PRIORITY, mantém o peso acumulado sem avançar o envelhecimento.
+
+        :param robot: Robô retornado por `get_next_robot`.
+        """
+        if self._aging is not None:
+            self._aging.requeue(robot)
+        elif self._heap is not None:
+            heapq.heappush(self._heap, self._popped.pop(robot.name))
+        else:
+            self._robots.insert(0, robot)
+
+    def get_queue_size(self):
+        """
+        Retorna a quantidade de robôs na fila.
+        """
+        if self._aging is not None:
+            return len(self._aging)
+        if self._heap is not None:
+            return len(self._heap)
+        return len(self._robots)
+
     def __repr__(self):
         """
         Representação legível da fila de robôs.
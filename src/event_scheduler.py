@@ -1,7 +1,16 @@
 import heapq
+from datetime import timedelta
+
+# Ordem de processamento de eventos no mesmo instante (menor primeiro); empates restantes seguem a ordem de inserção
+EVENT_TYPE_PRIORITY = {"start_execution": 0, "end_execution": 1}
+TICKS_PER_MINUTE = 60  # O tempo interno é contado em segundos desde o início da simulação
+EVENT_SCHEDULER_BACKENDS = ("heap", "calendar")
+
 
 class Event:
-    def __init__(self, event_time, event_type, robot, machine_name):
+    __slots__ = ("event_time", "event_type", "robot", "machine_name", "tick")
+
+    def __init__(self, event_time, event_type, robot, machine_name, tick=None):
         """
         Representa um evento dentro da simulação.
 
@@ -9,11 +18,26 @@ class Event:
         :param event_type: Tipo do evento ('start_execution' ou 'end_execution').
         :param robot: Instância da classe Robot.
         :param machine_name: Nome da máquina onde o robô será executado.
+        :param tick: (Opcional) Tempo do evento em segundos desde o início da simulação. Se omitido,
+                     é calculado pelo EventScheduler a partir de `event_time`.
+        """
+        self.event_time = event_time
+        self.event_type = event_type
+        self.robot = robot
+        self.machine_name = machine_name
+        self.tick = tick
+
+    def reuse(self, event_time, event_type, robot, machine_name, tick=None):
+        """
+        Reaproveita o objeto para um novo evento, evitando alocar um Event para cada início e fim de execução.
+        Só pode ser usado com um evento que já saiu do EventScheduler (já processado).
         """
-        self.event_time = event_time  
-        self.event_type = event_type  
-        self.robot = robot 
-        self.machine_name = machine_name  
+        self.event_time = event_time
+        self.event_type = event_type
+        self.robot = robot
+        self.machine_name = machine_name
+        self.tick = tick
+        return self
 
     def __lt__(self, other):
         """
@@ -34,31 +58,157 @@ class EventScheduler:
     def __init__(self, start_time):
         """
         Inicializa o escalonador de eventos.
-        
-        :param start_time: Tempo inicial da simulação (datetime).
+
+        Os eventos são guardados no heap como tuplas (tick, prioridade do tipo, sequência, evento), com o
+        tick em segundos inteiros desde `start_time`. A sequência de inserção desempata eventos do mesmo
+        tipo no mesmo instante, então a ordem de processamento é sempre a mesma (reprodutível).
+
+        :param start_time: Tempo inicial da simulação (datetime), usado como época do tick.
         """
         self.event_heap = []  # MinHeap para armazenar os eventos
+        self.start_time = start_time
         self.current_time = start_time  # Clock interno da simulação
-    
+        self.current_tick = 0
+        self._sequence = 0
+
+    def to_tick(self, event_time):
+        """
+        Converte um datetime em segundos inteiros desde o início da simulação.
+        """
+        return (event_time - self.start_time) // timedelta(seconds=1)
+
+    def from_tick(self, tick):
+        """
+        Converte um tick (segundos desde o início da simulação) em datetime.
+        """
+        return self.start_time + timedelta(seconds=tick)
+
     def add_event(self, event):
         """
         Adiciona um evento ao heap.
-        
+
         :param event: Instância da classe Event.
         """
-        heapq.heappush(self.event_heap, (event.event_time, event))
-    
+        if event.tick is None:
+            event.tick = self.to_tick(event.event_time)
+        heapq.heappush(self.event_heap, (event.tick, EVENT_TYPE_PRIORITY.get(event.event_type, len(EVENT_TYPE_PRIORITY)), self._sequence, event))
+        self._sequence += 1
+
     def get_next_event(self):
         """
         Retorna o próximo evento a ser processado e avança o clock.
         """
         if self.event_heap:
-            self.current_time, event = heapq.heappop(self.event_heap)
+            self.current_tick, _, _, event = heapq.heappop(self.event_heap)
+            self.current_time = event.event_time
             return event
         return None
-    
+
+    def peek_tick(self):
+        """
+        Retorna o tick do próximo evento sem removê-lo (None se não houver eventos).
+        """
+        return self.event_heap[0][0] if self.event_heap else None
+
     def has_pending_events(self):
         """
         Retorna True se ainda há eventos pendentes no heap.
         """
         return len(self.event_heap) > 0
+
+    def __len__(self):
+        """
+        Quantidade de eventos pendentes.
+        """
+        return len(self.event_heap)
+
+
+class CalendarEventScheduler(EventScheduler):
+    def __init__(self, start_time, bucket_minutes=1):
+        """
+        Escalonador de eventos em calendário (fila de baldes por intervalo de tempo).
+
+        Os eventos são agrupados em baldes de `bucket_minutes` minutos. Um heap pequeno guarda apenas os
+        índices dos baldes não vazios; dentro de cada balde os eventos ficam em um heap próprio. Em linhas
+        do tempo densas (muitos eventos por minuto, como o BP Scheduler de um mês inteiro) as operações
+        trabalham sobre heaps bem menores do que um heap único com todos os eventos.
+
+        Mantém a mesma interface e a mesma ordem de processamento do EventScheduler.
+
+        :param start_time: Tempo inicial da simulação (datetime), usado como época do tick.
+        :param bucket_minutes: Largura de cada balde em minutos.
+        """
+        super().__init__(start_time)
+        self.bucket_width = max(1, int(bucket_minutes * TICKS_PER_MINUTE))
+        self._buckets = {}  # índice do balde -> heap de (tick, prioridade do tipo, sequência, evento)
+        self._bucket_heap = []  # índices dos baldes não vazios
+        self._size = 0
+
+    def add_event(self, event):
+        """
+        Adiciona um evento ao balde do seu intervalo de tempo.
+
+        :param event: Instância da classe Event.
+        """
+        if event.tick is None:
+            event.tick = self.to_tick(event.event_time)
+        entry = (event.tick, EVENT_TYPE_PRIORITY.get(event.event_type, len(EVENT_TYPE_PRIORITY)), self._sequence, event)
+        self._sequence += 1
+        self._size += 1
+
+        bucket_index = event.tick // self.bucket_width
+        bucket = self._buckets.get(bucket_index)
+        if bucket is None:
+            self._buckets[bucket_index] = [entry]
+            heapq.heappush(self._bucket_heap, bucket_index)
+        else:
+            heapq.heappush(bucket, entry)
+
+    def get_next_event(self):
+        """
+        Retorna o próximo evento a ser processado e avança o clock.
+        """
+        if not self._size:
+            return None
+
+        bucket_index = self._bucket_heap[0]
+        bucket = self._buckets[bucket_index]
+        self.current_tick, _, _, event = heapq.heappop(bucket)
+        if not bucket:
+            del self._buckets[bucket_index]
+            heapq.heappop(self._bucket_heap)
+        self._size -= 1
+        self.current_time = event.event_time
+        return event
+
+    def peek_tick(self):
+        """
+        Retorna o tick do próximo evento sem removê-lo (None se não houver eventos).
+        """
+        return self._buckets[self._bucket_heap[0]][0][0] if self._size else None
+
+    def has_pending_events(self):
+        """
+        Retorna True se ainda há eventos pendentes.
+        """
+        return self._size > 0
+
+    def __len__(self):
+        """
+        Quantidade de eventos pendentes.
+        """
+        return self._size
+
+
+def create_event_scheduler(start_time, backend="heap"):
+    """
+    Cria o escalonador de eventos do backend escolhido.
+
+    :param start_time: Tempo inicial da simulação.
+    :param backend: 'heap' (heap binário único) ou 'calendar' (baldes de um minuto).
+    """
+    if backend == "heap":
+        return EventScheduler(start_time)
+    elif backend == "calendar":
+        return CalendarEventScheduler(start_time)
+    raise ValueError(f"Backend de eventos {backend} não reconhecido (use {', '.join(EVENT_SCHEDULER_BACKENDS)})")
@@ -1,5 +1,320 @@
-import pandas as pd
+import bisect
+import heapq
 from datetime import datetime
+from scenario_loader import read_execution_dataset
+
+COMPLETED_END = datetime.min  # Fim de janela das execuções concluídas na árvore de intervalos (nunca cobre um horário)
+
+
+class ExecutionRecord:
+    __slots__ = ("execution_id", "robot", "items", "time_per_item", "start_window", "end_window", "completed")
+
+    def __init__(self, execution_id, robot, items, time_per_item, start_window=None, end_window=None, completed=False):
+        """
+        Representa uma linha do ExecutionDataset.
+
+        :param execution_id: ID único da execução.
+        :param robot: Nome do robô.
+        :param items: Quantidade de itens a processar.
+        :param time_per_item: Tempo (minutos) gasto por item.
+        :param start_window: Início da janela de execução (datetime ou None).
+        :param end_window: Fim da janela de execução (datetime ou None).
+        :param completed: Indica se a execução já foi concluída.
+        """
+        self.execution_id = execution_id
+        self.robot = robot
+        self.items = items
+        self.time_per_item = time_per_item
+        self.start_window = start_window
+        self.end_window = end_window
+        self.completed = completed
+
+    @property
+    def work(self):
+        """
+        Tempo total de trabalho da execução (items * time_per_item).
+        """
+        return self.items * self.time_per_item
+
+    def has_window(self):
+        """
+        Retorna True se a execução possui janela de horário completa.
+        """
+        return bool(self.start_window and self.end_window)
+
+    def to_dict(self):
+        """
+        Retorna a execução no formato de dicionário usado pela simulação.
+        """
+        return {
+            "execution_id": self.execution_id,
+            "robot": self.robot,
+            "items": self.items,
+            "time_per_item": self.time_per_item,
+            "start_window": self.start_window,
+            "end_window": self.end_window,
+            "completed": self.completed
+        }
+
+    def __repr__(self):
+        """
+        Representação legível da execução.
+        """
+        return (f"ExecutionRecord(id={self.execution_id}, robot={self.robot}, items={self.items}, "
+                f"time_per_item={self.time_per_item}, window=({self.start_window}, {self.end_window}), "
+                f"completed={self.completed})")
+
+
+class IndexState:
+    __slots__ = ("completed", "max_end", "next_expiring", "unconstrained_cursor", "pending_unconstrained", "pending_ends")
+
+    def __init__(self, index):
+        """
+        Estado mutável das buscas sobre um ExecutionIndex (um por ExecutionDataset ou por variante de um lote).
+
+        - `completed`: 1 para cada linha concluída (bytearray, na ordem do arquivo).
+        - `max_end`: árvores de segmentos com o maior end_window pendente de cada trecho (concluídas valem COMPLETED_END).
+        - `next_expiring`: union-find sobre as posições em ordem de end_window, para pular as concluídas.
+        - `unconstrained_cursor`: primeira execução sem janela possivelmente pendente de cada robô.
+        - `pending_unconstrained` e `pending_ends`: execuções sem janela pendentes e heap de máximo preguiçoso
+          dos fins de janela pendentes (usados em `has_satisfiable_executions`).
+
+        :param index: Instância de ExecutionIndex.
+        """
+        self.completed = bytearray(index.initially_completed)
+        self.max_end = list(index.initial_tree)
+        self.next_expiring = list(index.initial_next_expiring)
+        self.unconstrained_cursor = [0] * len(index.robot_names)
+        self.pending_unconstrained = index.initially_pending_unconstrained
+        self.pending_ends = list(index.initial_pending_ends)  # Cópia de um heap já é um heap válido
+
+
+class ExecutionIndex:
+    def __init__(self, records):
+        """
+        Índice somente leitura das execuções, por robô. As buscas recebem o IndexState a consultar, então um
+        mesmo índice atende o ExecutionDataset e todas as variantes de um lote (BatchSimulation).
+
+        As execuções são identificadas pela linha no arquivo. Para cada robô (pelo código, na ordem de aparição):
+        - `windowed_rows`/`starts`: execuções com janela ordenadas por start_window (empate mantém a ordem do arquivo),
+          com a árvore de segmentos do robô a partir de `tree_base` (folhas a partir de `tree_base + tree_size`);
+        - `expiring_rows`/`ends`: as mesmas execuções ordenadas por end_window, a partir de `expiring_base`
+          (seguidas de uma posição sentinela);
+        - `unconstrained_rows`: execuções sem janela, na ordem do arquivo.
+
+        :param records: Execuções (ExecutionRecord) na ordem do arquivo.
+        """
+        self.records = records
+        self.initially_completed = bytes(bool(record.completed) for record in records)  # Estado dos novos IndexState
+        self.robot_names = list(dict.fromkeys(record.robot for record in records))
+        self.robot_codes = robot_codes = {robot: code for code, robot in enumerate(self.robot_names)}
+        self.robot_code = [robot_codes[record.robot] for record in records]
+        self.row_by_id = {}
+        for row, record in enumerate(records):
+            self.row_by_id.setdefault(record.execution_id, row)  # Em IDs duplicados vale a primeira ocorrência
+
+        self.starts = []
+        self.windowed_rows = []
+        self.tree_base = []
+        self.tree_size = []
+        self.ends = []
+        self.expiring_base = []
+        self.expiring_rows = []  # Todas as posições em ordem de end_window (robô a robô), com as sentinelas
+        self.unconstrained_rows = []
+        self.leaf = [-1] * len(records)  # Folha de cada linha com janela na árvore do seu robô
+        self.expiring_position = [-1] * len(records)  # Posição de cada linha com janela em `expiring_rows`
+
+        rows_by_robot = [[] for _ in self.robot_names]
+        for row, record in enumerate(records):
+            rows_by_robot[robot_codes[record.robot]].append(row)
+
+        self.initial_tree = []
+        self.initial_next_expiring = []
+        for rows in rows_by_robot:
+            windowed = sorted((row for row in rows if records[row].has_window()), key=lambda row: records[row].start_window)
+            self.windowed_rows.append(windowed)
+            self.starts.append([records[row].start_window for row in windowed])
+            self.unconstrained_rows.append([row for row in rows if not records[row].has_window()])
+
+            base, size = len(self.initial_tree), 1
+            while size < len(windowed):
+                size *= 2
+            self.tree_base.append(base)
+            self.tree_size.append(size)
+            tree = [COMPLETED_END] * (2 * size)
+            for position, row in enumerate(windowed):
+                self.leaf[row] = base + size + position
+                tree[size + position] = COMPLETED_END if records[row].completed else records[row].end_window
+            for node in range(size - 1, 0, -1):
+                tree[node] = max(tree[2 * node], tree[2 * node + 1])
+            self.initial_tree.extend(tree)
+
+            # Cada posição pendente aponta para ela mesma; a sentinela do robô também
+            expiring = sorted(windowed, key=lambda row: records[row].end_window)
+            base = len(self.expiring_rows)
+            self.expiring_base.append(base)
+            self.ends.append([records[row].end_window for row in expiring])
+            for position, row in enumerate(expiring, start=base):
+                self.expiring_position[row] = position
+                self.initial_next_expiring.append(position + 1 if records[row].completed else position)
+            self.expiring_rows.extend(expiring)
+            self.expiring_rows.append(None)
+            self.initial_next_expiring.append(base + len(expiring))
+
+        self.initially_pending_unconstrained = sum(1 for record in records if not record.has_window() and not record.completed)
+        self.initial_pending_ends = [(datetime.max - record.end_window, row) for row, record in enumerate(records)
+                                     if record.has_window() and not record.completed]
+        heapq.heapify(self.initial_pending_ends)
+
+    def new_state(self):
+        """
+        Retorna um IndexState no estado inicial (execuções concluídas no arquivo já removidas das buscas).
+        """
+        return IndexState(self)
+
+    def execution(self, state, row):
+        """
+        Retorna a execução da linha no formato de dicionário usado pela simulação, com a conclusão do `state`.
+        """
+        execution = self.records[row].to_dict()
+        execution["completed"] = bool(state.completed[row])
+        return execution
+
+    def find_execution(self, state, robot_code, execution_time):
+        """
+        Retorna a linha da execução pendente de menor start_window cuja janela contém o horário (O(log n) pela
+        árvore de intervalos do robô, descendo apenas pelos trechos com start_window <= horário e algum fim >= horário).
+        Se nenhuma janela contiver o horário, retorna a primeira execução pendente sem janela (ordem do arquivo), ou None.
+        """
+        upper = bisect.bisect_right(self.starts[robot_code], execution_time)
+        if upper:
+            base = self.tree_base[robot_code]
+            max_end = state.max_end
+            stack = [(1, 0, self.tree_size[robot_code])]
+            while stack:
+                node, low, high = stack.pop()
+                if low >= upper or max_end[base + node] < execution_time:
+                    continue
+                if high - low == 1:
+                    return self.windowed_rows[robot_code][low]
+                middle = (low + high) // 2
+                stack.append((2 * node + 1, middle, high))
+                stack.append((2 * node, low, middle))
+
+        unconstrained = self.unconstrained_rows[robot_code]
+        cursor = state.unconstrained_cursor[robot_code]
+        while cursor < len(unconstrained) and state.completed[unconstrained[cursor]]:
+            cursor += 1
+        state.unconstrained_cursor[robot_code] = cursor
+        return unconstrained[cursor] if cursor < len(unconstrained) else None
+
+    def complete(self, state, row):
+        """
+        Marca a linha como concluída no `state` e a remove das buscas.
+        """
+        state.completed[row] = 1
+        leaf = self.leaf[row]
+        if leaf < 0:
+            state.pending_unconstrained -= 1
+            return
+
+        base = self.tree_base[self.robot_code[row]]
+        max_end = state.max_end
+        max_end[leaf] = COMPLETED_END
+        node = (leaf - base) // 2
+        while node:
+            max_end[base + node] = max(max_end[base + 2 * node], max_end[base + 2 * node + 1])
+            node //= 2
+
+        position = self.expiring_position[row]
+        state.next_expiring[position] = position + 1
+
+    @staticmethod
+    def _find_expiring(state, position):
+        """
+        Retorna a primeira posição pendente a partir de `position` em `expiring_rows` (com compressão de caminho).
+        """
+        next_expiring = state.next_expiring
+        root = position
+        while next_expiring[root] != root:
+            root = next_expiring[root]
+        while next_expiring[position] != root:
+            next_expiring[position], position = root, next_expiring[position]
+        return root
+
+    def expiring_before(self, state, execution_time, robot_code=None):
+        """
+        Retorna as linhas pendentes com end_window anterior ao horário, em ordem de end_window
+        (em empates, pela ordem dos robôs e das janelas no índice).
+
+        :param robot_code: (Opcional) Código do robô; sem ele, considera todos os robôs.
+        """
+        rows = []
+        for code in range(len(self.robot_names)) if robot_code is None else (robot_code,):
+            base = self.expiring_base[code]
+            upper = base + bisect.bisect_left(self.ends[code], execution_time)
+            position = self._find_expiring(state, base)
+            while position < upper:
+                rows.append(self.expiring_rows[position])
+                position = self._find_expiring(state, position + 1)
+        if robot_code is None:
+            rows.sort(key=lambda row: self.records[row].end_window)
+        return rows
+
+    def has_satisfiable_executions(self, state, current_time):
+        """
+        Retorna True se alguma execução pendente do `state` ainda pode ser iniciada a partir de `current_time`
+        (sem janela ou com a janela terminando em `current_time` ou depois). O(1) amortizado.
+        """
+        if state.pending_unconstrained:
+            return True
+        pending_ends = state.pending_ends
+        while pending_ends and state.completed[pending_ends[0][1]]:
+            heapq.heappop(pending_ends)
+        return bool(pending_ends) and self.records[pending_ends[0][1]].end_window >= current_time
+
+
+class _ProgressCounter:
+    __slots__ = ("completed_work", "total_work", "completed_executions", "total_executions")
+
+    def __init__(self):
+        """
+        Contadores acumulados de trabalho (items * time_per_item) de um grupo de execuções.
+        """
+        self.completed_work = 0
+        self.total_work = 0
+        self.completed_executions = 0
+        self.total_executions = 0
+
+    def add(self, record):
+        """
+        Inclui uma execução no grupo.
+        """
+        self.total_work += record.work
+        self.total_executions += 1
+        if record.completed:
+            self.complete(record)
+
+    def complete(self, record):
+        """
+        Contabiliza a conclusão de uma execução do grupo.
+        """
+        self.completed_work += record.work
+        self.completed_executions += 1
+
+    def to_dict(self):
+        """
+        Retorna os contadores e a porcentagem de completude do grupo.
+        """
+        return {
+            "completed_work": self.completed_work,
+            "remaining_work": self.total_work - self.completed_work,
+            "total_work": self.total_work,
+            "completed_executions": self.completed_executions,
+            "total_executions": self.total_executions,
+            "completion_percentage": (self.completed_work / self.total_work) * 100 if self.total_work else 0.0
+        }
+
 
 class ExecutionDataset:
     def __init__(self, file_path):
@@ -10,61 +325,72 @@ class ExecutionDataset:
         """
         self.file_path = file_path
         self.executions = self._load_executions()
-        self._total_execution_time = self._calculate_total_execution_time()  # Calcula o tempo total planejado
+        self._build_indexes()
+        self._build_progress_counters()
 
     def _load_executions(self):
         """
-        Lê o arquivo CSV e carrega as execuções em um conjunto de dicionários.
+        Lê o arquivo CSV e carrega as execuções em uma lista de ExecutionRecord (ordem do arquivo).
         """
-        df = pd.read_csv(self.file_path)
-        executions = set()
+        return [ExecutionRecord(*row) for row in read_execution_dataset(self.file_path)]
 
-        for _, row in df.iterrows():
-            execution = {
-                "execution_id": row["execution_id"],
-                "robot": row["robot"],
-                "items": row["items"],
-                "time_per_item": row["time_per_item"],
-                "start_window": None if pd.isna(row["start_window"]) or row["start_window"] == "" else self._parse_datetime(row["start_window"]),
-                "end_window": None if pd.isna(row["end_window"]) or row["end_window"] == "" else self._parse_datetime(row["end_window"]),
-                "completed": row["completed"] if "completed" in row else False  # Respeita o valor existente ou assume False
-            }
-            executions.add(frozenset(execution.items()))
+    def _build_indexes(self):
+        """
+        Monta o índice das execuções (por ID e por robô) e o estado das buscas.
+        """
+        self._index = ExecutionIndex(self.executions)
+        self._state = self._index.new_state()
 
-        return executions
+    def _build_progress_counters(self):
+        """
+        Inicializa os totais acumulados de trabalho (geral, por robô e por janela).
+        Eles são atualizados em `mark_execution_complete`, sem varrer o dataset novamente.
+        """
+        self._progress = _ProgressCounter()
+        self._progress_by_robot = {}
+        self._progress_by_window = {}
+
+        for record in self.executions:
+            self._progress.add(record)
+            self._progress_by_robot.setdefault(record.robot, _ProgressCounter()).add(record)
+            self._progress_by_window.setdefault(self._window_key(record), _ProgressCounter()).add(record)
 
-    def _calculate_total_execution_time(self):
+        self._total_execution_time = self._progress.total_work  # Tempo total planejado
+
+    @staticmethod
+    def _window_key(record):
         """
-        Calcula o tempo total planejado de execução somando items * time_per_item de todas as execuções.
+        Chave da janela de execução usada nos contadores por janela ((None, None) para execuções sem restrição).
         """
-        return sum(dict(exec)["items"] * dict(exec)["time_per_item"] for exec in self.executions)
+        if record.has_window():
+            return (record.start_window, record.end_window)
+        return (None, None)
 
-    def _parse_datetime(self, datetime_str):
+    @property
+    def index(self):
         """
-        Converte um valor de string no formato 'YYYY-MM-DD HH:MM' para um objeto datetime.
+        Índice somente leitura das execuções, no estado da carga do arquivo (compartilhado pelas variantes de BatchSimulation).
         """
-        return datetime.strptime(datetime_str, "%Y-%m-%d %H:%M")
+        return self._index
 
     def get_execution_by_robot_and_time(self, robot, execution_time):
         """
         Retorna a primeira execução correspondente ao robô e ao horário.
 
+        Entre as execuções pendentes cuja janela contém o horário, retorna a de menor start_window
+        (em empates, a primeira do arquivo), em O(log n) pela árvore de intervalos do robô.
+        Se nenhuma janela contiver o horário, retorna a primeira execução pendente sem restrição de janela
+        (ordem do arquivo).
+
         :param robot: Nome do robô.
         :param execution_time: Data e hora da execução.
         :return: Execução correspondente ou None se não encontrar.
         """
-        best_match = None
-
-        for execution in self.executions:
-            exec_dict = dict(execution)
-            if exec_dict["robot"] == robot and not exec_dict["completed"]:
-                if exec_dict["start_window"] and exec_dict["end_window"]:
-                    if exec_dict["start_window"] <= execution_time <= exec_dict["end_window"]:
-                        return exec_dict  # Retorna imediatamente se houver um match exato
-                elif best_match is None:
-                    best_match = exec_dict
-
-        return best_match  # Retorna a execução sem restrição se nenhuma com janela foi encontrada
+        robot_code = self._index.robot_codes.get(robot)
+        if robot_code is None:
+            return None
+        row = self._index.find_execution(self._state, robot_code, execution_time)
+        return None if row is None else self.executions[row].to_dict()
 
     def mark_execution_complete(self, execution_id):
         """
@@ -72,25 +398,31 @@ class ExecutionDataset:
 
         :param execution_id: ID único da execução.
         """
-        for execution in self.executions:
-            exec_dict = dict(execution)
-            if exec_dict["execution_id"] == execution_id and not exec_dict["completed"]:
-                
-                # Marcar como concluído
-                exec_dict["completed"] = True
-                
-                # Atualizar o conjunto
-                self.executions.remove(execution)
-                self.executions.add(frozenset(exec_dict.items()))
-                return True  # Retorna sucesso
+        row = self._index.row_by_id.get(execution_id)
+        if row is None or self._state.completed[row]:
+            return False  # Nenhuma execução encontrada para marcar
+        record = self.executions[row]
 
-        return False  # Nenhuma execução encontrada para marcar
+        # Marcar como concluído e atualizar os contadores
+        record.completed = True
+        self._progress.complete(record)
+        self._progress_by_robot[record.robot].complete(record)
+        self._progress_by_window[self._window_key(record)].complete(record)
+        self._index.complete(self._state, row)
+        return True  # Retorna sucesso
 
     def all_executions_complete(self):
         """
         Retorna True se todas as execuções foram concluídas.
         """
-        return all(dict(execution)["completed"] for execution in self.executions)
+        return self._progress.completed_executions == self._progress.total_executions
+
+    def has_satisfiable_executions(self, current_time):
+        """
+        Retorna True se alguma execução pendente ainda pode ser iniciada a partir de `current_time`
+        (sem janela ou com a janela terminando em `current_time` ou depois). O(1) amortizado.
+        """
+        return self._index.has_satisfiable_executions(self._state, current_time)
 
     def get_completion_percentage(self):
         """
@@ -101,20 +433,62 @@ class ExecutionDataset:
         if self._total_execution_time == 0:
             return 0.0  # Evita divisão por zero
 
-        completed_time = sum(
-            dict(exec)["items"] * dict(exec)["time_per_item"]
-            for exec in self.executions if dict(exec)["completed"]
-        )
-        return (completed_time / self._total_execution_time) * 100  # Retorna a porcentagem
+        return (self._progress.completed_work / self._total_execution_time) * 100  # Retorna a porcentagem
+
+    def get_completed_work(self):
+        """
+        Retorna o tempo total (items * time_per_item) das execuções já concluídas.
+        """
+        return self._progress.completed_work
+
+    def get_remaining_work(self):
+        """
+        Retorna o tempo total (items * time_per_item) das execuções ainda pendentes.
+        """
+        return self._progress.total_work - self._progress.completed_work
+
+    def get_progress_by_robot(self):
+        """
+        Retorna o progresso de cada robô.
+
+        :return: Dicionário {robô: {completed_work, remaining_work, total_work, completed_executions,
+                 total_executions, completion_percentage}}.
+        """
+        return {robot: counter.to_dict() for robot, counter in self._progress_by_robot.items()}
+
+    def get_progress_by_window(self):
+        """
+        Retorna o progresso de cada janela de execução.
+
+        :return: Dicionário {(start_window, end_window): contadores no mesmo formato de `get_progress_by_robot`}.
+                 Execuções sem janela ficam agrupadas na chave (None, None).
+        """
+        return {window: counter.to_dict() for window, counter in self._progress_by_window.items()}
+
+    def get_executions_expiring_before(self, execution_time, robot=None):
+        """
+        Retorna as execuções pendentes cuja janela termina antes do horário (base para estratégias por prazo).
+
+        :param execution_time: Data e hora de referência.
+        :param robot: (Opcional) Nome do robô; sem ele, considera todos os robôs.
+        :return: Lista de execuções ordenada por end_window (em empates, pela ordem dos robôs e das janelas no índice).
+        """
+        if robot is None:
+            rows = self._index.expiring_before(self._state, execution_time)
+        elif robot in self._index.robot_codes:
+            rows = self._index.expiring_before(self._state, execution_time, self._index.robot_codes[robot])
+        else:
+            rows = []
+        return [self.executions[row].to_dict() for row in rows]
 
     def get_pending_executions(self):
         """
         Retorna todas as execuções pendentes.
         """
-        return [dict(execution) for execution in self.executions if not dict(execution)["completed"]]
+        return [record.to_dict() for record in self.executions if not record.completed]
 
     def __repr__(self):
         """
         Representação legível do ExecutionDataset.
         """
-        return f"ExecutionDataset({[dict(exec) for exec in self.executions]})"
+        return f"ExecutionDataset({[record.to_dict() for record in self.executions]})"
@@ -1,46 +1,181 @@
+import csv
+import heapq
+from enum import IntEnum
+
+
+class MachineStatus(IntEnum):
+    IDLE = 0
+    BUSY = 1
+
+    def __str__(self):
+        """
+        Nome do status em minúsculas ('idle' ou 'busy'), como no `repr` das máquinas.
+        """
+        return self.name.lower()
+
+
+IDLE = MachineStatus.IDLE
+BUSY = MachineStatus.BUSY
+
+
 class Machine:
-    def __init__(self, name):
+    __slots__ = ("name", "status", "capabilities", "index")
+
+    def __init__(self, name, capabilities=None, index=0):
         """
         Representa uma máquina dentro da simulação.
 
         :param name: Nome da máquina.
+        :param capabilities: (Opcional) Conjunto de robôs que podem executar na máquina. None aceita qualquer robô.
+        :param index: Posição da máquina no pool (define a ordem de escolha entre máquinas ociosas).
         """
         self.name = name
-        self.status = "idle"  # Inicialmente, todas as máquinas estão ociosas
+        self.status = IDLE  # Inicialmente, todas as máquinas estão ociosas
+        self.capabilities = frozenset(capabilities) if capabilities else None
+        self.index = index
 
     def make_idle(self):
         """
         Define o status da máquina como 'idle' (ociosa).
         """
-        self.status = "idle"
+        self.status = IDLE
 
     def make_busy(self):
         """
         Define o status da máquina como 'busy' (ocupada).
         """
-        self.status = "busy"
+        self.status = BUSY
 
     def is_idle(self):
         """
         Retorna True se a máquina está ociosa.
         """
-        return self.status == "idle"
+        return self.status is IDLE
+
+    def accepts(self, robot_name):
+        """
+        Retorna True se o robô pode executar nesta máquina.
+        """
+        return self.capabilities is None or robot_name in self.capabilities
 
     def __repr__(self):
         """
         Representação legível da máquina.
         """
-        return f"Machine(name={self.name}, status={self.status})"
+        return f"Machine(name={self.name}, status={self.status!s})"
+
+
+class _IdleHeap:
+    def __init__(self, machines):
+        """
+        Heap de máquinas ociosas ordenado pela posição no pool, com remoção preguiçosa.
+
+        Máquinas que ficaram ocupadas continuam no heap até chegarem ao topo; `members` evita
+        inserir a mesma máquina duas vezes.
+
+        :param machines: Máquinas (ociosas) iniciais do heap.
+        """
+        self.heap = [machine.index for machine in machines if machine.is_idle()]
+        heapq.heapify(self.heap)
+        self.members = set(self.heap)
+
+    def push(self, machine):
+        if machine.index not in self.members:
+            self.members.add(machine.index)
+            heapq.heappush(self.heap, machine.index)
+
+    def peek(self, pool):
+        """
+        Retorna a primeira máquina ociosa do heap (ou None), descartando entradas de máquinas ocupadas.
+        """
+        while self.heap:
+            machine = pool[self.heap[0]]
+            if machine.is_idle():
+                return machine
+            self.members.discard(heapq.heappop(self.heap))
+        return None
 
 
 class Machines:
-    def __init__(self, machine_names):
+    def __init__(self, machine_names, capabilities=None):
         """
-        Gerencia um grupo de máquinas.
+        Gerencia um grupo (pool) de máquinas.
+
+        As máquinas ociosas ficam em heaps indexados pela ordem de declaração, de modo que consultar se
+        uma máquina está ociosa é O(1) e escolher a próxima máquina ociosa é O(log n), sem varrer o pool.
 
         :param machine_names: Lista com os nomes das máquinas.
+        :param capabilities: (Opcional) Dicionário {máquina: robôs aceitos}. Máquinas ausentes aceitam qualquer robô.
+        :raises ValueError: Se nenhuma máquina for informada (a simulação não teria onde executar os robôs).
         """
-        self.machines = {name: Machine(name) for name in machine_names}
+        capabilities = capabilities or {}
+        self.machines = {}
+        for name in machine_names:
+            if name not in self.machines:
+                self.machines[name] = Machine(name, capabilities.get(name), index=len(self.machines))
+        if not self.machines:
+            raise ValueError("O pool de máquinas está vazio: informe ao menos uma máquina")
+        self._pool = list(self.machines.values())
+        self._idle_count = len(self._pool)
+
+        # Heap com todas as máquinas, heap das máquinas sem restrição e um heap por robô para as restritas
+        self._all_idle = _IdleHeap(self._pool)
+        self._unrestricted_idle = _IdleHeap([machine for machine in self._pool if machine.capabilities is None])
+        self._idle_by_robot = {}
+        for machine in self._pool:
+            for robot_name in machine.capabilities or ():
+                self._idle_by_robot.setdefault(robot_name, []).append(machine)
+        self._idle_by_robot = {robot_name: _IdleHeap(machines) for robot_name, machines in self._idle_by_robot.items()}
+
+    @classmethod
+    def from_count(cls, count, prefix="M"):
+        """
+        Cria um pool com `count` máquinas nomeadas M1..Mn.
+        """
+        return cls([f"{prefix}{number}" for number in range(1, count + 1)])
+
+    @classmethod
+    def from_csv(cls, file_path):
+        """
+        Cria o pool a partir de um CSV com as colunas `machine` e `robots` (opcional).
+
+        A coluna `robots` lista, separados por ';', os robôs aceitos pela máquina; vazia aceita qualquer robô.
+
+        :param file_path: Caminho do arquivo CSV das máquinas.
+        """
+        machine_names = []
+        capabilities = {}
+        with open(file_path, mode="r", newline="") as file:
+            for row in csv.DictReader(file):
+                machine_names.append(row["machine"])
+                robots = [robot.strip() for robot in (row.get("robots") or "").split(";") if robot.strip()]
+                if robots:
+                    capabilities[row["machine"]] = robots
+        return cls(machine_names, capabilities)
+
+    @classmethod
+    def from_spec(cls, spec, default_names=None):
+        """
+        Cria o pool a partir de uma especificação textual (ex: argumento de linha de comando).
+
+        - Número inteiro ("50"): cria M1..M50.
+        - Caminho de um arquivo .csv: usa `from_csv`.
+        - "auto": usa `default_names` (ex: máquinas citadas no BP Scheduler do cenário).
+        - Caso contrário: nomes separados por vírgula ("M1,M2").
+
+        :param spec: Especificação das máquinas.
+        :param default_names: Nomes usados quando `spec` for "auto".
+        """
+        spec = str(spec).strip()
+        if spec.isdigit():
+            return cls.from_count(int(spec))
+        if spec.lower().endswith(".csv"):
+            return cls.from_csv(spec)
+        if spec == "auto":
+            if not default_names:
+                raise ValueError("Nenhuma máquina encontrada nos arquivos do cenário para a opção 'auto'")
+            return cls(default_names)
+        return cls([name.strip() for name in spec.split(",") if name.strip()])
 
     def make_machine_idle(self, machine_name):
         """
@@ -48,8 +183,16 @@ class Machines:
 
         :param machine_name: Nome da máquina.
         """
-        if machine_name in self.machines:
-            self.machines[machine_name].make_idle()
+        machine = self.machines.get(machine_name)
+        if machine is not None and not machine.is_idle():
+            machine.make_idle()
+            self._idle_count += 1
+            self._all_idle.push(machine)
+            if machine.capabilities is None:
+                self._unrestricted_idle.push(machine)
+            else:
+                for robot_name in machine.capabilities:
+                    self._idle_by_robot[robot_name].push(machine)
 
     def make_machine_busy(self, machine_name):
         """
@@ -57,8 +200,53 @@ class Machines:
 
         :param machine_name: Nome da máquina.
         """
-        if machine_name in self.machines:
-            self.machines[machine_name].make_busy()
+        machine = self.machines.get(machine_name)
+        if machine is not None and machine.is_idle():
+            machine.make_busy()
+            self._idle_count -= 1
+
+    def is_machine_idle(self, machine_name):
+        """
+        Retorna True se a máquina existe e está ociosa.
+        """
+        machine = self.machines.get(machine_name)
+        return machine is not None and machine.is_idle()
+
+    def machine_accepts(self, machine_name, robot_name):
+        """
+        Retorna True se a máquina existe e aceita o robô.
+        """
+        machine = self.machines.get(machine_name)
+        return machine is not None and machine.accepts(robot_name)
+
+    def get_next_idle_machine(self, robot_name=None, preferred=None):
+        """
+        Retorna o nome da primeira máquina ociosa (ordem de declaração) que aceita o robô.
+
+        :param robot_name: (Opcional) Nome do robô; sem ele, qualquer máquina ociosa serve.
+        :param preferred: (Opcional) Máquina escolhida se estiver ociosa e aceitar o robô.
+        :return: Nome da máquina ou None se nenhuma estiver disponível.
+        """
+        if preferred is not None and self.is_machine_idle(preferred) and (robot_name is None or self.machine_accepts(preferred, robot_name)):
+            return preferred
+
+        if robot_name is None:
+            machine = self._all_idle.peek(self._pool)
+            return machine.name if machine else None
+
+        candidates = [self._unrestricted_idle.peek(self._pool)]
+        if robot_name in self._idle_by_robot:
+            candidates.append(self._idle_by_robot[robot_name].peek(self._pool))
+        candidates = [machine for machine in candidates if machine is not None]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda machine: machine.index).name
+
+    def get_idle_count(self):
+        """
+        Retorna a quantidade de máquinas ociosas.
+        """
+        return self._idle_count
 
     def get_idle_machines(self):
         """
@@ -1,136 +1,201 @@
 import argparse
-from datetime import datetime, timedelta
-from event_scheduler import EventScheduler, Event
+import os
+from contextlib import nullcontext
+from datetime import datetime
 from bp_scheduler import BPScheduler
 from dynamic_queue import DynamicQueue
 from execution_dataset import ExecutionDataset
 from simulation_log import SimulationLog
 from machines import Machines
-from robot import Robot
-
-
-# python main.py -ubp -bsf "custom_bp_scheduler.csv" -dq "custom_dynamic_queue.csv" -eds "custom_execution_dataset.csv" -sa "FIFO" or "WEIGHTED_PRIORITY"
-# Configurar Argumentos do Terminal
-parser = argparse.ArgumentParser(description="Simulação de Execução de Robôs")
-
-parser.add_argument("-ubp", "--use_bp", action="store_true", help="Se definido, usa o BP Scheduler ao invés da Fila Dinâmica.")
-parser.add_argument("-bsf", "--bp_scheduler_file", type=str, help="Arquivo CSV do BP Scheduler.")
-parser.add_argument("-dq", "--dynamic_queue_file", type=str, help="Arquivo CSV da Fila Dinâmica.")
-parser.add_argument("-eds", "--execution_dataset_file", type=str, default="data/execution_dataset.csv", help="Arquivo CSV do Execution Dataset.")
-parser.add_argument("-sa", "--sort_algorithm", type=str, default="FIFO", help="Algoritmo de ordenação da Fila Dinâmica.")
-
-args = parser.parse_args()
-
-# Configuração baseada nos argumentos do terminal
-USE_BP_SCHEDULER = args.use_bp
-BP_SCHEDULER_FILE = args.bp_scheduler_file
-DYNAMIC_QUEUE_FILE = args.dynamic_queue_file
-EXECUTION_DATASET_FILE = args.execution_dataset_file
-SORT_ALGORITHM = args.sort_algorithm
-
-if BP_SCHEDULER_FILE:
-    SIMULATION_LOG_FILE = f'logs/simulation_log_{BP_SCHEDULER_FILE.replace('/','_')}.csv'
-else:
-    SIMULATION_LOG_FILE = f'logs/simulation_log_{DYNAMIC_QUEUE_FILE.replace('/','_')}_{SORT_ALGORITHM}.csv'
-
-# Inicializar as estruturas do sistema
-start_time = datetime(2025, 2, 20, 8, 0)  # Data inicial da simulação
-clock = start_time
-finish_time = datetime(2025, 3, 20, 0, 0)
-event_scheduler = EventScheduler(start_time)
-execution_dataset = ExecutionDataset(EXECUTION_DATASET_FILE)
-simulation_log = SimulationLog(SIMULATION_LOG_FILE)
-machine_names = ["M1"]  # Máquinas disponíveis
-machines = Machines(machine_names)
-
-
-# =================================== LÓGICA PARA ESCOLHER ENTRE BP SCHEDULER E FILA DINÂMICA ===================================
-if USE_BP_SCHEDULER:
-    scheduler = BPScheduler(BP_SCHEDULER_FILE)
-    executions = scheduler.get_all_executions()
-    for execution in executions:
-        robot = execution.robot 
-        scheduled_bot_event = Event(execution.start_time, "start_execution", robot, execution.machine_name)
-        event_scheduler.add_event(scheduled_bot_event)
-else:
-    scheduler = DynamicQueue(DYNAMIC_QUEUE_FILE, sorting_algorithm=SORT_ALGORITHM)
-
-    for machine in machines.get_idle_machines():
-        # Adicionar o primeiro evento da DynamicQueue ao EventScheduler
-        robot = scheduler.get_next_robot()
-        if robot:
-            initial_event = Event(start_time, "start_execution", robot, machine)
-            event_scheduler.add_event(initial_event)
-# =================================================================================================================================
-
-# Executar a simulação
-while (event_scheduler.has_pending_events() and USE_BP_SCHEDULER) or clock <= finish_time:
-    event = event_scheduler.get_next_event()
-    
-    # Sai do loop caso não tenha mais eventos a serem processados
-    if event == None:
-        break
-
-    # ============================= PROCESSAMENTO DE EVENTO DE INÍCIO (start_execution) =============================
-    if event.event_type == "start_execution":
-        if event.machine_name in machines.get_idle_machines():
-            machines.make_machine_busy(event.machine_name)
-
-            # Buscar uma execução no ExecutionDataset com base no robô e horário
-            current_execution = execution_dataset.get_execution_by_robot_and_time(event.robot.name, event.event_time)
-
-            # Definir o tempo de execução baseado no ExecutionDataset, se existir
-            if current_execution:
-                execution_time = current_execution["items"] * current_execution["time_per_item"]
-                execution_id = current_execution["execution_id"]
-            else:
-                execution_time = 2  # Tempo mínimo de execução para eventos fora do dataset
-                execution_id = None
-
-            # Set no valor do clock
-            clock = event.event_time
-
-            # Criar um evento de término da execução e adicioná-lo no EventScheduler
-            end_time = event.event_time + timedelta(minutes=execution_time)
-            event_scheduler.add_event(Event(end_time, "end_execution", event.robot, event.machine_name))
-
-            # Registrar no SimulationLog
-            simulation_log.log("robot_execution", event.robot.name, event.machine_name, event.event_time, end_time, execution_id)
-
-            # Marcar a execução como concluída se for do ExecutionDataset
-            if execution_id:
-                execution_dataset.mark_execution_complete(execution_id)
-                
-                # Faz log da porcentagem de completudo do execution_dataset.
-                completion_percentage = round(execution_dataset.get_completion_percentage(), 2)
-                
-                simulation_log.log("completion_percentage", None, None, event.event_time, event.event_time, execution_id, completion_percentage)
-
+from simulation import Simulation, DEFAULT_START_TIME, DEFAULT_FINISH_TIME, BP_STREAM_LOOKAHEAD_MINUTES, TERMINATION_POLICIES
+from event_scheduler import EVENT_SCHEDULER_BACKENDS
+from scenario_loader import set_default_engine, set_cache, ENGINES
+from profiler import SimulationProfiler, run_with_cprofile
+from metrics import summary_path, write_summary
+from checkpoint import load_checkpoint, default_checkpoint_file
+
+
+def parse_datetime(value):
+    """
+    Converte um argumento no formato 'YYYY-MM-DD HH:MM' para datetime.
+    """
+    return datetime.strptime(value, "%Y-%m-%d %H:%M")
+
+
+# Opções que descrevem o cenário: sem --resume valem os padrões abaixo; com --resume vêm do checkpoint e não podem ser alteradas
+NEW_RUN_DEFAULTS = {
+    "use_bp": False,
+    "bp_scheduler_file": None,
+    "dynamic_queue_file": None,
+    "execution_dataset_file": "data/execution_dataset.csv",
+    "start_time": DEFAULT_START_TIME,
+    "machines": "M1",
+    "bp_stream": False,
+    "bp_lookahead": BP_STREAM_LOOKAHEAD_MINUTES,
+    "event_backend": "heap",
+    "log_id_mode": "uuid"
+}
+
+
+def build_parser():
+    """
+    Monta o parser de argumentos do terminal.
+    """
+    # python main.py -ubp -bsf "custom_bp_scheduler.csv" -dq "custom_dynamic_queue.csv" -eds "custom_execution_dataset.csv" -sa "FIFO" or "WEIGHTED_PRIORITY"
+    parser = argparse.ArgumentParser(description="Simulação de Execução de Robôs")
+
+    parser.add_argument("-ubp", "--use_bp", action="store_true", help="Se definido, usa o BP Scheduler ao invés da Fila Dinâmica.")
+    parser.add_argument("-bsf", "--bp_scheduler_file", type=str, help="Arquivo CSV do BP Scheduler.")
+    parser.add_argument("-dq", "--dynamic_queue_file", type=str, help="Arquivo CSV da Fila Dinâmica.")
+    parser.add_argument("-eds", "--execution_dataset_file", type=str,
+                        help=f"Arquivo CSV do Execution Dataset (padrão: {NEW_RUN_DEFAULTS['execution_dataset_file']}).")
+    parser.add_argument("-sa", "--sort_algorithm", type=str,
+                        help="Algoritmo de ordenação da Fila Dinâmica (padrão: FIFO; com --resume, troca a estratégia do checkpoint).")
+    parser.add_argument("-st", "--start_time", type=parse_datetime, help=f"Início da simulação ('YYYY-MM-DD HH:MM', padrão: {DEFAULT_START_TIME}).")
+    parser.add_argument("-ft", "--finish_time", type=parse_datetime,
+                        help=f"Fim da simulação ('YYYY-MM-DD HH:MM', padrão: {DEFAULT_FINISH_TIME}; com --resume, estende ou encurta o horizonte).")
+    parser.add_argument("-m", "--machines", type=str,
+                        help="Máquinas: nomes separados por vírgula, quantidade (ex: 50), arquivo .csv ou 'auto' (máquinas do BP Scheduler). "
+                             "Padrão: M1.")
+    parser.add_argument("-lf", "--log_file", type=str, help="Arquivo do SimulationLog (.csv, .npz, .parquet ou .arrow).")
+    parser.add_argument("--bp_stream", action="store_true",
+                        help="Lê o BP Scheduler sob demanda, em ordem de horário, em vez de carregá-lo inteiro na memória.")
+    parser.add_argument("--bp_lookahead", type=int,
+                        help=f"Com --bp_stream, minutos de antecedência com que os agendamentos entram no EventScheduler (padrão: {BP_STREAM_LOOKAHEAD_MINUTES}).")
+    parser.add_argument("--event_backend", type=str, choices=EVENT_SCHEDULER_BACKENDS,
+                        help="Estrutura do EventScheduler: heap binário (padrão) ou calendário com baldes de um minuto.")
+    parser.add_argument("--csv_engine", type=str, choices=ENGINES, help="Leitura dos CSVs de entrada: pandas ou csv (sem pandas).")
+    parser.add_argument("--no_cache", action="store_true", help="Desativa o cache binário dos arquivos de entrada.")
+    parser.add_argument("--timings", action="store_true",
+                        help="Mede o tempo de cada fase (carga, consultas ao dataset, fila, eventos e log) e grava um JSON ao lado do log.")
+    parser.add_argument("--profile", action="store_true", help="Executa a simulação sob o cProfile e grava um .pstats ao lado do log.")
+    parser.add_argument("--log_id_mode", type=str, choices=["uuid", "sequential"], help="Geração do log_id (padrão: uuid).")
+    parser.add_argument("--termination", type=str,
+                        help=f"Critérios de parada antecipada separados por vírgula ({', '.join(TERMINATION_POLICIES)}). "
+                             "Padrão: simula até o finish_time (com --resume, os critérios do checkpoint).")
+    parser.add_argument("--max_events", type=int,
+                        help="Encerra a simulação após N eventos processados (com --resume, N eventos após a retomada).")
+    parser.add_argument("--checkpoint_minutes", type=int, help="Grava um checkpoint da simulação a cada N minutos simulados.")
+    parser.add_argument("--checkpoint_file", type=str, help="Arquivo do checkpoint (padrão: <log>_checkpoint.pkl.gz).")
+    parser.add_argument("--resume", type=str,
+                        help="Retoma a simulação de um checkpoint. Com -lf e/ou -sa, deriva uma variante (novo log e/ou outra estratégia); "
+                             "-ft, --termination e --max_events alteram a parada.")
+    return parser
+
+
+def default_log_file(args):
+    """
+    Define o nome padrão do arquivo de log a partir dos arquivos de entrada.
+    """
+    if args.bp_scheduler_file:
+        return f"logs/simulation_log_{args.bp_scheduler_file.replace('/', '_')}.csv"
+    return f"logs/simulation_log_{args.dynamic_queue_file.replace('/', '_')}_{args.sort_algorithm}.csv"
+
+
+def load_simulation(args, profiler=None):
+    """
+    Carrega os arquivos de entrada e monta a simulação descrita pelos argumentos (opções omitidas assumem os padrões).
+    """
+    for option, default in NEW_RUN_DEFAULTS.items():
+        if getattr(args, option) is None:
+            setattr(args, option, default)
+    args.sort_algorithm = args.sort_algorithm or "FIFO"
+    args.finish_time = args.finish_time or DEFAULT_FINISH_TIME
+    args.termination = args.termination or []
+    log_file = args.log_file or default_log_file(args)
+
+    # Inicializar as estruturas do sistema
+    with profiler.phase("load") if profiler else nullcontext():
+        execution_dataset = ExecutionDataset(args.execution_dataset_file)
+
+        if args.use_bp:
+            scheduler = BPScheduler(args.bp_scheduler_file, streaming=args.bp_stream)
+        else:
+            scheduler = DynamicQueue(args.dynamic_queue_file, sorting_algorithm=args.sort_algorithm)
+
+        # Máquinas disponíveis ('auto' usa as máquinas citadas no BP Scheduler)
+        scenario_machines = None
+        if args.machines == "auto" and args.bp_scheduler_file:
+            bp_scheduler = scheduler if args.use_bp else BPScheduler(args.bp_scheduler_file, streaming=True)
+            scenario_machines = bp_scheduler.get_machine_names()
+        machines = Machines.from_spec(args.machines, scenario_machines)
+
+    simulation_log = SimulationLog(log_file, log_id_mode=args.log_id_mode)
+    return Simulation(execution_dataset, scheduler, machines, simulation_log, args.start_time, args.finish_time,
+                      event_backend=args.event_backend, lookahead_minutes=args.bp_lookahead,
+                      termination_policies=args.termination, max_events=args.max_events)
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.timings and args.checkpoint_minutes:
+        parser.error("--timings não pode ser combinado com --checkpoint_minutes (a instrumentação não é serializável)")
+    if args.checkpoint_minutes and args.log_file and not args.log_file.lower().endswith(".csv"):
+        parser.error("--checkpoint_minutes exige um log .csv (os formatos colunares só são gravados no fechamento)")
+    if args.termination is not None:
+        args.termination = [policy for policy in args.termination.split(",") if policy]
+        unknown = set(args.termination) - set(TERMINATION_POLICIES)
+        if unknown:
+            parser.error(f"Critérios de parada não reconhecidos: {', '.join(sorted(unknown))}")
+    if args.csv_engine:
+        set_default_engine(args.csv_engine)
+    if args.no_cache:
+        set_cache(enabled=False)
+
+    profiler = SimulationProfiler() if args.timings else None
+    if args.resume:
+        fixed_options = [option for option, default in NEW_RUN_DEFAULTS.items() if getattr(args, option) not in (None, False)]
+        if fixed_options:
+            parser.error(f"Com --resume o cenário vem do checkpoint; não é possível alterar: {', '.join('--' + option for option in fixed_options)}")
+        try:
+            with profiler.phase("load") if profiler else nullcontext():
+                simulation = load_checkpoint(args.resume, args.log_file, args.sort_algorithm, finish_time=args.finish_time,
+                                             termination_policies=args.termination, max_events=args.max_events)
+        except ValueError as error:
+            parser.error(str(error))
+        print(f"Simulação retomada do checkpoint {args.resume} em {simulation.clock}.")
+    else:
+        try:
+            simulation = load_simulation(args, profiler)
+        except ValueError as error:
+            parser.error(str(error))
+
+    simulation_log = simulation.simulation_log
+    if args.checkpoint_minutes:
+        try:
+            simulation.enable_checkpoints(args.checkpoint_file or default_checkpoint_file(simulation_log.file_path), args.checkpoint_minutes)
+        except ValueError as error:
+            parser.error(str(error))
+
+    with simulation_log:
+        run = simulation.run if profiler is None else lambda: profiler.run(simulation)
+        if args.profile:
+            pstats_file = f"{os.path.splitext(simulation_log.file_path)[0]}.pstats"
+            result = run_with_cprofile(run, pstats_file)
+            print(f"Perfil do cProfile gravado em: {pstats_file}")
         else:
-            # Registrar "Atropelamento" no log e continuar
-            simulation_log.log("run_over", event.robot.name, event.machine_name, event.event_time, event.event_time)
-            continue
-
-    # ============================= PROCESSAMENTO DE EVENTO DE FIM (end_execution) =============================
-    elif event.event_type == "end_execution":
-        machines.make_machine_idle(event.machine_name)
-        
-        # Set no valor do clock
-        clock = event.event_time
-
-        # =================================== LÓGICA PARA A FILA DINÂMICA ===================================
-        if not USE_BP_SCHEDULER:
-            # Adiciona o robô que terminou de executar na fila novamente
-            scheduler.add_robot(event.robot)
-            next_robot = scheduler.get_next_robot()  # Pega o próximo robô da fila dinâmica
-            if next_robot:
-                next_event = Event(event.event_time, "start_execution", next_robot, machines.get_idle_machines()[0])
-                event_scheduler.add_event(next_event)
-        # ====================================================================================================
-
-# Verificar se todas as execuções foram concluídas
-if execution_dataset.all_executions_complete():
-    print("Simulação concluída com sucesso!")
-else:
-    print("Algumas execuções não foram realizadas dentro do tempo disponível.")
+            result = run()
+
+    # Resumo compacto da execução (métricas agregadas durante a simulação) ao lado do log bruto
+    write_summary(result.summary, summary_path(simulation_log.file_path))
+
+    if profiler:
+        timings_file = f"{os.path.splitext(simulation_log.file_path)[0]}_timings.json"
+        profiler.write_json(timings_file)
+        print(profiler.summary())
+        print(f"Tempos por fase gravados em: {timings_file}")
+
+    if simulation.use_bp_scheduler:
+        simulation.scheduler.close()
+
+    # Verificar se todas as execuções foram concluídas
+    if result.all_executions_complete:
+        print("Simulação concluída com sucesso!")
+    else:
+        print("Algumas execuções não foram realizadas dentro do tempo disponível.")
+    return result
+
 
+if __name__ == "__main__":
+    main()
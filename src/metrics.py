@@ -0,0 +1,182 @@
+import json
+from datetime import timedelta
+
+COMPLETION_CURVE_STEP = 0.5  # Variação mínima (pontos percentuais) entre dois pontos da curva de completude
+
+
+def _minutes(delta):
+    return delta / timedelta(minutes=1)
+
+
+class _RobotMetrics:
+    __slots__ = ("executions", "busy_minutes", "waits", "waiting_minutes", "window_delays", "window_delay_minutes")
+
+    def __init__(self):
+        self.executions = 0
+        self.busy_minutes = 0.0
+        self.waits = 0
+        self.waiting_minutes = 0.0
+        self.window_delays = 0
+        self.window_delay_minutes = 0.0
+
+    def to_dict(self):
+        return {
+            "executions": self.executions,
+            "busy_minutes": round(self.busy_minutes, 2),
+            "mean_waiting_minutes": round(self.waiting_minutes / self.waits, 2) if self.waits else None,
+            "mean_window_delay_minutes": round(self.window_delay_minutes / self.window_delays, 2) if self.window_delays else None
+        }
+
+
+class SimulationMetrics:
+    def __init__(self, start_time, curve_step=COMPLETION_CURVE_STEP):
+        """
+        Métricas agregadas durante a simulação, sem depender de reler o log.
+
+        - atropelamentos (total e por máquina);
+        - curva de completude (um ponto a cada `curve_step` pontos percentuais, mais o ponto final);
+        - por robô: execuções, tempo ocupado, espera na fila dinâmica (de quando fica pronto até iniciar)
+          e atraso em relação à abertura da janela da execução do dataset;
+        - utilização das máquinas e makespan.
+
+        :param start_time: Início da simulação.
+        :param curve_step: Variação mínima entre dois pontos registrados da curva de completude.
+        """
+        self.start_time = start_time
+        self.curve_step = curve_step
+        self.run_overs = 0
+        self.run_overs_by_machine = {}
+        self.robot_executions = 0
+        self.dataset_executions = 0
+        self.completion_curve = []  # [(horário, porcentagem)]
+        self.completion_percentage = 0.0
+        self.completion_log_sum = 0.0  # Soma das porcentagens registradas no log (média usada em analyze_logs)
+        self.last_completion_time = None
+        self.busy_minutes_by_machine = {}
+        self.last_execution_end = None
+        self.last_dataset_end = None
+        self.robots = {}
+        self._ready_times = {}  # robô -> horário em que voltou para a fila dinâmica
+
+    def _robot(self, robot_name):
+        metrics = self.robots.get(robot_name)
+        if metrics is None:
+            metrics = self.robots[robot_name] = _RobotMetrics()
+        return metrics
+
+    # =================================== EVENTOS DA SIMULAÇÃO ===================================
+    def record_machine(self, machine_name):
+        """
+        Registra uma máquina do pool (máquinas nunca usadas aparecem com utilização zero).
+        """
+        self.busy_minutes_by_machine.setdefault(machine_name, 0.0)
+
+    def record_ready(self, robot_name, ready_time):
+        """
+        Registra o horário em que o robô entrou (ou voltou) na fila dinâmica.
+        """
+        self._ready_times[robot_name] = ready_time
+
+    def record_run_over(self, robot_name, machine_name, event_time):
+        self.run_overs += 1
+        self.run_overs_by_machine[machine_name] = self.run_overs_by_machine.get(machine_name, 0) + 1
+
+    def record_execution(self, robot_name, machine_name, start_time, end_time, execution=None):
+        """
+        Registra o início de uma execução (o término já é conhecido no início).
+
+        :param execution: (Opcional) Execução do ExecutionDataset associada (dicionário).
+        """
+        duration = _minutes(end_time - start_time)
+        self.robot_executions += 1
+        self.busy_minutes_by_machine[machine_name] = self.busy_minutes_by_machine.get(machine_name, 0.0) + duration
+        if self.last_execution_end is None or end_time > self.last_execution_end:
+            self.last_execution_end = end_time
+
+        robot = self._robot(robot_name)
+        robot.executions += 1
+        robot.busy_minutes += duration
+
+        ready_time = self._ready_times.pop(robot_name, None)
+        if ready_time is not None:
+            robot.waits += 1
+            robot.waiting_minutes += _minutes(start_time - ready_time)
+
+        if execution is not None:
+            self.dataset_executions += 1
+            if self.last_dataset_end is None or end_time > self.last_dataset_end:
+                self.last_dataset_end = end_time
+            if execution["start_window"] is not None:
+                robot.window_delays += 1
+                robot.window_delay_minutes += _minutes(start_time - execution["start_window"])
+
+    def record_completion(self, event_time, completion_percentage):
+        """
+        Atualiza a curva de completude.
+        """
+        self.completion_percentage = completion_percentage
+        self.completion_log_sum += completion_percentage
+        self.last_completion_time = event_time
+        if not self.completion_curve or completion_percentage - self.completion_curve[-1][1] >= self.curve_step:
+            self.completion_curve.append((event_time, completion_percentage))
+    # ===========================================================================================
+
+    def summary(self, final_clock, all_executions_complete=False):
+        """
+        Retorna o resumo compacto da execução (serializável em JSON).
+
+        :param final_clock: Clock final da simulação (fim do período usado no cálculo da utilização).
+        :param all_executions_complete: Se o dataset foi concluído (só então o makespan é definido).
+        """
+        span_end = max(final_clock, self.last_execution_end or final_clock)
+        span_minutes = _minutes(span_end - self.start_time)
+        utilization = {machine: round(busy / span_minutes, 4) if span_minutes > 0 else 0.0
+                       for machine, busy in sorted(self.busy_minutes_by_machine.items())}
+
+        curve = list(self.completion_curve)
+        if curve and curve[-1][1] != self.completion_percentage:
+            curve.append((self.last_completion_time, self.completion_percentage))
+
+        waits = sum(robot.waits for robot in self.robots.values())
+        waiting_minutes = sum(robot.waiting_minutes for robot in self.robots.values())
+        return {
+            "start_time": str(self.start_time),
+            "final_clock": str(final_clock),
+            "robot_executions": self.robot_executions,
+            "dataset_executions": self.dataset_executions,
+            "run_overs": self.run_overs,
+            "run_overs_by_machine": dict(sorted(self.run_overs_by_machine.items())),
+            "completion_percentage": self.completion_percentage,
+            "completion_curve": [[str(event_time), percentage] for event_time, percentage in curve],
+            "completion_log_sum": self.completion_log_sum,
+            "makespan_minutes": _minutes(self.last_dataset_end - self.start_time) if all_executions_complete and self.last_dataset_end else None,
+            "last_execution_end": str(self.last_execution_end) if self.last_execution_end else None,
+            "machine_utilization": utilization,
+            "mean_machine_utilization": round(sum(utilization.values()) / len(utilization), 4) if utilization else 0.0,
+            "mean_waiting_minutes": round(waiting_minutes / waits, 2) if waits else None,
+            "robots": {robot_name: robot.to_dict() for robot_name, robot in sorted(self.robots.items())}
+        }
+
+
+def summary_path(log_file):
+    """
+    Caminho do resumo de uma execução, ao lado do log bruto (ex: logs/x.csv -> logs/x.csv.summary.json).
+    A extensão do log faz parte do nome, então logs x.npz e x.parquet têm resumos distintos.
+    """
+    return f"{log_file}.summary.json"
+
+
+def write_summary(summary, file_path):
+    """
+    Grava o resumo de uma execução em JSON.
+    """
+    with open(file_path, mode="w") as file:
+        json.dump(summary, file, indent=2)
+
+
+def read_summary(file_path):
+    """
+    Lê o resumo de uma execução gravado por `write_summary`.
+    """
+    with open(file_path) as file:
+        return json.load(file)
@@ -0,0 +1,279 @@
+import argparse
+import copy
+import csv
+import math
+import os
+import statistics
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+import numpy as np
+from batch_simulation import BatchSimulation
+from machines import Machines
+from simulation import DEFAULT_START_TIME, DEFAULT_FINISH_TIME, FALLBACK_EXECUTION_TIME
+from scenario_cache import load_execution_dataset, load_bp_scheduler, load_dynamic_queue
+from sweep import ALGORITHMS
+
+DURATION_DISTRIBUTIONS = ("fixed", "lognormal", "gamma", "uniform")
+ITEMS_DISTRIBUTIONS = ("fixed", "poisson")
+METRICS = ("completion_percentage", "run_overs")
+RESULT_COLUMNS = ["replication", "algorithm", "completion_percentage", "run_overs", "robot_executions", "dataset_executions",
+                  "all_executions_complete", "makespan_minutes", "mean_machine_utilization"]
+SUMMARY_COLUMNS = ["algorithm", "metric", "replications", "mean", "stdev", "ci_low", "ci_high",
+                   "baseline", "difference_mean", "difference_ci_low", "difference_ci_high"]
+
+# Chaves dos fluxos aleatórios de cada replicação (SeedSequence.spawn_key)
+DATASET_STREAM = 0
+FALLBACK_STREAM = 1
+
+
+def sample(rng, mean, distribution="fixed", cv=0.0):
+    """
+    Sorteia valores com média `mean` e coeficiente de variação `cv`, de forma vetorizada.
+
+    :param mean: Média de cada valor (array).
+    :param distribution: 'fixed', 'lognormal', 'gamma' ou 'uniform'.
+    :param cv: Coeficiente de variação (desvio padrão / média).
+    :return: Array de floats não negativos (médias <= 0 resultam em 0).
+    """
+    if distribution not in DURATION_DISTRIBUTIONS:
+        raise ValueError(f"Distribuição {distribution} não reconhecida (use {', '.join(DURATION_DISTRIBUTIONS)})")
+    mean = np.asarray(mean, dtype=float)
+    if distribution == "fixed" or cv <= 0:
+        return mean.copy()
+    positive = np.where(mean > 0, mean, 1.0)
+    if distribution == "lognormal":
+        sigma = math.sqrt(math.log1p(cv ** 2))
+        values = rng.lognormal(np.log(positive) - sigma ** 2 / 2, sigma)
+    elif distribution == "gamma":
+        values = rng.gamma(1 / cv ** 2, positive * cv ** 2)
+    else:
+        half_width = positive * cv * math.sqrt(3)
+        values = np.maximum(rng.uniform(positive - half_width, positive + half_width), 0.0)
+    return np.where(mean > 0, values, 0.0)
+
+
+class DurationSampler:
+    def __init__(self, execution_dataset, seed, replication, duration_distribution="lognormal", duration_cv=0.3,
+                 items_distribution="fixed"):
+        """
+        Durações estocásticas de uma replicação, com números aleatórios comuns entre as estratégias.
+
+        As durações das execuções do dataset são sorteadas de uma vez (uma por linha do arquivo), de modo que
+        uma mesma execução tem a mesma duração em todas as estratégias da replicação, independentemente da
+        ordem em que é executada. As execuções fora do dataset (FALLBACK_EXECUTION_TIME) usam um fluxo por robô:
+        a k-ésima execução de um robô também tem a mesma duração em todas as estratégias.
+
+        :param execution_dataset: Instância de ExecutionDataset (não é alterada).
+        :param seed: Semente base do estudo.
+        :param replication: Número da replicação (define fluxos independentes via SeedSequence).
+        :param duration_distribution: Distribuição do tempo por item (ver DURATION_DISTRIBUTIONS).
+        :param duration_cv: Coeficiente de variação do tempo por item.
+        :param items_distribution: Distribuição da quantidade de itens: 'fixed' ou 'poisson'.
+        """
+        if items_distribution not in ITEMS_DISTRIBUTIONS:
+            raise ValueError(f"Distribuição de itens {items_distribution} não reconhecida (use {', '.join(ITEMS_DISTRIBUTIONS)})")
+        self.seed = seed
+        self.replication = replication
+        self.duration_distribution = duration_distribution
+        self.duration_cv = duration_cv
+
+        rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(replication, DATASET_STREAM)))
+        records = execution_dataset.executions
+        items = np.array([record.items for record in records], dtype=float)
+        time_per_item = np.array([record.time_per_item for record in records], dtype=float)
+        if items_distribution == "poisson":
+            items = rng.poisson(items).astype(float)
+        durations = items * sample(rng, time_per_item, duration_distribution, duration_cv)
+        # Durações em segundos inteiros, como os ticks do EventScheduler
+        self.durations = (np.round(durations * 60) / 60).tolist()
+
+        self.row_by_id = {}
+        for row, record in enumerate(records):
+            self.row_by_id.setdefault(record.execution_id, row)
+        self._fallback_streams = {}
+
+    def _fallback_duration(self, robot_name):
+        rng = self._fallback_streams.get(robot_name)
+        if rng is None:
+            spawn_key = (self.replication, FALLBACK_STREAM, zlib.crc32(robot_name.encode()))
+            rng = self._fallback_streams[robot_name] = np.random.default_rng(np.random.SeedSequence(self.seed, spawn_key=spawn_key))
+        duration = float(sample(rng, [FALLBACK_EXECUTION_TIME], self.duration_distribution, self.duration_cv)[0])
+        return round(duration * 60) / 60
+
+    def __call__(self, execution, robot_name):
+        if execution is None:
+            return self._fallback_duration(robot_name)
+        return self.durations[self.row_by_id[execution["execution_id"]]]
+
+
+def run_replication(config, replication):
+    """
+    Executa uma replicação: todas as estratégias em lote (BatchSimulation), cada uma com sua própria cópia do
+    sorteio da replicação.
+
+    :param config: Dicionário do estudo (ver `main`).
+    :param replication: Número da replicação.
+    :return: Lista de linhas de resultado (uma por estratégia).
+    """
+    execution_dataset = load_execution_dataset(config["execution_dataset_file"])
+    variants = []
+    for algorithm in config["algorithms"]:
+        if algorithm == "BP":
+            scheduler = copy.deepcopy(load_bp_scheduler(config["bp_scheduler_file"]))
+        else:
+            scheduler = copy.deepcopy(load_dynamic_queue(config["dynamic_queue_file"], algorithm))
+        variants.append({
+            "name": algorithm,
+            "scheduler": scheduler,
+            "machines": Machines.from_spec(config["machines"]),
+            "duration_sampler": DurationSampler(execution_dataset, config["seed"], replication, config["duration_distribution"],
+                                                config["duration_cv"], config["items_distribution"])
+        })
+
+    results = BatchSimulation(execution_dataset, variants, config["start_time"], config["finish_time"]).run()
+    rows = []
+    for algorithm, result in results.items():
+        row = result.to_dict()
+        row.update({"replication": replication, "algorithm": algorithm})
+        rows.append(row)
+    return rows
+
+
+def _interval(values, z):
+    """
+    Média, desvio padrão e intervalo de confiança (aproximação normal) de uma amostra.
+    """
+    mean = statistics.fmean(values)
+    stdev = statistics.stdev(values) if len(values) > 1 else 0.0
+    half_width = z * stdev / math.sqrt(len(values))
+    return mean, stdev, mean - half_width, mean + half_width
+
+
+def summarize(rows, algorithms, confidence=0.95):
+    """
+    Resume as replicações: intervalo de confiança de cada métrica por estratégia e da diferença pareada
+    para a primeira estratégia (com números aleatórios comuns, a variância da diferença é menor).
+
+    :param rows: Linhas retornadas por `run_replication`.
+    :param algorithms: Estratégias, na ordem do estudo (a primeira é a referência das diferenças).
+    :param confidence: Nível de confiança dos intervalos.
+    :return: Lista de dicionários com as colunas de SUMMARY_COLUMNS.
+    """
+    z = statistics.NormalDist().inv_cdf(0.5 + confidence / 2)
+    by_replication = {}
+    for row in rows:
+        by_replication.setdefault(row["replication"], {})[row["algorithm"]] = row
+    replications = [values for _, values in sorted(by_replication.items()) if len(values) == len(algorithms)]
+    baseline = algorithms[0]
+
+    summary = []
+    for algorithm in algorithms:
+        for metric in METRICS:
+            values = [float(values[algorithm][metric]) for values in replications]
+            mean, stdev, ci_low, ci_high = _interval(values, z)
+            differences = [float(values[algorithm][metric]) - float(values[baseline][metric]) for values in replications]
+            difference_mean, _, difference_low, difference_high = _interval(differences, z)
+            summary.append({
+                "algorithm": algorithm, "metric": metric, "replications": len(values),
+                "mean": round(mean, 4), "stdev": round(stdev, 4), "ci_low": round(ci_low, 4), "ci_high": round(ci_high, 4),
+                "baseline": baseline, "difference_mean": round(difference_mean, 4),
+                "difference_ci_low": round(difference_low, 4), "difference_ci_high": round(difference_high, 4)
+            })
+    return summary
+
+
+def run_study(config, replications, output_file, workers=None):
+    """
+    Executa as replicações em um ProcessPoolExecutor, grava cada resultado assim que fica pronto e o resumo ao final.
+
+    :param config: Dicionário do estudo (ver `main`).
+    :param replications: Quantidade de replicações.
+    :param output_file: CSV com uma linha por replicação e estratégia (o resumo vai para <output>_summary.csv).
+    :param workers: Número de processos (padrão: número de núcleos disponíveis).
+    :return: Resumo retornado por `summarize`.
+    """
+    workers = workers or os.cpu_count() or 1
+    if os.path.dirname(output_file):
+        os.makedirs(os.path.dirname(output_file), exist_ok=True)
+
+    rows = []
+    with open(output_file, mode="w", newline="") as file, ProcessPoolExecutor(max_workers=workers) as executor:
+        writer = csv.DictWriter(file, fieldnames=RESULT_COLUMNS, extrasaction="ignore")
+        writer.writeheader()
+        futures = [executor.submit(run_replication, config, replication) for replication in range(replications)]
+        for completed, future in enumerate(as_completed(futures), start=1):
+            replication_rows = future.result()
+            writer.writerows(replication_rows)
+            file.flush()
+            rows.extend(replication_rows)
+            if completed % max(1, replications // 10) == 0 or completed == replications:
+                print(f"[{completed}/{replications}] replicações concluídas")
+
+    summary = summarize(rows, config["algorithms"], config["confidence"])
+    summary_file = f"{os.path.splitext(output_file)[0]}_summary.csv"
+    with open(summary_file, mode="w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=SUMMARY_COLUMNS)
+        writer.writeheader()
+        writer.writerows(summary)
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replicações de Monte Carlo com durações estocásticas")
+    parser.add_argument("-eds", "--execution_dataset_file", type=str, default="data/execution_dataset.csv", help="Arquivo CSV do Execution Dataset.")
+    parser.add_argument("-dq", "--dynamic_queue_file", type=str, default="data/dynamic_queue.csv", help="Arquivo CSV da Fila Dinâmica.")
+    parser.add_argument("-bsf", "--bp_scheduler_file", type=str, help="Arquivo CSV do BP Scheduler (necessário para a estratégia BP).")
+    parser.add_argument("--algorithms", type=str, default="FIFO,PRIORITY,WEIGHTED_PRIORITY",
+                        help="Estratégias separadas por vírgula (BP = BP Scheduler); a primeira é a referência das diferenças.")
+    parser.add_argument("-m", "--machines", type=str, default="M1", help="Máquinas: nomes separados por vírgula ou quantidade.")
+    parser.add_argument("--start_time", type=lambda value: datetime.strptime(value, "%Y-%m-%d %H:%M"), default=DEFAULT_START_TIME)
+    parser.add_argument("--finish_time", type=lambda value: datetime.strptime(value, "%Y-%m-%d %H:%M"), default=DEFAULT_FINISH_TIME)
+    parser.add_argument("--replications", type=int, default=100, help="Quantidade de replicações.")
+    parser.add_argument("--seed", type=int, default=42, help="Semente base (cada replicação usa fluxos independentes derivados dela).")
+    parser.add_argument("--duration_distribution", type=str, default="lognormal", choices=DURATION_DISTRIBUTIONS,
+                        help="Distribuição do tempo por item (média = time_per_item do dataset).")
+    parser.add_argument("--duration_cv", type=float, default=0.3, help="Coeficiente de variação do tempo por item.")
+    parser.add_argument("--items_distribution", type=str, default="fixed", choices=ITEMS_DISTRIBUTIONS,
+                        help="Distribuição da quantidade de itens (média = items do dataset).")
+    parser.add_argument("--confidence", type=float, default=0.95, help="Nível de confiança dos intervalos.")
+    parser.add_argument("--workers", type=int, help="Número de processos (padrão: núcleos disponíveis).")
+    parser.add_argument("--output", type=str, default="logs/monte_carlo.csv", help="Resultados por replicação (CSV).")
+    args = parser.parse_args(argv)
+
+    algorithms = list(dict.fromkeys(algorithm for algorithm in args.algorithms.split(",") if algorithm))
+    unknown = [algorithm for algorithm in algorithms if algorithm not in ALGORITHMS]
+    if unknown:
+        parser.error(f"Estratégias não reconhecidas: {', '.join(unknown)}")
+    if "BP" in algorithms and not args.bp_scheduler_file:
+        parser.error("A estratégia BP exige --bp_scheduler_file")
+
+    config = {
+        "execution_dataset_file": args.execution_dataset_file,
+        "dynamic_queue_file": args.dynamic_queue_file,
+        "bp_scheduler_file": args.bp_scheduler_file,
+        "algorithms": algorithms,
+        "machines": args.machines,
+        "start_time": args.start_time,
+        "finish_time": args.finish_time,
+        "seed": args.seed,
+        "duration_distribution": args.duration_distribution,
+        "duration_cv": args.duration_cv,
+        "items_distribution": args.items_distribution,
+        "confidence": args.confidence
+    }
+
+    start = time.perf_counter()
+    summary = run_study(config, args.replications, args.output, args.workers)
+    print(f"{'Estratégia':<20} {'Métrica':<22} {'Média':>10} {f'IC {args.confidence:.0%}':>22} {f'Diferença para {algorithms[0]}':>28}")
+    for line in summary:
+        interval = f"[{line['ci_low']:.3f}, {line['ci_high']:.3f}]"
+        difference = f"{line['difference_mean']:+.3f} [{line['difference_ci_low']:+.3f}, {line['difference_ci_high']:+.3f}]"
+        print(f"{line['algorithm']:<20} {line['metric']:<22} {line['mean']:>10.3f} {interval:>22} {difference:>28}")
+    print(f"{args.replications} replicações em {time.perf_counter() - start:.1f}s. Resultados em: {args.output}")
+    return summary
+
+
+if __name__ == "__main__":
+    main()
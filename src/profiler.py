@@ -0,0 +1,147 @@
+import cProfile
+import functools
+import json
+import time
+from contextlib import contextmanager
+
+# Fases medidas, na ordem do resumo
+PHASES = [
+    ("load", "Carga dos arquivos de entrada"),
+    ("dataset_lookup", "ExecutionDataset.get_execution_by_robot_and_time"),
+    ("dataset_complete", "ExecutionDataset.mark_execution_complete"),
+    ("queue_add", "DynamicQueue.add_robot (reordenação)"),
+    ("queue_next", "DynamicQueue.get_next_robot"),
+    ("event_push", "EventScheduler.add_event"),
+    ("event_pop", "EventScheduler.get_next_event"),
+    ("log", "SimulationLog.log"),
+    ("log_write", "Escrita do log no sink"),
+    ("run", "Laço de eventos (total)"),
+]
+
+
+class SimulationProfiler:
+    def __init__(self):
+        """
+        Instrumentação opcional da simulação: contadores e tempos acumulados por fase, eventos por segundo
+        e tamanho máximo das estruturas (heap de eventos e fila dinâmica).
+
+        As funções medidas são substituídas por versões cronometradas apenas nas instâncias anexadas
+        (`attach`), então uma simulação sem profiler não paga nenhum custo extra.
+        """
+        self.calls = {phase: 0 for phase, _ in PHASES}
+        self.seconds = {phase: 0.0 for phase, _ in PHASES}
+        self.peaks = {"event_heap": 0, "dynamic_queue": 0}
+        self.events_processed = 0
+
+    @contextmanager
+    def phase(self, phase):
+        """
+        Mede um trecho de código como uma chamada da fase `phase`.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[phase] += time.perf_counter() - start
+            self.calls[phase] += 1
+
+    def instrument(self, instance, method_name, phase, peak=None, size=None):
+        """
+        Substitui `instance.method_name` por uma versão cronometrada.
+
+        :param phase: Fase onde o tempo da chamada é acumulado.
+        :param peak: (Opcional) Nome do tamanho máximo atualizado após cada chamada.
+        :param size: (Opcional) Função sem argumentos que retorna o tamanho atual da estrutura.
+        """
+        method = getattr(instance, method_name)
+        seconds, calls, peaks = self.seconds, self.calls, self.peaks
+
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            result = method(*args, **kwargs)
+            seconds[phase] += time.perf_counter() - start
+            calls[phase] += 1
+            if peak is not None:
+                current = size()
+                if current > peaks[peak]:
+                    peaks[peak] = current
+            return result
+
+        setattr(instance, method_name, timed)
+
+    def attach(self, simulation):
+        """
+        Instrumenta os componentes de uma Simulation (antes de `run()`).
+        """
+        self.instrument(simulation.execution_dataset, "get_execution_by_robot_and_time", "dataset_lookup")
+        self.instrument(simulation.execution_dataset, "mark_execution_complete", "dataset_complete")
+
+        event_scheduler = simulation.event_scheduler
+        self.instrument(event_scheduler, "add_event", "event_push", "event_heap", event_scheduler.__len__)
+        self.instrument(event_scheduler, "get_next_event", "event_pop")
+
+        if not simulation.use_bp_scheduler:
+            dynamic_queue = simulation.scheduler
+            self.instrument(dynamic_queue, "add_robot", "queue_add", "dynamic_queue", dynamic_queue.get_queue_size)
+            self.instrument(dynamic_queue, "get_next_robot", "queue_next")
+            self.peaks["dynamic_queue"] = dynamic_queue.get_queue_size()
+
+        self.instrument(simulation.simulation_log, "log", "log")
+        self.instrument(simulation.simulation_log.sink, "write_rows", "log_write")
+
+    def run(self, simulation):
+        """
+        Instrumenta e executa a simulação.
+
+        :return: Instância de SimulationResult.
+        """
+        self.attach(simulation)
+        with self.phase("run"):
+            result = simulation.run()
+        self.events_processed = simulation.events_processed
+        return result
+
+    def events_per_second(self):
+        return self.events_processed / self.seconds["run"] if self.seconds["run"] else 0.0
+
+    def to_dict(self):
+        """
+        Retorna as medidas como dicionário (serializável em JSON).
+        """
+        return {
+            "phases": {phase: {"calls": self.calls[phase], "seconds": round(self.seconds[phase], 6)} for phase, _ in PHASES},
+            "events_processed": self.events_processed,
+            "events_per_second": round(self.events_per_second(), 1),
+            "peaks": dict(self.peaks)
+        }
+
+    def summary(self):
+        """
+        Retorna um resumo legível das medidas.
+        """
+        run_seconds = self.seconds["run"] or 1.0
+        lines = [f"{'Fase':<52} {'chamadas':>10} {'tempo (s)':>11} {'% do laço':>10}"]
+        for phase, description in PHASES:
+            share = f"{100 * self.seconds[phase] / run_seconds:>9.1f}%" if phase not in ("load", "run") else ""
+            lines.append(f"{description:<52} {self.calls[phase]:>10} {self.seconds[phase]:>11.4f} {share:>10}")
+        lines.append(f"Eventos processados: {self.events_processed} ({self.events_per_second():.0f} eventos/s)")
+        lines.append(f"Tamanho máximo do heap de eventos: {self.peaks['event_heap']}; da fila dinâmica: {self.peaks['dynamic_queue']}")
+        return "\n".join(lines)
+
+    def write_json(self, file_path):
+        with open(file_path, mode="w") as file:
+            json.dump(self.to_dict(), file, indent=2)
+
+
+def run_with_cprofile(function, pstats_file):
+    """
+    Executa `function()` sob o cProfile e grava as estatísticas em `pstats_file` (abrir com `pstats` ou snakeviz).
+
+    :return: O valor retornado por `function`.
+    """
+    profile = cProfile.Profile()
+    try:
+        return profile.runcall(function)
+    finally:
+        profile.dump_stats(pstats_file)
@@ -1,3 +1,12 @@
+import heapq
+
+# Estratégias cuja ordem depende apenas de uma chave fixa por robô (permitem fila de prioridade)
+HEAP_STRATEGIES = ("FIFO", "PRIORITY")
+
+# Incremento de peso por reordenação no WEIGHTED_PRIORITY, conforme a prioridade do robô
+WEIGHT_INCREMENTS = {1: 3, 2: 2, 3: 1}
+
+
 class QueueSortingAlgorithm:
     def __init__(self, strategy="FIFO"):
         """
@@ -24,6 +33,29 @@ class QueueSortingAlgorithm:
         else:
             raise ValueError(f"Algoritmo {self.strategy} não reconhecido")
 
+    def uses_heap(self):
+        """
+        Retorna True se a estratégia pode ser mantida em um heap com chave fixa por robô.
+        """
+        return self.strategy in HEAP_STRATEGIES
+
+    def heap_key(self, robot, sequence):
+        """
+        Retorna a chave do robô no heap da DynamicQueue.
+
+        O `sequence` é um contador de inserção; ele desempata chaves iguais em ordem de chegada,
+        reproduzindo a ordenação estável de `sort`.
+
+        :param robot: Instância da classe Robot.
+        :param sequence: Ordem de inserção do robô na fila.
+        """
+        if self.strategy == "FIFO":
+            return (sequence,)
+        elif self.strategy == "PRIORITY":
+            return (robot.priority, sequence)
+        else:
+            raise ValueError(f"Algoritmo {self.strategy} não possui chave de heap")
+
     def fifo(self, queue, data):
         """
         Ordena a fila por ordem de chegada (FIFO).
@@ -56,12 +88,7 @@ class QueueSortingAlgorithm:
 
         # Atualiza os pesos dos robôs conforme a prioridade
         for robot in queue:
-            if robot.priority == 1:
-                data[robot.name]["weight"] += 3
-            elif robot.priority == 2:
-                data[robot.name]["weight"] += 2
-            elif robot.priority == 3:
-                data[robot.name]["weight"] += 1
+            data[robot.name]["weight"] += WEIGHT_INCREMENTS.get(robot.priority, 0)
 
         # Ordena pelo peso acumulado (maior peso primeiro)
         # Em caso de empate, ordena pela menor prioridade
@@ -69,3 +96,110 @@ class QueueSortingAlgorithm:
         sorted_queue = sorted(queue, key=lambda robot: (-data[robot.name]["weight"], robot.priority))
 
         return sorted_queue, data  # Retorna a fila reordenada e os dados atualizados
+
+
+class WeightedPriorityAging:
+    def __init__(self):
+        """
+        Implementação incremental (envelhecimento preguiçoso) do WEIGHTED_PRIORITY.
+
+        Em vez de somar o incremento da prioridade em todos os robôs a cada reordenação, guarda um
+        tick global (quantidade de reordenações) e, para cada robô, o tick em que entrou na fila.
+        O peso efetivo é calculado sob demanda:
+
+            peso = peso_base + incremento(prioridade) * (tick_atual - tick_entrada + 1)
+
+        Dentro de uma mesma prioridade a ordem entre os robôs não muda com o tempo, então cada
+        prioridade tem seu próprio heap com chave fixa. Retirar um robô compara apenas o topo de
+        cada heap: O(log n) por operação, com a mesma ordem de `QueueSortingAlgorithm.weighted_priority`
+        (maior peso, depois menor prioridade, depois ordem de chegada).
+        """
+        self.tick = 0
+        self._buckets = {}  # prioridade -> heap de (-offset, sequência, robô)
+        self._sequence = 0
+        self._frozen_weights = {}  # Pesos dos robôs fora da fila (valor no momento em que saíram)
+        self._popped = {}  # robô -> (prioridade, entrada do heap) da última retirada (ver `requeue`)
+
+    def advance(self):
+        """
+        Avança o tick global (equivale a uma reordenação da fila).
+        """
+        self.tick += 1
+
+    def push(self, robot, base_weight=0):
+        """
+        Insere um robô no tick atual.
+
+        :param robot: Instância da classe Robot.
+        :param base_weight: Peso do robô antes do incremento do tick atual.
+        """
+        increment = WEIGHT_INCREMENTS.get(robot.priority, 0)
+        # peso(T) = offset + incremento * T
+        offset = base_weight - increment * (self.tick - 1)
+        heapq.heappush(self._buckets.setdefault(robot.priority, []), (-offset, self._sequence, robot))
+        self._sequence += 1
+        self._frozen_weights.pop(robot.name, None)
+        self._popped.pop(robot.name, None)
+
+    def _weight(self, priority, negative_offset):
+        return WEIGHT_INCREMENTS.get(priority, 0) * self.tick - negative_offset
+
+    def pop(self):
+        """
+        Remove e retorna o robô de maior peso efetivo (ou None se a fila estiver vazia).
+        """
+        best_key = None
+        best_priority = None
+        for priority, bucket in self._buckets.items():
+            if bucket:
+                negative_offset, sequence, _ = bucket[0]
+                key = (-self._weight(priority, negative_offset), priority, sequence)
+                if best_key is None or key < best_key:
+                    best_key, best_priority = key, priority
+        if best_key is None:
+            return None
+
+        entry = heapq.heappop(self._buckets[best_priority])
+        negative_offset, _, robot = entry
+        self._frozen_weights[robot.name] = self._weight(best_priority, negative_offset)
+        self._popped[robot.name] = (best_priority, entry)
+        return robot
+
+    def requeue(self, robot):
+        """
+        Devolve um robô retirado por `pop` à mesma posição, sem zerar o peso nem avançar o tick.
+
+        :param robot: Robô retornado pelo último `pop` desse robô.
+        """
+        priority, entry = self._popped.pop(robot.name)
+        heapq.heappush(self._buckets[priority], entry)
+        self._frozen_weights.pop(robot.name, None)
+
+    def ordered(self):
+        """
+        Retorna os robôs da fila na ordem de saída (sem removê-los).
+        """
+        entries = [(-self._weight(priority, negative_offset), priority, sequence, robot)
+                   for priority, bucket in self._buckets.items()
+                   for negative_offset, sequence, robot in bucket]
+        return [entry[3] for entry in sorted(entries, key=lambda entry: entry[:3])]
+
+    def weights(self):
+        """
+        Retorna os pesos atuais no formato do `data` do WEIGHTED_PRIORITY ({robô: {"weight": peso}}).
+        """
+        weights = {name: {"weight": weight} for name, weight in self._frozen_weights.items()}
+        for priority, bucket in self._buckets.items():
+            for negative_offset, _, robot in bucket:
+                weights[robot.name] = {"weight": self._weight(priority, negative_offset)}
+        return weights
+
+    def load_weights(self, data):
+        """
+        Define os pesos dos robôs que ainda não estão na fila (ex: `data` inicial da DynamicQueue).
+        """
+        for name, values in data.items():
+            self._frozen_weights[name] = values["weight"]
+
+    def __len__(self):
+        return sum(len(bucket) for bucket in self._buckets.values())
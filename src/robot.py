@@ -1,4 +1,13 @@
+import weakref
+
+# (nome, prioridade) -> instância compartilhada de Robot. As referências são fracas: a entrada some quando nenhum
+# agendamento usa mais o robô, então carregar muitos cenários em um mesmo processo não acumula robôs.
+_interned = weakref.WeakValueDictionary()
+
+
 class Robot:
+    __slots__ = ("name", "priority", "__weakref__")
+
     def __init__(self, name, priority=0):
         """
         Representa um robô na DynamicQueue.
@@ -9,6 +18,30 @@ class Robot:
         self.name = name
         self.priority = priority
 
+    @classmethod
+    def intern(cls, name, priority=0):
+        """
+        Retorna a instância compartilhada do robô (uma por nome e prioridade), usada nos agendamentos do
+        BP Scheduler, onde o mesmo robô aparece em milhares de execuções. Robôs não são alterados depois
+        de criados, então compartilhar a instância é seguro.
+
+        :param name: Nome do robô.
+        :param priority: Prioridade do robô.
+        """
+        key = (name, priority)
+        robot = _interned.get(key)
+        if robot is None:
+            robot = _interned[key] = cls(name, priority)
+        return robot
+
+    @staticmethod
+    def clear_interned():
+        """
+        Esquece as instâncias compartilhadas: os próximos `intern` criam robôs novos, mesmo que os anteriores
+        ainda estejam em uso (ex: para isolar o carregamento de cenários independentes).
+        """
+        _interned.clear()
+
     def __lt__(self, other):
         """
         Permite ordenar robôs por prioridade automaticamente.
@@ -19,4 +52,4 @@ class Robot:
         """
         Representação legível do robô.
         """
-        return f"Robot(name={self.name}, priority={self.priority})"
\ No newline at end of file
+        return f"Robot(name={self.name}, priority={self.priority})"
@@ -0,0 +1,40 @@
+from functools import lru_cache
+from bp_scheduler import BPScheduler
+from dynamic_queue import DynamicQueue
+from execution_dataset import ExecutionDataset
+
+# ============================= CACHE DE ENTRADAS POR PROCESSO =============================
+# Cada processo (worker da varredura, do Monte Carlo ou dos benchmarks) carrega cada arquivo uma única vez.
+# Os objetos retornados são compartilhados: quem for alterá-los (simular) deve usar uma cópia (copy.deepcopy).
+@lru_cache(maxsize=None)
+def load_execution_dataset(file_path):
+    """
+    Retorna o ExecutionDataset do arquivo, carregado uma vez por processo.
+    """
+    return ExecutionDataset(file_path)
+
+
+@lru_cache(maxsize=None)
+def load_bp_scheduler(file_path):
+    """
+    Retorna o BPScheduler do arquivo, carregado uma vez por processo.
+    """
+    return BPScheduler(file_path)
+
+
+@lru_cache(maxsize=None)
+def load_dynamic_queue(file_path, sorting_algorithm):
+    """
+    Retorna a DynamicQueue do arquivo com a estratégia de ordenação, carregada uma vez por processo.
+    """
+    return DynamicQueue(file_path, sorting_algorithm=sorting_algorithm)
+
+
+def clear_loaded():
+    """
+    Descarta os objetos carregados (ex: entre cenários de uma execução longa, para liberar memória).
+    """
+    load_execution_dataset.cache_clear()
+    load_bp_scheduler.cache_clear()
+    load_dynamic_queue.cache_clear()
+# ===========================================================================================
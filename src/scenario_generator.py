@@ -0,0 +1,168 @@
+import argparse
+import os
+import time
+from datetime import datetime
+import numpy as np
+from simulation import DEFAULT_START_TIME
+
+DISTRIBUTIONS = ("uniform", "lognormal")
+DEFAULT_PRIORITY_MIX = (0.2, 0.5, 0.3)  # Proporção de robôs com prioridade 1, 2 e 3
+LOGNORMAL_SIGMA = 0.6  # Dispersão das distribuições lognormais (mediana na média geométrica dos limites)
+
+
+def _sample(rng, size, bounds, distribution):
+    """
+    Sorteia `size` inteiros entre `bounds[0]` e `bounds[1]` (inclusive).
+
+    :param distribution: 'uniform' ou 'lognormal' (cauda longa, truncada nos limites).
+    """
+    low, high = bounds
+    if distribution == "uniform":
+        return rng.integers(low, high + 1, size=size)
+    elif distribution == "lognormal":
+        median = np.sqrt(max(low, 1) * high)
+        values = np.rint(rng.lognormal(np.log(median), LOGNORMAL_SIGMA, size=size))
+        return np.clip(values, low, high).astype(np.int64)
+    raise ValueError(f"Distribuição {distribution} não reconhecida (use {', '.join(DISTRIBUTIONS)})")
+
+
+def _format_minutes(start_time, minutes):
+    """
+    Converte minutos desde `start_time` em texto, de forma vetorizada.
+
+    :return: Array de strings 'YYYY-MM-DDTHH:MM'.
+    """
+    return np.datetime_as_string(np.datetime64(start_time, "m") + minutes.astype("timedelta64[m]"), unit="m")
+
+
+def _write_csv(file_path, header, columns):
+    """
+    Grava colunas (arrays ou listas de mesmo tamanho) em CSV de uma só vez.
+    """
+    columns = [column.astype(str).tolist() if isinstance(column, np.ndarray) else column for column in columns]
+    with open(file_path, mode="w", newline="") as file:
+        file.write(",".join(header) + "\n")
+        if columns and columns[0]:
+            file.write("\n".join(map(",".join, zip(*columns))))
+            file.write("\n")
+
+
+def generate_scenario(output_dir, prefix="synthetic", executions=10000, robots=100, machines=5, horizon_days=28,
+                      start_time=DEFAULT_START_TIME, priority_mix=DEFAULT_PRIORITY_MIX, items=(1, 100),
+                      items_distribution="uniform", time_per_item=(1, 60), time_per_item_distribution="uniform",
+                      window_density=1.0, window_minutes=(15, 240), time_step_minutes=5, seed=None):
+    """
+    Gera um cenário sintético consistente no formato de `data/templates`.
+
+    Cada execução recebe um horário sorteado no horizonte (em passos de `time_step_minutes`). As execuções
+    com janela (uma fração `window_density`) usam esse horário como início da janela; o BP Scheduler
+    agenda cada execução nesse mesmo horário, distribuindo as execuções entre as máquinas em rodízio.
+    Os ids seguem a ordem dos horários, como nos cenários ct_*.
+
+    :param output_dir: Diretório de saída (criado se não existir).
+    :param prefix: Prefixo dos arquivos (<prefix>_execution_dataset.csv, _bp_scheduler.csv, _dynamic_queue.csv e _machines.csv).
+    :param executions: Quantidade de execuções no ExecutionDataset (e de agendamentos no BP Scheduler).
+    :param robots: Quantidade de robôs (R1..Rn).
+    :param machines: Quantidade de máquinas (M1..Mn).
+    :param horizon_days: Duração do horizonte em dias a partir de `start_time`.
+    :param start_time: Início do horizonte (datetime).
+    :param priority_mix: Proporção de robôs com prioridade 1, 2, 3, ... (normalizada).
+    :param items: Limites (mínimo, máximo) de itens por execução.
+    :param items_distribution: 'uniform' ou 'lognormal'.
+    :param time_per_item: Limites (mínimo, máximo) do tempo por item, em minutos.
+    :param time_per_item_distribution: 'uniform' ou 'lognormal'.
+    :param window_density: Fração das execuções com janela de horário (as demais ficam sem restrição).
+    :param window_minutes: Limites (mínimo, máximo) da duração das janelas, em minutos.
+    :param time_step_minutes: Granularidade dos horários e das janelas.
+    :param seed: Semente do gerador aleatório (mesma semente, mesmos arquivos).
+    :return: Dicionário com name, execution_dataset_file, bp_scheduler_file, dynamic_queue_file e machines_file.
+    """
+    if not 0 <= window_density <= 1:
+        raise ValueError("window_density deve estar entre 0 e 1")
+    rng = np.random.default_rng(seed)
+    step = max(1, int(time_step_minutes))
+    horizon_steps = max(1, (horizon_days * 24 * 60) // step)
+
+    # Horários das execuções (ordenados: os ids seguem a ordem do tempo)
+    offsets = np.sort(rng.integers(0, horizon_steps, size=executions)) * step
+    robot_numbers = rng.integers(1, robots + 1, size=executions)
+    execution_items = _sample(rng, executions, items, items_distribution)
+    execution_time_per_item = _sample(rng, executions, time_per_item, time_per_item_distribution)
+
+    has_window = rng.random(executions) < window_density
+    window_lengths = np.maximum(1, rng.integers(window_minutes[0], window_minutes[1] + 1, size=executions) // step) * step
+    start_text = _format_minutes(start_time, offsets)
+    end_text = _format_minutes(start_time, offsets + window_lengths)
+
+    robot_names = np.char.add("R", robot_numbers.astype(str))
+    machine_names = np.char.add("M", (np.arange(executions) % machines + 1).astype(str))
+
+    os.makedirs(output_dir, exist_ok=True)
+    scenario = {
+        "name": prefix,
+        "execution_dataset_file": os.path.join(output_dir, f"{prefix}_execution_dataset.csv"),
+        "bp_scheduler_file": os.path.join(output_dir, f"{prefix}_bp_scheduler.csv"),
+        "dynamic_queue_file": os.path.join(output_dir, f"{prefix}_dynamic_queue.csv"),
+        "machines_file": os.path.join(output_dir, f"{prefix}_machines.csv")
+    }
+
+    _write_csv(scenario["execution_dataset_file"],
+               ["execution_id", "robot", "items", "time_per_item", "start_window", "end_window", "completed"],
+               [np.arange(1, executions + 1), robot_names, execution_items, execution_time_per_item,
+                np.where(has_window, np.char.replace(start_text, "T", " "), ""),
+                np.where(has_window, np.char.replace(end_text, "T", " "), ""),
+                ["False"] * executions])
+
+    _write_csv(scenario["bp_scheduler_file"], ["robot", "machine", "date", "start_time"],
+               [robot_names, machine_names, start_text.astype("U10"), np.char.partition(start_text, "T")[:, 2]])
+
+    # Fila dinâmica: todos os robôs, em ordem aleatória, com prioridades sorteadas conforme `priority_mix`
+    priority_mix = np.asarray(priority_mix, dtype=float)
+    priorities = rng.choice(np.arange(1, len(priority_mix) + 1), size=robots, p=priority_mix / priority_mix.sum())
+    _write_csv(scenario["dynamic_queue_file"], ["queue_position", "robot", "priority"],
+               [np.arange(1, robots + 1), np.char.add("R", rng.permutation(np.arange(1, robots + 1)).astype(str)), priorities])
+
+    _write_csv(scenario["machines_file"], ["machine", "robots"],
+               [np.char.add("M", np.arange(1, machines + 1).astype(str)), [""] * machines])
+    return scenario
+
+
+def _parse_pair(value, cast=int):
+    low, high = (cast(item) for item in value.split(","))
+    return low, high
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gerador de cenários sintéticos para testes de escala")
+    parser.add_argument("--output_dir", type=str, required=True, help="Diretório de saída.")
+    parser.add_argument("--prefix", type=str, default="synthetic", help="Prefixo dos arquivos gerados.")
+    parser.add_argument("--executions", type=int, default=10000, help="Quantidade de execuções.")
+    parser.add_argument("--robots", type=int, default=100, help="Quantidade de robôs.")
+    parser.add_argument("--machines", type=int, default=5, help="Quantidade de máquinas.")
+    parser.add_argument("--horizon_days", type=int, default=28, help="Horizonte em dias.")
+    parser.add_argument("--start_time", type=lambda value: datetime.strptime(value, "%Y-%m-%d %H:%M"), default=DEFAULT_START_TIME)
+    parser.add_argument("--priority_mix", type=lambda value: [float(item) for item in value.split(",")], default=list(DEFAULT_PRIORITY_MIX),
+                        help="Proporções das prioridades 1,2,3,... (ex: '0.2,0.5,0.3').")
+    parser.add_argument("--items", type=_parse_pair, default=(1, 100), help="Mínimo e máximo de itens (ex: '1,100').")
+    parser.add_argument("--items_distribution", type=str, default="uniform", choices=DISTRIBUTIONS)
+    parser.add_argument("--time_per_item", type=_parse_pair, default=(1, 60), help="Mínimo e máximo do tempo por item em minutos.")
+    parser.add_argument("--time_per_item_distribution", type=str, default="uniform", choices=DISTRIBUTIONS)
+    parser.add_argument("--window_density", type=float, default=1.0, help="Fração das execuções com janela de horário.")
+    parser.add_argument("--window_minutes", type=_parse_pair, default=(15, 240), help="Mínimo e máximo da duração das janelas.")
+    parser.add_argument("--time_step_minutes", type=int, default=5, help="Granularidade dos horários.")
+    parser.add_argument("--seed", type=int, default=42, help="Semente do gerador aleatório.")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    scenario = generate_scenario(args.output_dir, args.prefix, args.executions, args.robots, args.machines, args.horizon_days,
+                                 args.start_time, args.priority_mix, args.items, args.items_distribution, args.time_per_item,
+                                 args.time_per_item_distribution, args.window_density, args.window_minutes,
+                                 args.time_step_minutes, args.seed)
+    print(f"Cenário {scenario['name']} gerado em {time.perf_counter() - start:.2f}s:")
+    for key in ("execution_dataset_file", "bp_scheduler_file", "dynamic_queue_file", "machines_file"):
+        print(f"  {scenario[key]}")
+    return scenario
+
+
+if __name__ == "__main__":
+    main()
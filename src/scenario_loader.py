@@ -0,0 +1,305 @@
+import csv
+import functools
+import hashlib
+import os
+import pickle
+from datetime import datetime
+
+DATETIME_FORMAT = "%Y-%m-%d %H:%M"
+ENGINES = ("pandas", "csv")
+CACHE_VERSION = 2  # Incrementar quando o formato das tuplas retornadas (ou do arquivo de cache) mudar
+
+# Engine padrão de leitura dos CSVs (pode ser definido pela variável de ambiente LINCOPT_CSV_ENGINE)
+_default_engine = os.environ.get("LINCOPT_CSV_ENGINE")
+
+# Cache binário dos cenários já lidos (LINCOPT_SCENARIO_CACHE=0 desativa, LINCOPT_CACHE_DIR muda o diretório).
+# Fica no diretório de cache do usuário ($XDG_CACHE_HOME ou ~/.cache), fora do repositório.
+_cache_enabled = os.environ.get("LINCOPT_SCENARIO_CACHE", "1") not in ("0", "false", "False")
+_cache_dir = os.environ.get("LINCOPT_CACHE_DIR", os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+                                                               "lincopt_simulation"))
+
+
+def set_default_engine(engine):
+    """
+    Define o engine padrão de leitura dos arquivos de entrada.
+
+    :param engine: 'pandas', 'csv' (sem dependência do pandas) ou None (pandas se estiver instalado).
+    """
+    global _default_engine
+    if engine is not None and engine not in ENGINES:
+        raise ValueError(f"Engine {engine} não reconhecido (use {', '.join(ENGINES)})")
+    _default_engine = engine
+
+
+def set_cache(enabled=True, cache_dir=None):
+    """
+    Configura o cache binário dos cenários.
+
+    :param enabled: Se False, os arquivos são sempre lidos do CSV.
+    :param cache_dir: (Opcional) Diretório onde os cenários convertidos são guardados.
+    """
+    global _cache_enabled, _cache_dir
+    _cache_enabled = enabled
+    if cache_dir is not None:
+        _cache_dir = cache_dir
+
+
+def clear_cache():
+    """
+    Remove todos os arquivos do cache de cenários.
+    """
+    if os.path.isdir(_cache_dir):
+        for name in os.listdir(_cache_dir):
+            if name.endswith(".pkl"):
+                os.remove(os.path.join(_cache_dir, name))
+
+
+def _cache_path(kind, file_path, engine):
+    """
+    Caminho do arquivo de cache de um CSV: um arquivo por tipo, engine e caminho (uma nova versão do CSV
+    substitui a anterior no cache).
+    """
+    key = f"{CACHE_VERSION}|{kind}|{engine}|{os.path.abspath(file_path)}"
+    return os.path.join(_cache_dir, f"{kind}_{hashlib.sha1(key.encode()).hexdigest()}.pkl")
+
+
+def _content_digest(file_path):
+    """
+    Hash SHA-1 do conteúdo do arquivo.
+    """
+    digest = hashlib.sha1()
+    with open(file_path, mode="rb") as file:
+        for chunk in iter(lambda: file.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _cached(kind):
+    """
+    Decorador que envolve um leitor de CSV com o cache binário (pickle das tuplas já convertidas).
+
+    Em um acerto de cache nem o CSV é interpretado nem o pandas é importado.
+
+    :param kind: Tipo do arquivo (entra na chave do cache).
+    """
+    def decorator(reader):
+        @functools.wraps(reader)
+        def read(file_path, engine=None):
+            return _read_with_cache(kind, reader, file_path, engine)
+        return read
+    return decorator
+
+
+def _write_cache(cache_path, stamp, digest, rows):
+    """
+    Grava o cabeçalho ((mtime_ns, tamanho), hash do CSV) seguido das tuplas. Sem permissão de escrita, segue sem cache.
+    """
+    try:
+        os.makedirs(_cache_dir, exist_ok=True)
+        temporary_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(temporary_path, mode="wb") as file:
+            pickle.dump((stamp, digest), file, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(rows, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary_path, cache_path)  # Escrita atômica (vários processos podem ler o mesmo cenário)
+    except OSError:
+        pass
+
+
+def _read_with_cache(kind, reader, file_path, engine):
+    """
+    Retorna as tuplas do cache se o CSV não mudou; caso contrário lê o CSV e grava o resultado no cache.
+
+    A validação usa (mtime_ns, tamanho) do CSV; o conteúdo só é lido e comparado pelo hash quando eles
+    mudam (ex: arquivo copiado ou tocado sem alteração, que continua aproveitando o cache).
+    """
+    engine = _resolve_engine(engine)
+    if not _cache_enabled:
+        return reader(file_path, engine)
+
+    stat = os.stat(file_path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    cache_path = _cache_path(kind, file_path, engine)
+    digest = None
+    try:
+        with open(cache_path, mode="rb") as file:
+            cached_stamp, cached_digest = pickle.load(file)
+            if cached_stamp == stamp:
+                return pickle.load(file)
+            digest = _content_digest(file_path)
+            if cached_digest == digest:
+                rows = pickle.load(file)
+                _write_cache(cache_path, stamp, digest, rows)  # Atualiza o carimbo: os próximos acertos não releem o CSV
+                return rows
+    except (OSError, EOFError, ValueError, pickle.UnpicklingError):
+        pass
+
+    rows = reader(file_path, engine)
+    _write_cache(cache_path, stamp, digest or _content_digest(file_path), rows)
+    return rows
+
+
+def _resolve_engine(engine):
+    engine = engine or _default_engine
+    if engine is None:
+        try:
+            import pandas  # noqa: F401
+            engine = "pandas"
+        except ImportError:
+            engine = "csv"
+    if engine not in ENGINES:
+        raise ValueError(f"Engine {engine} não reconhecido (use {', '.join(ENGINES)})")
+    return engine
+
+
+# ============================= CONVERSORES DO ENGINE CSV =============================
+def _read_rows(file):
+    """
+    Lê as linhas de um CSV, ignorando linhas em branco.
+
+    :return: Tupla (lista de linhas, dicionário {coluna: posição}).
+    """
+    reader = csv.reader(file)
+    header = next(reader, [])
+    columns = {name.strip(): position for position, name in enumerate(header)}
+    return [row for row in reader if any(row)], columns
+
+
+def _to_number(value):
+    """
+    Converte um texto numérico em int (ou float), como o pandas faz ao inferir o tipo da coluna.
+    """
+    try:
+        return int(value)
+    except ValueError:
+        return float(value)
+
+
+def _to_bool(value):
+    return value.strip().lower() in ("true", "1", "yes")
+
+
+def _datetime_parser():
+    """
+    Retorna um conversor de 'YYYY-MM-DD HH:MM' para datetime com memória dos valores já vistos
+    (janelas e horários se repetem muito nos cenários). Texto vazio vira None.
+    """
+    parsed = {"": None}
+
+    def parse(value):
+        try:
+            return parsed[value]
+        except KeyError:
+            result = parsed[value] = datetime.strptime(value, DATETIME_FORMAT)
+            return result
+
+    return parse
+# =====================================================================================
+
+
+def _parse_datetime_column(pd, series):
+    """
+    Converte uma coluna de texto em lista de datetime (None para vazios).
+
+    Os valores distintos são convertidos de uma vez com `pd.to_datetime` e depois mapeados de volta.
+    """
+    codes, uniques = pd.factorize(series)
+    parsed = pd.to_datetime(pd.Series(uniques, dtype=object), format=DATETIME_FORMAT)
+    values = [None if pd.isna(value) else value.to_pydatetime() for value in parsed]
+    return [None if code < 0 else values[code] for code in codes.tolist()]
+
+
+@_cached("execution_dataset")
+def read_execution_dataset(file_path, engine=None):
+    """
+    Lê o arquivo do ExecutionDataset.
+
+    :param file_path: Caminho do arquivo CSV.
+    :param engine: 'pandas' ou 'csv' (padrão: `set_default_engine`).
+    :return: Lista de tuplas (execution_id, robot, items, time_per_item, start_window, end_window, completed),
+             na ordem do arquivo.
+    """
+    if _resolve_engine(engine) == "csv":
+        parse_datetime = _datetime_parser()
+        with open(file_path, mode="r", newline="") as file:
+            rows, columns = _read_rows(file)
+            execution_id, robot, items, time_per_item, start_window, end_window = (
+                columns[name] for name in ("execution_id", "robot", "items", "time_per_item", "start_window", "end_window"))
+            completed = columns.get("completed")
+            return [
+                (_to_number(row[execution_id]), row[robot], _to_number(row[items]), _to_number(row[time_per_item]),
+                 parse_datetime(row[start_window]), parse_datetime(row[end_window]),
+                 _to_bool(row[completed]) if completed is not None else False)  # Respeita o valor existente ou assume False
+                for row in rows
+            ]
+
+    import pandas as pd
+    df = pd.read_csv(file_path, dtype={"robot": str, "start_window": str, "end_window": str})
+    completed = df["completed"].fillna(False).astype(bool).tolist() if "completed" in df else [False] * len(df)
+    return list(zip(
+        df["execution_id"].tolist(),
+        df["robot"].tolist(),
+        df["items"].tolist(),
+        df["time_per_item"].tolist(),
+        _parse_datetime_column(pd, df["start_window"]),
+        _parse_datetime_column(pd, df["end_window"]),
+        completed
+    ))
+
+
+@_cached("bp_schedule")
+def read_bp_schedule(file_path, engine=None):
+    """
+    Lê o arquivo do BP Scheduler.
+
+    :param file_path: Caminho do arquivo CSV.
+    :param engine: 'pandas' ou 'csv' (padrão: `set_default_engine`).
+    :return: Lista de tuplas (start_time, robot, machine), na ordem do arquivo.
+    """
+    if _resolve_engine(engine) == "csv":
+        parse_datetime = _datetime_parser()
+        with open(file_path, mode="r", newline="") as file:
+            rows, columns = _read_rows(file)
+            date, start_time, robot, machine = (columns[name] for name in ("date", "start_time", "robot", "machine"))
+            return [(parse_datetime(f"{row[date]} {row[start_time]}"), row[robot], row[machine]) for row in rows]
+
+    import pandas as pd
+    df = pd.read_csv(file_path, dtype=str)
+    start_times = _parse_datetime_column(pd, df["date"] + " " + df["start_time"])
+    return list(zip(start_times, df["robot"].tolist(), df["machine"].tolist()))
+
+
+def iter_bp_schedule(file_path):
+    """
+    Lê o arquivo do BP Scheduler linha a linha, sem carregar o arquivo inteiro (e sem passar pelo cache).
+
+    :param file_path: Caminho do arquivo CSV.
+    :return: Gerador de tuplas (start_time, robot, machine), na ordem do arquivo.
+    """
+    parse_datetime = functools.lru_cache(maxsize=4096)(lambda value: datetime.strptime(value, DATETIME_FORMAT))
+    with open(file_path, mode="r", newline="") as file:
+        reader = csv.reader(file)
+        columns = {name.strip(): position for position, name in enumerate(next(reader, []))}
+        date, start_time, robot, machine = (columns[name] for name in ("date", "start_time", "robot", "machine"))
+        for row in reader:
+            if any(row):
+                yield parse_datetime(f"{row[date]} {row[start_time]}"), row[robot], row[machine]
+
+
+@_cached("dynamic_queue")
+def read_dynamic_queue(file_path, engine=None):
+    """
+    Lê o arquivo da fila dinâmica.
+
+    :param file_path: Caminho do arquivo CSV.
+    :param engine: 'pandas' ou 'csv' (padrão: `set_default_engine`).
+    :return: Lista de tuplas (robot, priority), na ordem do arquivo.
+    """
+    if _resolve_engine(engine) == "csv":
+        with open(file_path, mode="r", newline="") as file:
+            rows, columns = _read_rows(file)
+            robot, priority = columns["robot"], columns["priority"]
+            return [(row[robot], _to_number(row[priority])) for row in rows]
+
+    import pandas as pd
+    df = pd.read_csv(file_path, dtype={"robot": str})
+    return list(zip(df["robot"].tolist(), df["priority"].tolist()))
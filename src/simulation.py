@@ -0,0 +1,444 @@
+import itertools
+from datetime import datetime, timedelta
+from event_scheduler import create_event_scheduler, Event, TICKS_PER_MINUTE
+from bp_scheduler import BPScheduler
+from simulation_log import SimulationLog
+from metrics import SimulationMetrics
+from checkpoint import save_checkpoint
+
+DEFAULT_START_TIME = datetime(2025, 2, 20, 8, 0)  # Data inicial padrão da simulação
+DEFAULT_FINISH_TIME = datetime(2025, 3, 20, 0, 0)  # Data final padrão da simulação
+FALLBACK_EXECUTION_TIME = 2  # Tempo mínimo de execução (minutos) para eventos fora do dataset
+BP_STREAM_LOOKAHEAD_MINUTES = 24 * 60  # Janela de antecedência com que o BP em streaming alimenta o EventScheduler
+TERMINATION_POLICIES = ("all_complete", "unsatisfiable")  # Critérios opcionais de parada antecipada
+
+
+class SimulationResult:
+    def __init__(self, simulation):
+        """
+        Resumo de uma simulação executada.
+
+        :param simulation: Instância de Simulation já executada.
+        """
+        self.use_bp_scheduler = simulation.use_bp_scheduler
+        self.start_time = simulation.start_time
+        self.finish_time = simulation.finish_time
+        self.final_clock = simulation.clock
+        self.events_processed = simulation.events_processed
+        self.robot_executions = simulation.robot_executions
+        self.dataset_executions = simulation.dataset_executions
+        self.run_overs = simulation.run_overs
+        self.completion_percentage = simulation.execution_dataset.get_completion_percentage()
+        self.all_executions_complete = simulation.execution_dataset.all_executions_complete()
+        self.log_file = simulation.simulation_log.file_path
+        self.termination_policies = simulation.termination_policies
+        self.max_events = simulation.max_events
+        self.termination_reason = simulation.termination_reason
+        self.summary = simulation.metrics.summary(simulation.clock, self.all_executions_complete)
+        self.summary["termination_policies"] = list(self.termination_policies)
+        self.summary["max_events"] = self.max_events
+        self.summary["termination_reason"] = self.termination_reason
+
+    def to_dict(self):
+        """
+        Retorna as métricas do resultado como dicionário (uma linha de tabela de resultados).
+        """
+        return {
+            "use_bp_scheduler": self.use_bp_scheduler,
+            "start_time": self.start_time,
+            "finish_time": self.finish_time,
+            "final_clock": self.final_clock,
+            "events_processed": self.events_processed,
+            "robot_executions": self.robot_executions,
+            "dataset_executions": self.dataset_executions,
+            "run_overs": self.run_overs,
+            "completion_percentage": self.completion_percentage,
+            "all_executions_complete": self.all_executions_complete,
+            "makespan_minutes": self.summary["makespan_minutes"],
+            "mean_machine_utilization": self.summary["mean_machine_utilization"],
+            "mean_waiting_minutes": self.summary["mean_waiting_minutes"],
+            "termination_policies": ",".join(self.termination_policies),
+            "max_events": self.max_events,
+            "termination_reason": self.termination_reason,
+            "log_file": self.log_file
+        }
+
+    def __repr__(self):
+        """
+        Representação legível do resultado.
+        """
+        return (f"SimulationResult(completion={self.completion_percentage:.2f}%, run_overs={self.run_overs}, "
+                f"robot_executions={self.robot_executions}, events={self.events_processed}, clock={self.final_clock}, "
+                f"termination={self.termination_reason})")
+
+
+class Simulation:
+    def __init__(self, execution_dataset, scheduler, machines, simulation_log=None,
+                 start_time=DEFAULT_START_TIME, finish_time=DEFAULT_FINISH_TIME, event_backend="heap",
+                 lookahead_minutes=BP_STREAM_LOOKAHEAD_MINUTES, duration_sampler=None, termination_policies=(),
+                 max_events=None):
+        """
+        Motor da simulação de execução de robôs.
+
+        Recebe os objetos já carregados, de modo que um mesmo processo possa executar vários cenários
+        sem recarregar os arquivos de entrada.
+
+        :param execution_dataset: Instância de ExecutionDataset.
+        :param scheduler: Instância de BPScheduler (agendamento fixo) ou DynamicQueue (fila dinâmica).
+        :param machines: Instância de Machines.
+        :param simulation_log: (Opcional) Instância de SimulationLog. Se omitido, o log fica em memória.
+        :param start_time: Tempo inicial da simulação (datetime).
+        :param finish_time: Tempo final da simulação (datetime).
+        :param event_backend: Backend do EventScheduler ('heap' ou 'calendar').
+        :param lookahead_minutes: Com um BPScheduler em streaming, quantos minutos à frente do próximo evento
+                                  os agendamentos são inseridos no EventScheduler.
+        :param duration_sampler: (Opcional) Função (execução do dataset ou None, nome do robô) -> duração em minutos,
+                                 usada no lugar de items * time_per_item e de FALLBACK_EXECUTION_TIME (modo estocástico).
+        :param termination_policies: Critérios de parada antecipada (ver TERMINATION_POLICIES):
+                                     'all_complete' para quando todo o dataset foi concluído;
+                                     'unsatisfiable' para quando nenhuma execução pendente ainda pode ser iniciada.
+        :param max_events: (Opcional) Limite de eventos processados.
+        """
+        self.execution_dataset = execution_dataset
+        self.scheduler = scheduler
+        self.machines = machines
+        self.simulation_log = simulation_log if simulation_log is not None else SimulationLog(None)
+        self.start_time = start_time
+        self.finish_time = finish_time
+        self.use_bp_scheduler = isinstance(scheduler, BPScheduler)
+        self.duration_sampler = duration_sampler
+
+        self.event_scheduler = create_event_scheduler(start_time, event_backend)
+        self.clock = start_time
+        self.events_processed = 0
+        self.robot_executions = 0
+        self.dataset_executions = 0
+        self.run_overs = 0
+        self._initialized = False
+
+        # Parada: o motivo é registrado em `termination_reason` ('finish_time', 'no_events' ou um critério antecipado)
+        self.set_termination(termination_policies, max_events)
+        self.termination_reason = None
+
+        # Métricas agregadas durante a execução (resumo gravado ao lado do log)
+        self.metrics = SimulationMetrics(start_time)
+        for machine_name in machines.machines:
+            self.metrics.record_machine(machine_name)
+
+        # Agendamento do BP lido sob demanda (BPScheduler em streaming)
+        self.lookahead_ticks = lookahead_minutes * TICKS_PER_MINUTE
+        self._schedule_stream = None
+        self._stream_head = None  # Próxima execução programada ainda não inserida no EventScheduler
+        self._stream_head_tick = None
+        self._fed_until_tick = -1  # Todas as execuções com tick <= este valor já foram inseridas
+        self._stream_consumed = 0  # Execuções já lidas do agendamento (retomada de checkpoint)
+
+        # Checkpoints periódicos (ver `enable_checkpoints`)
+        self._checkpoint_file = None
+        self._checkpoint_interval = None
+        self._next_checkpoint_time = None
+
+    # =================================== LÓGICA PARA ESCOLHER ENTRE BP SCHEDULER E FILA DINÂMICA ===================================
+    def schedule_initial_events(self):
+        """
+        Preenche o EventScheduler com os eventos iniciais (agendamentos do BP ou primeiros robôs da fila).
+        """
+        if self._initialized:
+            return
+        self._initialized = True
+
+        if self.use_bp_scheduler and self.scheduler.streaming:
+            self._schedule_stream = self.scheduler.iter_executions()
+            self._advance_stream()
+        elif self.use_bp_scheduler:
+            for execution in self.scheduler.get_all_executions():
+                scheduled_bot_event = Event(execution.start_time, "start_execution", execution.robot, execution.machine_name)
+                self.event_scheduler.add_event(scheduled_bot_event)
+        else:
+            for robot in self.scheduler.robots:
+                self.metrics.record_ready(robot.name, self.start_time)
+            for machine in self.machines.get_idle_machines():
+                # Adicionar ao EventScheduler o primeiro robô da DynamicQueue aceito pela máquina
+                skipped = []
+                robot = self.scheduler.get_next_robot()
+                while robot and not self.machines.machine_accepts(machine, robot.name):
+                    skipped.append(robot)
+                    robot = self.scheduler.get_next_robot()
+                for skipped_robot in reversed(skipped):
+                    self.scheduler.requeue(skipped_robot)  # Máquina restrita: o robô volta para a mesma posição
+                if robot:
+                    self.event_scheduler.add_event(Event(self.start_time, "start_execution", robot, machine, 0))
+    # =================================================================================================================================
+
+    # =================================== AGENDAMENTO DO BP EM STREAMING ===================================
+    def _advance_stream(self):
+        self._stream_head = next(self._schedule_stream, None)
+        if self._stream_head is not None:
+            self._stream_consumed += 1
+            self._stream_head_tick = self.event_scheduler.to_tick(self._stream_head.start_time)
+
+    def _feed_schedule(self):
+        """
+        Garante que todas as execuções programadas até o próximo evento estejam no EventScheduler.
+
+        Quando o próximo evento passa do limite já carregado, insere as execuções até `lookahead_ticks`
+        à frente dele. Como a leitura segue a ordem do arquivo, a ordem de processamento é a mesma de
+        quando todo o agendamento é inserido no início.
+        """
+        next_tick = self.event_scheduler.peek_tick()
+        if (next_tick is not None and next_tick <= self._fed_until_tick) or self._stream_head is None:
+            return
+
+        anchor_tick = self._stream_head_tick if next_tick is None else min(next_tick, self._stream_head_tick)
+        self._fed_until_tick = anchor_tick + self.lookahead_ticks
+        while self._stream_head is not None and self._stream_head_tick <= self._fed_until_tick:
+            execution = self._stream_head
+            self.event_scheduler.add_event(Event(execution.start_time, "start_execution", execution.robot,
+                                                 execution.machine_name, self._stream_head_tick))
+            self._advance_stream()
+    # ======================================================================================================
+
+    # =================================== CHECKPOINTS ===================================
+    def enable_checkpoints(self, file_path, interval_minutes):
+        """
+        Grava um checkpoint (ver `checkpoint.save_checkpoint`) a cada `interval_minutes` de tempo simulado,
+        contados a partir do início da simulação.
+
+        :param file_path: Arquivo do checkpoint (sobrescrito a cada gravação).
+        :param interval_minutes: Intervalo entre checkpoints, em minutos simulados.
+        :raises ValueError: Se o log não suportar checkpoints (.npz, .parquet, .arrow), antes de iniciar a execução.
+        """
+        if not self.simulation_log.supports_checkpoints:
+            raise ValueError(f"O log {self.simulation_log.file_path} não suporta checkpoints (use um log .csv ou em memória)")
+        self._checkpoint_file = file_path
+        self._checkpoint_interval = timedelta(minutes=interval_minutes)
+        elapsed_intervals = max(0, (self.clock - self.start_time) // self._checkpoint_interval)
+        self._next_checkpoint_time = self.start_time + (elapsed_intervals + 1) * self._checkpoint_interval
+
+    def _save_due_checkpoint(self):
+        if self.clock < self._next_checkpoint_time:
+            return
+        save_checkpoint(self, self._checkpoint_file)
+        while self._next_checkpoint_time <= self.clock:
+            self._next_checkpoint_time += self._checkpoint_interval
+
+    def __getstate__(self):
+        """
+        Estado serializado no checkpoint: o log, o gerador do agendamento em streaming e a configuração
+        de checkpoints ficam de fora (são refeitos em `checkpoint.load_checkpoint`).
+        """
+        state = self.__dict__.copy()
+        state.update({"simulation_log": None, "_schedule_stream": None, "_checkpoint_file": None,
+                      "_checkpoint_interval": None, "_next_checkpoint_time": None})
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self.use_bp_scheduler and self.scheduler.streaming and self._initialized:
+            # Retoma a leitura do agendamento logo após a última execução lida
+            self._schedule_stream = itertools.islice(self.scheduler.iter_executions(), self._stream_consumed, None)
+    # ====================================================================================
+
+    def has_pending_events(self):
+        """
+        Retorna True se ainda há eventos no EventScheduler ou execuções programadas por ler.
+        """
+        return self.event_scheduler.has_pending_events() or self._stream_head is not None
+
+    def has_next_step(self):
+        """
+        Retorna True enquanto a simulação deve continuar processando eventos.
+        """
+        return (self.has_pending_events() and self.use_bp_scheduler) or self.clock <= self.finish_time
+
+    def set_termination(self, termination_policies=(), max_events=None):
+        """
+        Define os critérios de parada antecipada. O limite de eventos conta a partir da chamada, então uma
+        simulação retomada de um checkpoint processa até `max_events` eventos a mais.
+
+        :param termination_policies: Critérios de parada antecipada (ver TERMINATION_POLICIES).
+        :param max_events: (Opcional) Limite de eventos processados a partir de agora.
+        """
+        unknown = set(termination_policies) - set(TERMINATION_POLICIES)
+        if unknown:
+            raise ValueError(f"Critérios de parada não reconhecidos: {', '.join(sorted(unknown))}")
+
+        self.termination_policies = tuple(policy for policy in TERMINATION_POLICIES if policy in termination_policies)
+        self.stop_when_complete = "all_complete" in termination_policies
+        self.stop_when_unsatisfiable = "unsatisfiable" in termination_policies
+        self.max_events = max_events
+        self._events_limit = None if max_events is None else self.events_processed + max_events
+        self._early_stop = self.stop_when_complete or self.stop_when_unsatisfiable or max_events is not None
+
+    def check_termination(self):
+        """
+        Avalia os critérios de parada antecipada.
+
+        :return: 'max_events', 'all_complete', 'unsatisfiable' ou None se a simulação deve continuar.
+        """
+        if self._events_limit is not None and self.events_processed >= self._events_limit:
+            return "max_events"
+        if self.stop_when_complete and self.execution_dataset.all_executions_complete():
+            return "all_complete"
+        if self.stop_when_unsatisfiable and not self.execution_dataset.has_satisfiable_executions(self.clock):
+            return "unsatisfiable"
+        return None
+
+    def advance(self):
+        """
+        Processa o próximo evento, se a simulação ainda deve continuar.
+
+        :return: False quando a simulação terminou (o motivo fica em `termination_reason`).
+        """
+        if not self.has_next_step():
+            self.termination_reason = "finish_time"
+            return False
+        if self._early_stop:
+            reason = self.check_termination()
+            if reason is not None:
+                self.termination_reason = reason
+                return False
+        if self.step() is None:
+            self.termination_reason = "no_events"
+            return False
+        return True
+
+    def step(self):
+        """
+        Processa o próximo evento da simulação.
+
+        :return: O evento processado ou None se não houver mais eventos. O objeto pode já ter sido
+                 reaproveitado para o evento seguinte da mesma execução.
+        """
+        if self._schedule_stream is not None:
+            self._feed_schedule()
+        event = self.event_scheduler.get_next_event()
+        if event is None:
+            return None
+
+        self.events_processed += 1
+        if event.event_type == "start_execution":
+            self._process_start(event)
+        elif event.event_type == "end_execution":
+            self._process_end(event)
+        return event
+
+    def _process_start(self, event):
+        """
+        Processa um evento de início (start_execution).
+        """
+        if not self.machines.is_machine_idle(event.machine_name):
+            # Registrar "Atropelamento" no log e continuar
+            self.run_overs += 1
+            self.metrics.record_run_over(event.robot.name, event.machine_name, event.event_time)
+            self.simulation_log.log("run_over", event.robot.name, event.machine_name, event.event_time, event.event_time)
+            return
+
+        self.machines.make_machine_busy(event.machine_name)
+
+        # Buscar uma execução no ExecutionDataset com base no robô e horário
+        current_execution = self.execution_dataset.get_execution_by_robot_and_time(event.robot.name, event.event_time)
+
+        # Definir o tempo de execução baseado no ExecutionDataset, se existir
+        if current_execution:
+            execution_time = current_execution["items"] * current_execution["time_per_item"]
+            execution_id = current_execution["execution_id"]
+        else:
+            execution_time = FALLBACK_EXECUTION_TIME
+            execution_id = None
+        if self.duration_sampler is not None:
+            execution_time = self.duration_sampler(current_execution, event.robot.name)
+
+        # Set no valor do clock
+        self.clock = event.event_time
+
+        end_time = event.event_time + timedelta(minutes=execution_time)
+        end_tick = event.tick + round(execution_time * TICKS_PER_MINUTE)
+
+        # Registrar no SimulationLog
+        self.robot_executions += 1
+        self.metrics.record_execution(event.robot.name, event.machine_name, event.event_time, end_time, current_execution)
+        self.simulation_log.log("robot_execution", event.robot.name, event.machine_name, event.event_time, end_time, execution_id)
+
+        # Marcar a execução como concluída se for do ExecutionDataset
+        if execution_id:
+            self.execution_dataset.mark_execution_complete(execution_id)
+            self.dataset_executions += 1
+
+            # Faz log da porcentagem de completudo do execution_dataset.
+            completion_percentage = round(self.execution_dataset.get_completion_percentage(), 2)
+            self.metrics.record_completion(event.event_time, completion_percentage)
+            self.simulation_log.log("completion_percentage", None, None, event.event_time, event.event_time, execution_id, completion_percentage)
+
+        # Criar o evento de término da execução (reaproveitando o objeto do início) e adicioná-lo no EventScheduler
+        self.event_scheduler.add_event(event.reuse(end_time, "end_execution", event.robot, event.machine_name, end_tick))
+
+    def _process_end(self, event):
+        """
+        Processa um evento de fim (end_execution).
+        """
+        self.machines.make_machine_idle(event.machine_name)
+
+        # Set no valor do clock
+        self.clock = event.event_time
+
+        # =================================== LÓGICA PARA A FILA DINÂMICA ===================================
+        if not self.use_bp_scheduler:
+            # Adiciona o robô que terminou de executar na fila novamente
+            self.scheduler.add_robot(event.robot)
+            self.metrics.record_ready(event.robot.name, event.event_time)
+            # Pega o próximo robô da fila dinâmica que tenha uma máquina compatível ociosa. A máquina recém-liberada
+            # é a preferida, evitando que dois robôs sejam enviados à mesma máquina
+            skipped = []
+            next_robot = self.scheduler.get_next_robot()
+            while next_robot:
+                machine_name = self.machines.get_next_idle_machine(next_robot.name, preferred=event.machine_name)
+                if machine_name is not None:
+                    break
+                skipped.append(next_robot)
+                next_robot = self.scheduler.get_next_robot()
+            for skipped_robot in reversed(skipped):
+                self.scheduler.requeue(skipped_robot)  # Sem máquina compatível: volta para a mesma posição, com o peso
+            if next_robot:
+                self.event_scheduler.add_event(event.reuse(event.event_time, "start_execution", next_robot, machine_name, event.tick))
+        # ====================================================================================================
+
+    def run(self):
+        """
+        Executa a simulação até o fim e retorna o resultado.
+
+        :return: Instância de SimulationResult.
+        """
+        self.schedule_initial_events()
+
+        # Sai do loop ao passar do finish_time, sem eventos ou em um critério de parada antecipada
+        while self.advance():
+            if self._checkpoint_file is not None:
+                self._save_due_checkpoint()
+
+        # Interrompida pelo limite de eventos: grava o ponto de parada para que a simulação possa ser continuada
+        if self._checkpoint_file is not None and self.termination_reason == "max_events":
+            save_checkpoint(self, self._checkpoint_file)
+        return self.finish()
+
+    def finish(self):
+        """
+        Persiste o log pendente e retorna o resultado (usado ao fim de `run()` ou de uma execução passo a passo).
+
+        :return: Instância de SimulationResult.
+        """
+        self.simulation_log.flush()
+        return SimulationResult(self)
+
+
+def run_simulation(execution_dataset, scheduler, machines, simulation_log=None,
+                   start_time=DEFAULT_START_TIME, finish_time=DEFAULT_FINISH_TIME, event_backend="heap",
+                   lookahead_minutes=BP_STREAM_LOOKAHEAD_MINUTES, termination_policies=(), max_events=None):
+    """
+    Executa uma simulação completa com objetos já carregados.
+
+    :return: Instância de SimulationResult.
+    """
+    simulation = Simulation(execution_dataset, scheduler, machines, simulation_log, start_time, finish_time, event_backend,
+                            lookahead_minutes, termination_policies=termination_policies, max_events=max_events)
+    return simulation.run()
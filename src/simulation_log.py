@@ -1,21 +1,498 @@
 import csv
 import os
 import uuid
+import warnings
+from datetime import datetime, timedelta
 
-class SimulationLog:
-    def __init__(self, file_path="simulation_log.csv"):
+LOG_COLUMNS = ["log_id", "execution_id", "event_type", "robot", "machine", "start_time", "end_time", "data"]
+CATEGORICAL_COLUMNS = ("event_type", "robot", "machine")
+ARROW_EXTENSIONS = (".parquet", ".arrow", ".feather")
+LOG_FORMATS = (".csv", ".npz") + ARROW_EXTENSIONS
+LOG_TIME_UNIT = "s"  # Datas nos formatos colunares: segundos desde a época Unix (int64)
+ARROW_BATCH_ROWS = 65536  # Linhas por row group / lote gravado nos formatos Arrow
+LOG_READ_CHUNK_ROWS = 100000  # Linhas por bloco na leitura dos logs
+MISSING_CODE = -1  # Código de valor vazio nas colunas inteiras e categóricas
+MISSING_TIME = -2 ** 63  # Data vazia nas colunas de tempo
+UNIX_EPOCH = datetime(1970, 1, 1)
+ONE_SECOND = timedelta(seconds=1)
+
+
+class LogSink:
+    """
+    Interface dos destinos do SimulationLog.
+
+    Um sink recebe lotes de linhas (listas na ordem de LOG_COLUMNS) já bufferizadas pelo SimulationLog.
+    """
+    supports_checkpoints = False  # Se implementa `tell` (posição usada para truncar o log ao retomar)
+
+    def write_rows(self, rows):
         """
-        Inicializa o SimulationLog e cria o arquivo CSV se ele não existir.
+        Persiste um lote de linhas.
 
-        :param file_path: Caminho do arquivo CSV onde os logs serão armazenados.
+        :param rows: Lista de linhas, cada uma na ordem de LOG_COLUMNS.
+        """
+        raise NotImplementedError
+
+    def read_rows(self):
+        """
+        Retorna todas as linhas persistidas como uma lista de dicionários.
+        """
+        raise NotImplementedError
+
+    def flush(self):
+        """
+        Força a escrita de dados pendentes no destino.
+        """
+
+    def tell(self):
+        """
+        Retorna a posição atual do log no destino (usada nos checkpoints para truncar o log ao retomar).
+        """
+        raise NotImplementedError(f"{type(self).__name__} não suporta checkpoints (use um log .csv ou em memória)")
+
+    def close(self):
+        """
+        Libera os recursos do sink.
+        """
+
+
+class CsvLogSink(LogSink):
+    supports_checkpoints = True
+
+    def __init__(self, file_path):
+        """
+        Sink que grava o log em CSV, mantendo o arquivo aberto entre os lotes.
+
+        :param file_path: Caminho do arquivo CSV. O cabeçalho é criado caso o arquivo não exista.
         """
         self.file_path = file_path
+        self._file = None
+        self._writer = None
 
         # Criar o arquivo e cabeçalho caso ele não exista
         if not os.path.exists(self.file_path):
             with open(self.file_path, mode="w", newline="") as file:
-                writer = csv.writer(file)
-                writer.writerow(["log_id", "execution_id", "event_type", "robot", "machine", "start_time", "end_time", "data"])
+                csv.writer(file).writerow(LOG_COLUMNS)
+
+    def write_rows(self, rows):
+        if self._file is None:
+            self._file = open(self.file_path, mode="a", newline="")
+            self._writer = csv.writer(self._file)
+        self._writer.writerows(rows)
+
+    def read_rows(self):
+        self.flush()
+        with open(self.file_path, mode="r", newline="") as file:
+            return list(csv.DictReader(file))
+
+    def flush(self):
+        if self._file is not None:
+            self._file.flush()
+
+    def tell(self):
+        self.flush()
+        return os.path.getsize(self.file_path)  # Tamanho em bytes
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._writer = None
+
+
+class MemoryLogSink(LogSink):
+    supports_checkpoints = True
+
+    def __init__(self):
+        """
+        Sink que mantém o log em memória (útil em varreduras de parâmetros, sem I/O em disco).
+        """
+        self.rows = []
+
+    def write_rows(self, rows):
+        self.rows.extend(rows)
+
+    def read_rows(self):
+        return [dict(zip(LOG_COLUMNS, row)) for row in self.rows]
+
+    def tell(self):
+        return len(self.rows)
+
+
+class _ColumnEncoder:
+    def __init__(self):
+        """
+        Converte lotes de linhas do log em colunas tipadas (formatos colunares):
+        - event_type, robot e machine viram códigos int32 de um dicionário único por arquivo (-1 = vazio);
+        - start_time e end_time viram int64 em segundos desde a época Unix;
+        - execution_id vira int64 (-1 = sem execução) e data vira float64 (NaN = vazio).
+        """
+        self.categories = {column: [] for column in CATEGORICAL_COLUMNS}
+        self._codes = {column: {} for column in CATEGORICAL_COLUMNS}
+
+    def _encode_categories(self, column, values):
+        codes = self._codes[column]
+        categories = self.categories[column]
+        encoded = []
+        for value in values:
+            if value is None:
+                encoded.append(MISSING_CODE)
+                continue
+            code = codes.get(value)
+            if code is None:
+                code = codes[value] = len(categories)
+                categories.append(value)
+            encoded.append(code)
+        return encoded
+
+    def encode(self, rows):
+        """
+        :param rows: Lista de linhas na ordem de LOG_COLUMNS.
+        :return: Dicionário {coluna: array NumPy}.
+        """
+        import numpy as np
+
+        log_id, execution_id, event_type, robot, machine, start_time, end_time, data = zip(*rows)
+        columns = {
+            "log_id": np.array(log_id, dtype=np.int64 if isinstance(log_id[0], int) else str),
+            "execution_id": np.array([MISSING_CODE if value is None else value for value in execution_id], dtype=np.int64),
+            "start_time": np.array([MISSING_TIME if value is None else (value - UNIX_EPOCH) // ONE_SECOND for value in start_time], dtype=np.int64),
+            "end_time": np.array([MISSING_TIME if value is None else (value - UNIX_EPOCH) // ONE_SECOND for value in end_time], dtype=np.int64),
+            "data": np.array([np.nan if value is None else float(value) for value in data], dtype=np.float64)
+        }
+        for column, values in zip(CATEGORICAL_COLUMNS, (event_type, robot, machine)):
+            columns[column] = np.array(self._encode_categories(column, values), dtype=np.int32)
+        return columns
+
+
+class ColumnarLogSink(LogSink):
+    def __init__(self, file_path):
+        """
+        Sink colunar em NumPy (`.npz`): os lotes já codificados (códigos e inteiros, bem menores que as linhas
+        originais) são anexados a um arquivo temporário por coluna, ao lado do log, e o `.npz` é montado no
+        `close()`, copiando cada coluna em blocos. A memória fica limitada a um lote, mas o disco precisa
+        comportar o log duas vezes até o fechamento. Cada coluna categórica vem acompanhada do array
+        `<coluna>_categories`. Não depende do pyarrow.
+
+        :param file_path: Caminho do arquivo de saída.
+        """
+        self.file_path = file_path
+        self._encoder = _ColumnEncoder()
+        self._parts = None  # coluna -> arquivo temporário com os valores dos lotes, na ordem de escrita
+        self._chunks = []  # [(linhas, {coluna: dtype})] de cada lote gravado
+        self._closed = False
+
+    def write_rows(self, rows):
+        import tempfile
+
+        columns = self._encoder.encode(rows)
+        if self._parts is None:
+            directory = os.path.dirname(os.path.abspath(self.file_path))
+            self._parts = {column: tempfile.TemporaryFile(prefix=".npz_part_", dir=directory) for column in LOG_COLUMNS}
+        for column in LOG_COLUMNS:
+            columns[column].tofile(self._parts[column])
+        self._chunks.append((len(rows), {column: columns[column].dtype for column in LOG_COLUMNS}))
+
+    def _column_blocks(self, column):
+        """
+        Lê de volta, lote a lote, os valores gravados de uma coluna, no tipo final da coluna (o log_id em texto
+        pode ter larguras diferentes entre os lotes).
+
+        :return: (dtype final, gerador de arrays).
+        """
+        import numpy as np
+
+        if not self._chunks:
+            return np.dtype(np.float64), iter(())
+        dtype = np.result_type(*(dtypes[column] for _, dtypes in self._chunks))
+        file = self._parts[column]
+        file.flush()
+
+        def blocks():
+            file.seek(0)
+            for rows, dtypes in self._chunks:
+                yield np.fromfile(file, dtype=dtypes[column], count=rows).astype(dtype, copy=False)
+            file.seek(0, os.SEEK_END)
+        return dtype, blocks()
+
+    def _categories(self):
+        import numpy as np
+
+        return {f"{column}_categories": np.array(self._encoder.categories[column], dtype=str) for column in CATEGORICAL_COLUMNS}
+
+    def read_rows(self):
+        import numpy as np
+
+        arrays = self._categories()
+        for column in LOG_COLUMNS:
+            dtype, blocks = self._column_blocks(column)
+            arrays[column] = np.concatenate(list(blocks)) if self._chunks else np.array([], dtype=dtype)
+        return _decode_arrays(arrays).to_dict("records")
+
+    def close(self):
+        import zipfile
+        import numpy as np
+        from numpy.lib import format as npy_format
+
+        if self._closed:
+            return  # Fechar de novo não pode sobrescrever o arquivo já gravado
+        # Mesmo formato do np.savez_compressed, mas cada coluna é comprimida bloco a bloco
+        total_rows = sum(rows for rows, _ in self._chunks)
+        with zipfile.ZipFile(self.file_path, mode="w", compression=zipfile.ZIP_DEFLATED, allowZip64=True) as archive:
+            for column in LOG_COLUMNS:
+                dtype, blocks = self._column_blocks(column)
+                with archive.open(f"{column}.npy", mode="w", force_zip64=True) as file:
+                    npy_format.write_array_header_1_0(file, {"descr": npy_format.dtype_to_descr(dtype), "fortran_order": False,
+                                                             "shape": (total_rows,)})
+                    for block in blocks:
+                        file.write(block.tobytes())
+            for name, values in self._categories().items():
+                with archive.open(f"{name}.npy", mode="w", force_zip64=True) as file:
+                    np.lib.format.write_array(file, values)
+
+        for part in (self._parts or {}).values():
+            part.close()
+        self._parts = None
+        self._chunks = []
+        self._closed = True
+
+
+class ArrowLogSink(LogSink):
+    def __init__(self, file_path, batch_rows=ARROW_BATCH_ROWS):
+        """
+        Sink colunar via pyarrow, gravado em lotes (memória limitada a `batch_rows` linhas):
+        - `.parquet`: um row group por lote;
+        - `.arrow` / `.feather`: Arrow IPC (arquivo), com deltas de dicionário entre os lotes.
+
+        As colunas categóricas são gravadas como dicionário e as datas como timestamp em segundos (int64).
+
+        :param file_path: Caminho do arquivo de saída.
+        :param batch_rows: Linhas acumuladas antes de gravar um lote.
+        """
+        self.file_path = file_path
+        self.format = "parquet" if file_path.lower().endswith(".parquet") else "arrow"
+        self.batch_rows = batch_rows
+        self._encoder = _ColumnEncoder()
+        self._pending = []
+        self._pending_rows = 0
+        self._writer = None
+
+    def write_rows(self, rows):
+        self._pending.append(self._encoder.encode(rows))
+        self._pending_rows += len(rows)
+        if self._pending_rows >= self.batch_rows:
+            self._write_pending()
+
+    def _write_pending(self):
+        import numpy as np
+        import pyarrow as pa
+
+        if not self._pending:
+            return
+        columns = {column: np.concatenate([chunk[column] for chunk in self._pending]) for column in LOG_COLUMNS}
+        self._pending = []
+        self._pending_rows = 0
+
+        arrays = []
+        for column in LOG_COLUMNS:
+            values = columns[column]
+            if column in CATEGORICAL_COLUMNS:
+                # O dicionário só cresce entre os lotes, então o Arrow IPC pode gravar apenas os deltas
+                dictionary = pa.array(self._encoder.categories[column], type=pa.string())
+                arrays.append(pa.DictionaryArray.from_arrays(pa.array(values, mask=values == MISSING_CODE), dictionary))
+            elif column in ("start_time", "end_time"):
+                arrays.append(pa.array(values, type=pa.timestamp(LOG_TIME_UNIT), mask=values == MISSING_TIME))
+            elif column == "execution_id":
+                arrays.append(pa.array(values, mask=values == MISSING_CODE))
+            elif column == "data":
+                arrays.append(pa.array(values, mask=np.isnan(values)))
+            else:
+                arrays.append(pa.array(values))
+        batch = pa.RecordBatch.from_arrays(arrays, names=LOG_COLUMNS)
+
+        if self._writer is None:
+            if self.format == "parquet":
+                import pyarrow.parquet as pq
+                self._writer = pq.ParquetWriter(self.file_path, batch.schema)
+            else:
+                options = pa.ipc.IpcWriteOptions(compression="zstd", emit_dictionary_deltas=True)
+                self._writer = pa.ipc.new_file(self.file_path, batch.schema, options=options)
+        self._writer.write_batch(batch)
+
+    def read_rows(self):
+        if self._writer is not None or self._pending:
+            raise RuntimeError("O log em Arrow/Parquet só pode ser lido depois de close()")
+        return [row for chunk in read_log_chunks(self.file_path) for row in chunk.to_dict("records")]
+
+    def close(self):
+        self._write_pending()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+def create_log_sink(file_path):
+    """
+    Cria o sink adequado à extensão do arquivo (.csv, .npz, .parquet, .arrow ou .feather).
+    Com `file_path=None` o log fica apenas em memória. Sem o pyarrow instalado, os formatos
+    .parquet/.arrow caem para CSV no mesmo caminho com extensão .csv.
+
+    :param file_path: Caminho do arquivo de log ou None.
+    """
+    if file_path is None:
+        return MemoryLogSink()
+
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension == ".npz":
+        return ColumnarLogSink(file_path)
+    if extension in ARROW_EXTENSIONS:
+        try:
+            import pyarrow  # noqa: F401
+            return ArrowLogSink(file_path)
+        except ImportError:
+            fallback_path = f"{os.path.splitext(file_path)[0]}.csv"
+            warnings.warn(f"pyarrow não está instalado: o log será gravado em CSV ({fallback_path})")
+            return CsvLogSink(fallback_path)
+    return CsvLogSink(file_path)
+
+
+# ============================= LEITURA DOS LOGS EM BLOCOS =============================
+def _decode_arrays(arrays):
+    """
+    Monta um DataFrame a partir das colunas codificadas (formato .npz).
+    """
+    import numpy as np
+    import pandas as pd
+
+    data = {}
+    for column in LOG_COLUMNS:
+        if column not in arrays:
+            continue
+        values = arrays[column]
+        if column in CATEGORICAL_COLUMNS:
+            data[column] = pd.Categorical.from_codes(values, categories=pd.Index(arrays[f"{column}_categories"], dtype=object))
+        elif column in ("start_time", "end_time"):
+            data[column] = pd.to_datetime(np.where(values == MISSING_TIME, np.iinfo(np.int64).min, values * 10**9), unit="ns")
+        elif column == "execution_id":
+            data[column] = np.where(values == MISSING_CODE, np.nan, values)
+        else:
+            data[column] = values
+    return pd.DataFrame(data)
+
+
+def _read_npz_chunks(file_path, columns, chunksize):
+    """
+    Lê um log .npz em blocos: cada coluna é descompactada direto do arquivo `.npy` dentro do zip, `chunksize`
+    linhas por vez, sem carregar a coluna inteira (apenas os dicionários das categorias são lidos de uma vez).
+    """
+    import zipfile
+    import numpy as np
+    from numpy.lib import format as npy_format
+
+    with zipfile.ZipFile(file_path) as archive:
+        categories = {}
+        for column in CATEGORICAL_COLUMNS:
+            if column in columns:
+                with archive.open(f"{column}_categories.npy") as file:
+                    categories[f"{column}_categories"] = npy_format.read_array(file)
+
+        files, dtypes, total = {}, {}, 0
+        try:
+            for column in columns:
+                file = files[column] = archive.open(f"{column}.npy")
+                version = npy_format.read_magic(file)
+                read_header = npy_format.read_array_header_1_0 if version == (1, 0) else npy_format.read_array_header_2_0
+                shape, _, dtypes[column] = read_header(file)
+                total = shape[0]
+
+            for start in range(0, total, chunksize):
+                rows = min(chunksize, total - start)
+                arrays = {column: np.frombuffer(file.read(rows * dtypes[column].itemsize), dtype=dtypes[column])
+                          for column, file in files.items()}
+                arrays.update(categories)
+                yield _decode_arrays(arrays)
+        finally:
+            for file in files.values():
+                file.close()
+
+
+def read_log_chunks(file_path, columns=None, chunksize=LOG_READ_CHUNK_ROWS):
+    """
+    Lê um log em blocos, carregando apenas as colunas pedidas.
+
+    Todos os formatos produzem DataFrames com a mesma semântica: datas em datetime64 (NaT se vazias),
+    execution_id numérico (NaN se vazio), data numérico (NaN se vazio) e event_type/robot/machine como texto
+    ou categoria.
+
+    :param file_path: Log em .csv, .npz, .parquet, .arrow ou .feather.
+    :param columns: Colunas a carregar (padrão: todas).
+    :param chunksize: Linhas por bloco.
+    :return: Gerador de DataFrames.
+    """
+    import pandas as pd
+
+    columns = list(columns or LOG_COLUMNS)
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension == ".npz":
+        yield from _read_npz_chunks(file_path, columns, chunksize)
+        return
+
+    if extension == ".parquet":
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(file_path).iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+        return
+
+    if extension in ARROW_EXTENSIONS:
+        import pyarrow as pa
+
+        with pa.ipc.open_file(file_path) as reader:
+            for index in range(reader.num_record_batches):
+                yield reader.get_batch(index).select(columns).to_pandas()
+        return
+
+    for chunk in pd.read_csv(file_path, usecols=columns, chunksize=chunksize):
+        for column in ("start_time", "end_time"):
+            if column in chunk:
+                chunk[column] = pd.to_datetime(chunk[column], errors="coerce")
+        if "data" in chunk:
+            chunk["data"] = pd.to_numeric(chunk["data"], errors="coerce")
+        yield chunk
+# ======================================================================================
+
+
+class SimulationLog:
+    def __init__(self, file_path="simulation_log.csv", buffer_size=1000, sink=None, log_id_mode="uuid"):
+        """
+        Inicializa o SimulationLog.
+
+        As entradas ficam em um buffer e são enviadas ao sink em lotes de `buffer_size` linhas,
+        em `flush()` ou em `close()`. O log também pode ser usado como context manager.
+
+        :param file_path: Caminho do arquivo onde os logs serão armazenados (o formato segue a extensão).
+        :param buffer_size: Quantidade de entradas acumuladas antes de escrever no sink.
+        :param sink: (Opcional) Instância de LogSink. Se informado, `file_path` é ignorado na criação do sink.
+        :param log_id_mode: 'uuid' (padrão) ou 'sequential' (contador monotônico, bem mais barato).
+        """
+        if log_id_mode not in ("uuid", "sequential"):
+            raise ValueError(f"Modo de log_id {log_id_mode} não reconhecido")
+
+        self.buffer_size = max(1, buffer_size)
+        self.sink = sink if sink is not None else create_log_sink(file_path)
+        self.file_path = getattr(self.sink, "file_path", file_path)  # O sink pode trocar o formato (ex: CSV sem pyarrow)
+        self.log_id_mode = log_id_mode
+        self._buffer = []
+        self.sequence = 0  # Último log_id gerado no modo 'sequential'
+
+    def _next_log_id(self):
+        """
+        Gera o identificador da próxima entrada conforme o `log_id_mode`.
+        """
+        if self.log_id_mode == "sequential":
+            self.sequence += 1
+            return self.sequence
+        return str(uuid.uuid4())  # Gera um identificador único para cada entrada
 
     def log(self, event_type, robot, machine, start_time, end_time, execution_id=None, data= None):
         """
@@ -27,22 +504,58 @@ class SimulationLog:
         :param end_time: Hora de término da execução.
         :param execution_id: (Opcional) ID da execução do ExecutionDataset.
         """
-        log_id = str(uuid.uuid4())  # Gera um identificador único para cada entrada
+        self._buffer.append([self._next_log_id(), execution_id, event_type, robot, machine, start_time, end_time, data])
+        if len(self._buffer) >= self.buffer_size:
+            self._write_buffer()
+
+    def _write_buffer(self):
+        """
+        Envia as entradas bufferizadas ao sink.
+        """
+        if self._buffer:
+            self.sink.write_rows(self._buffer)
+            self._buffer = []
+
+    def flush(self):
+        """
+        Escreve as entradas pendentes e força o sink a persisti-las (checkpoint).
+        """
+        self._write_buffer()
+        self.sink.flush()
+
+    @property
+    def supports_checkpoints(self):
+        """
+        Se o sink permite checkpoints (CSV ou memória; os formatos colunares só são gravados no fechamento).
+        """
+        return self.sink.supports_checkpoints
+
+    def tell(self):
+        """
+        Escreve as entradas pendentes e retorna a posição atual do log no sink (bytes no CSV, linhas em memória).
+        """
+        self.flush()
+        return self.sink.tell()
+
+    def close(self):
+        """
+        Escreve as entradas pendentes e fecha o sink.
+        """
+        self._write_buffer()
+        self.sink.close()
+
+    def __enter__(self):
+        return self
 
-        with open(self.file_path, mode="a", newline="") as file:
-            writer = csv.writer(file)
-            writer.writerow([log_id, execution_id, event_type, robot, machine, start_time, end_time, data])
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
     def get_logs(self):
         """
         Retorna todos os registros do log como uma lista de dicionários.
         """
-        logs = []
-        with open(self.file_path, mode="r") as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                logs.append(row)
-        return logs
+        self._write_buffer()
+        return self.sink.read_rows()
 
     def __repr__(self):
         """
@@ -0,0 +1,294 @@
+import argparse
+import copy
+import csv
+import glob
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from machines import Machines
+from simulation import Simulation, DEFAULT_START_TIME, DEFAULT_FINISH_TIME, TERMINATION_POLICIES
+from simulation_log import SimulationLog
+from event_scheduler import EVENT_SCHEDULER_BACKENDS
+from metrics import summary_path, write_summary
+from scenario_loader import set_cache
+from scenario_cache import load_execution_dataset, load_bp_scheduler, load_dynamic_queue
+from batch_simulation import BatchSimulation
+
+ALGORITHMS = ["FIFO", "PRIORITY", "WEIGHTED_PRIORITY", "BP"]
+SCENARIO_PATTERNS = ["ct_*", os.path.join("ct_*", "*"), os.path.join("especific_tests", "*")]
+RESULT_COLUMNS = ["scenario", "algorithm", "machine_count", "horizon_days", "start_time", "finish_time", "final_clock",
+                  "events_processed", "robot_executions", "dataset_executions", "run_overs", "completion_percentage",
+                  "all_executions_complete", "makespan_minutes", "mean_machine_utilization", "mean_waiting_minutes",
+                  "termination_policies", "max_events", "termination_reason", "wall_time_s"]
+
+
+def discover_scenarios(data_dir="data", default_dynamic_queue_file=None):
+    """
+    Procura os cenários em `data/ct_*` e `data/especific_tests/*`.
+
+    Um cenário é uma pasta com um arquivo `*_execution_dataset.csv`. Os arquivos `*_bp_scheduler.csv`,
+    `*_dynamic_queue.csv` e `*_machines.csv` da mesma pasta são usados quando existirem; sem fila própria,
+    usa-se `default_dynamic_queue_file` (por padrão `data/dynamic_queue.csv`, como no Makefile).
+
+    :param data_dir: Diretório base dos dados.
+    :param default_dynamic_queue_file: Fila dinâmica usada por cenários sem arquivo próprio.
+    :return: Lista de dicionários com name, execution_dataset_file, bp_scheduler_file, dynamic_queue_file e machines_file.
+    """
+    if default_dynamic_queue_file is None:
+        default_dynamic_queue_file = os.path.join(data_dir, "dynamic_queue.csv")
+
+    scenarios = []
+    directories = sorted({path for pattern in SCENARIO_PATTERNS for path in glob.glob(os.path.join(data_dir, pattern))})
+    for directory in directories:
+        for execution_dataset_file in sorted(glob.glob(os.path.join(directory, "*_execution_dataset.csv"))):
+            prefix = execution_dataset_file[:-len("execution_dataset.csv")]
+            bp_scheduler_file = prefix + "bp_scheduler.csv"
+            dynamic_queue_file = prefix + "dynamic_queue.csv"
+            machines_file = prefix + "machines.csv"
+            scenarios.append({
+                "name": os.path.relpath(directory, data_dir).replace(os.sep, "/"),
+                "execution_dataset_file": execution_dataset_file,
+                "bp_scheduler_file": bp_scheduler_file if os.path.exists(bp_scheduler_file) else None,
+                "dynamic_queue_file": dynamic_queue_file if os.path.exists(dynamic_queue_file) else default_dynamic_queue_file,
+                "machines_file": machines_file if os.path.exists(machines_file) else None
+            })
+    return scenarios
+
+
+def build_grid(scenarios, algorithms=ALGORITHMS, machine_counts=(1,), horizons=(None,)):
+    """
+    Monta a grade de casos: cenários x algoritmos x quantidade de máquinas x horizontes de tempo.
+
+    :param machine_counts: Quantidades de máquinas; "auto" usa as máquinas do próprio cenário.
+    :param horizons: Horizontes em dias a partir do início; None usa o fim padrão da simulação.
+    :return: Lista de casos (dicionários) prontos para `run_case`.
+    """
+    cases = []
+    for scenario, algorithm, machine_count, horizon in itertools.product(scenarios, algorithms, machine_counts, horizons):
+        if algorithm == "BP" and not scenario["bp_scheduler_file"]:
+            continue
+        cases.append({"scenario": scenario, "algorithm": algorithm, "machine_count": machine_count, "horizon_days": horizon})
+    return cases
+
+
+def _build_machines(scenario, machine_count):
+    """
+    Cria o pool de máquinas do caso. Com "auto", usa o `*_machines.csv` do cenário ou as máquinas do BP Scheduler.
+    """
+    if machine_count != "auto":
+        return Machines.from_count(int(machine_count))
+    if scenario["machines_file"]:
+        return Machines.from_csv(scenario["machines_file"])
+    scenario_machines = load_bp_scheduler(scenario["bp_scheduler_file"]).get_machine_names() if scenario["bp_scheduler_file"] else None
+    return Machines.from_spec("auto", scenario_machines)
+
+
+def run_case(case, start_time=DEFAULT_START_TIME, log_dir=None, event_backend="heap", termination_policies=(),
+             max_events=None):
+    """
+    Executa um caso da grade e retorna uma linha de resultados.
+
+    :param case: Caso gerado por `build_grid`.
+    :param start_time: Início da simulação.
+    :param log_dir: (Opcional) Diretório para gravar o log completo e o resumo (<log>.summary.json) de cada execução;
+                    sem ele o log fica em memória.
+    :param event_backend: Backend do EventScheduler ('heap' ou 'calendar').
+    :param termination_policies: Critérios de parada antecipada (padrão: nenhum, simula até o fim do horizonte).
+                                 Os critérios ativos ficam registrados na linha de resultado.
+    :param max_events: (Opcional) Limite de eventos processados por execução.
+    """
+    wall_start = time.perf_counter()
+    scenario = case["scenario"]
+    algorithm = case["algorithm"]
+    horizon = case["horizon_days"]
+    finish_time = DEFAULT_FINISH_TIME if horizon is None else start_time + timedelta(days=horizon)
+
+    execution_dataset = copy.deepcopy(load_execution_dataset(scenario["execution_dataset_file"]))
+    if algorithm == "BP":
+        scheduler = copy.deepcopy(load_bp_scheduler(scenario["bp_scheduler_file"]))
+    else:
+        scheduler = copy.deepcopy(load_dynamic_queue(scenario["dynamic_queue_file"], algorithm))
+    machines = _build_machines(scenario, case["machine_count"])
+
+    log_file = _log_file(case, log_dir)
+    with SimulationLog(log_file, buffer_size=10000, log_id_mode="sequential") as simulation_log:
+        result = Simulation(execution_dataset, scheduler, machines, simulation_log, start_time, finish_time, event_backend,
+                            termination_policies=termination_policies, max_events=max_events).run()
+    if log_file:
+        write_summary(result.summary, summary_path(log_file))
+
+    row = result.to_dict()
+    row.update({
+        "scenario": scenario["name"],
+        "algorithm": algorithm,
+        "machine_count": case["machine_count"],
+        "horizon_days": horizon,
+        "wall_time_s": round(time.perf_counter() - wall_start, 4)
+    })
+    return row
+
+
+def _log_file(case, log_dir):
+    """
+    Caminho do log completo de um caso (ou None para manter o log em memória).
+    """
+    if not log_dir:
+        return None
+    run_name = f"{case['scenario']['name']}_{case['algorithm']}_{case['machine_count']}m_{case['horizon_days'] or 'default'}d".replace("/", "_")
+    return os.path.join(log_dir, f"simulation_log_{run_name}.csv")
+
+
+def group_cases(cases):
+    """
+    Agrupa os casos que diferem apenas no algoritmo (mesmo cenário, máquinas e horizonte), para o modo em lote.
+    Um algoritmo repetido na grade vai para outro grupo, já que as variantes de um lote têm nomes únicos.
+    """
+    groups = {}
+    for case in cases:
+        key = (case["scenario"]["name"], case["scenario"]["execution_dataset_file"], case["machine_count"], case["horizon_days"], 0)
+        while any(other["algorithm"] == case["algorithm"] for other in groups.get(key, ())):
+            key = key[:-1] + (key[-1] + 1,)
+        groups.setdefault(key, []).append(case)
+    return list(groups.values())
+
+
+def run_batch_cases(cases, start_time=DEFAULT_START_TIME, log_dir=None, event_backend="heap", termination_policies=(),
+                    max_events=None):
+    """
+    Executa em lote (BatchSimulation) casos do mesmo grupo de `group_cases`: o ExecutionDataset é indexado
+    uma vez e cada algoritmo avança com seu próprio estado.
+
+    :return: Lista de linhas de resultado, na ordem de `cases`. O wall_time_s de cada linha é o tempo do lote
+             dividido pela quantidade de casos.
+    """
+    wall_start = time.perf_counter()
+    scenario = cases[0]["scenario"]
+    horizon = cases[0]["horizon_days"]
+    finish_time = DEFAULT_FINISH_TIME if horizon is None else start_time + timedelta(days=horizon)
+
+    variants = []
+    for case in cases:
+        if case["algorithm"] == "BP":
+            scheduler = copy.deepcopy(load_bp_scheduler(scenario["bp_scheduler_file"]))
+        else:
+            scheduler = copy.deepcopy(load_dynamic_queue(scenario["dynamic_queue_file"], case["algorithm"]))
+        variants.append({
+            "name": case["algorithm"],
+            "scheduler": scheduler,
+            "machines": _build_machines(scenario, case["machine_count"]),
+            "simulation_log": SimulationLog(_log_file(case, log_dir), buffer_size=10000, log_id_mode="sequential")
+        })
+
+    batch = BatchSimulation(load_execution_dataset(scenario["execution_dataset_file"]), variants, start_time, finish_time, event_backend,
+                            termination_policies, max_events)
+    results = batch.run()
+
+    rows = []
+    wall_time = (time.perf_counter() - wall_start) / len(cases)
+    for case, variant in zip(cases, variants):
+        result = results[case["algorithm"]]
+        variant["simulation_log"].close()
+        if result.log_file:
+            write_summary(result.summary, summary_path(result.log_file))
+        row = result.to_dict()
+        row.update({
+            "scenario": scenario["name"],
+            "algorithm": case["algorithm"],
+            "machine_count": case["machine_count"],
+            "horizon_days": horizon,
+            "wall_time_s": round(wall_time, 4)
+        })
+        rows.append(row)
+    return rows
+
+
+def run_sweep(cases, output_file, workers=None, start_time=DEFAULT_START_TIME, log_dir=None, event_backend="heap", batch=False,
+              termination_policies=(), max_events=None):
+    """
+    Executa a grade em um ProcessPoolExecutor e grava cada resultado na tabela assim que fica pronto.
+
+    :param cases: Casos gerados por `build_grid`.
+    :param output_file: CSV de saída com uma linha por execução.
+    :param workers: Número de processos (padrão: número de núcleos disponíveis).
+    :param batch: Se True, cada processo executa em lote os algoritmos de um mesmo cenário (ver `run_batch_cases`).
+    :param termination_policies: Critérios de parada antecipada de cada execução (ver `run_case`).
+    :return: Lista com as linhas de resultado.
+    """
+    workers = workers or os.cpu_count() or 1
+    if os.path.dirname(output_file):
+        os.makedirs(os.path.dirname(output_file), exist_ok=True)
+    if log_dir:
+        os.makedirs(log_dir, exist_ok=True)
+
+    rows = []
+    with open(output_file, mode="w", newline="") as file, ProcessPoolExecutor(max_workers=workers) as executor:
+        writer = csv.DictWriter(file, fieldnames=RESULT_COLUMNS, extrasaction="ignore")
+        writer.writeheader()
+
+        if batch:
+            futures = [executor.submit(run_batch_cases, group, start_time, log_dir, event_backend, termination_policies, max_events)
+                       for group in group_cases(cases)]
+        else:
+            futures = [executor.submit(run_case, case, start_time, log_dir, event_backend, termination_policies, max_events)
+                       for case in cases]
+        for future in as_completed(futures):
+            for row in future.result() if batch else [future.result()]:
+                writer.writerow(row)
+                rows.append(row)
+                print(f"[{len(rows)}/{len(cases)}] {row['scenario']} {row['algorithm']} {row['machine_count']}m "
+                      f"-> {row['completion_percentage']:.2f}% ({row['run_overs']} atropelamentos)")
+            file.flush()
+    return rows
+
+
+def _parse_list(value, cast=str):
+    return [cast(item) for item in value.split(",") if item]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Varredura paralela de cenários e estratégias de escalonamento")
+    parser.add_argument("--data_dir", type=str, default="data", help="Diretório com os cenários ct_* e especific_tests/*.")
+    parser.add_argument("--scenarios", type=str, help="Filtra cenários pelo nome (ex: 'ct_01/01,ct_03/02').")
+    parser.add_argument("--algorithms", type=str, default=",".join(ALGORITHMS), help="Estratégias separadas por vírgula (BP = BP Scheduler).")
+    parser.add_argument("--machines", type=str, default="1", help="Quantidades de máquinas separadas por vírgula ('auto' = máquinas do cenário).")
+    parser.add_argument("--horizons", type=str, default="", help="Horizontes em dias separados por vírgula (vazio = fim padrão).")
+    parser.add_argument("--start_time", type=lambda value: datetime.strptime(value, "%Y-%m-%d %H:%M"), default=DEFAULT_START_TIME)
+    parser.add_argument("--dynamic_queue_file", type=str, help="Fila dinâmica para cenários sem arquivo próprio.")
+    parser.add_argument("--workers", type=int, help="Número de processos (padrão: núcleos disponíveis).")
+    parser.add_argument("--log_dir", type=str, help="Se definido, grava o log completo de cada execução neste diretório.")
+    parser.add_argument("--event_backend", type=str, default="heap", choices=EVENT_SCHEDULER_BACKENDS, help="Estrutura do EventScheduler.")
+    parser.add_argument("--batch", action="store_true",
+                        help="Executa em lote os algoritmos de cada cenário, com o ExecutionDataset indexado uma única vez.")
+    parser.add_argument("--termination", type=str, default="",
+                        help=f"Critérios de parada antecipada separados por vírgula ({', '.join(TERMINATION_POLICIES)}; "
+                             "padrão: nenhum, simula até o fim do horizonte).")
+    parser.add_argument("--max_events", type=int, help="Encerra cada execução após N eventos processados.")
+    parser.add_argument("--no_cache", action="store_true", help="Desativa o cache binário dos arquivos de entrada.")
+    parser.add_argument("--output", type=str, default="logs/sweep_results.csv", help="Tabela de resultados (CSV).")
+    args = parser.parse_args(argv)
+    termination_policies = _parse_list(args.termination)
+    unknown = set(termination_policies) - set(TERMINATION_POLICIES)
+    if unknown:
+        parser.error(f"Critérios de parada não reconhecidos: {', '.join(sorted(unknown))}")
+    if args.no_cache:
+        os.environ["LINCOPT_SCENARIO_CACHE"] = "0"  # Herdado pelos workers
+        set_cache(enabled=False)
+
+    scenarios = discover_scenarios(args.data_dir, args.dynamic_queue_file)
+    if args.scenarios:
+        selected = set(_parse_list(args.scenarios))
+        scenarios = [scenario for scenario in scenarios if scenario["name"] in selected]
+
+    cases = build_grid(scenarios, _parse_list(args.algorithms), _parse_list(args.machines, lambda value: value if value == "auto" else int(value)),
+                       _parse_list(args.horizons, float) or [None])
+    print(f"{len(cases)} casos em {len(scenarios)} cenários.")
+    start = time.perf_counter()
+    run_sweep(cases, args.output, args.workers, args.start_time, args.log_dir, args.event_backend, args.batch,
+              termination_policies, args.max_events)
+    print(f"Varredura concluída em {time.perf_counter() - start:.1f}s. Resultados em: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+import os
+import sys
+
+import pytest
+
+# Os módulos do simulador ficam em src/ e são importados pelo nome (como em src/main.py)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from scenario_loader import set_cache  # noqa: E402
+
+set_cache(enabled=False)  # Os testes gravam CSVs temporários; nada vai para o cache de cenários
+
+
+@pytest.fixture
+def write_csv(tmp_path):
+    """
+    Grava um CSV temporário a partir do cabeçalho e das linhas e retorna o caminho.
+    """
+    def write(name, header, rows):
+        file_path = tmp_path / name
+        lines = [",".join(header)] + [",".join("" if value is None else str(value) for value in row) for row in rows]
+        file_path.write_text("\n".join(lines) + "\n")
+        return str(file_path)
+    return write
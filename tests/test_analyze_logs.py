@@ -0,0 +1,48 @@
+import os
+
+import pytest
+
+from analyze_logs import analyze_logs, merge_results
+from main import main as run_simulation
+from metrics import read_summary, summary_path, write_summary
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+
+@pytest.fixture
+def log_files(tmp_path):
+    # O mesmo nome com extensões diferentes: cada log tem o próprio resumo
+    files = []
+    for extension in (".csv", ".npz"):
+        for algorithm in ("FIFO", "WEIGHTED_PRIORITY"):
+            log_file = str(tmp_path / f"simulation_log_{algorithm}{extension}")
+            run_simulation(["-dq", os.path.join(DATA_DIR, "dynamic_queue.csv"), "-eds", os.path.join(DATA_DIR, "execution_dataset.csv"),
+                            "-sa", algorithm, "-m", "3", "-lf", log_file, "--no_cache"])
+            files.append(log_file)
+    log_file = str(tmp_path / "simulation_log_BP.csv")
+    run_simulation(["-ubp", "-bsf", os.path.join(DATA_DIR, "bp_scheduler.csv"), "-eds", os.path.join(DATA_DIR, "execution_dataset.csv"),
+                    "-m", "auto", "-lf", log_file, "--no_cache"])
+    return files + [log_file]
+
+
+def test_summaries_match_logs(log_files):
+    assert len({summary_path(log_file) for log_file in log_files}) == len(log_files)
+    assert all(os.path.exists(summary_path(log_file)) for log_file in log_files)
+
+    from_summaries = merge_results(analyze_logs(log_files, workers=1, keep_series=False))
+    from_logs = merge_results(analyze_logs(log_files, workers=1, keep_series=False, use_summaries=False))
+
+    assert from_summaries.drop(columns="final_completion_percentage").equals(from_logs.drop(columns="final_completion_percentage"))
+    assert list(from_summaries["final_completion_percentage"]) == pytest.approx(list(from_logs["final_completion_percentage"]))
+
+
+def test_stale_summary_is_ignored(log_files):
+    log_file = log_files[0]
+    summary = read_summary(summary_path(log_file))
+    summary["run_overs"] += 1000
+    write_summary(summary, summary_path(log_file))
+    assert analyze_logs([log_file], workers=1, keep_series=False)[0]["total_run_overs"] == summary["run_overs"]
+
+    # Um resumo mais antigo que o log (ex: log regravado sem resumo) não é usado
+    os.utime(summary_path(log_file), (0, 0))
+    assert analyze_logs([log_file], workers=1, keep_series=False)[0]["total_run_overs"] == summary["run_overs"] - 1000
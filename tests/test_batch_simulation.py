@@ -0,0 +1,32 @@
+import random
+
+import pytest
+
+from batch_simulation import BatchState, DatasetVariant
+from execution_dataset import ExecutionDataset
+from test_execution_dataset import HEADER, _random_rows
+
+VARIANTS = 3
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_variants_match_independent_datasets(write_csv, seed):
+    rng = random.Random(seed)
+    file_path = write_csv("execution_dataset.csv", HEADER, _random_rows(rng, rng.randint(1, 40)))
+    shared = ExecutionDataset(file_path)
+    state = BatchState(shared.index, VARIANTS)
+    variants = [DatasetVariant(shared.index, state, variant) for variant in range(VARIANTS)]
+    datasets = [ExecutionDataset(file_path) for _ in range(VARIANTS)]
+    execution_ids = [record.execution_id for record in shared.executions]
+
+    # Cada variante conclui execuções diferentes; as demais não podem ser afetadas
+    for variant, dataset in zip(variants, datasets):
+        for execution_id in rng.sample(execution_ids, rng.randint(0, len(execution_ids))):
+            assert variant.mark_execution_complete(execution_id) == dataset.mark_execution_complete(execution_id)
+
+    for variant, dataset in zip(variants, datasets):
+        assert variant.get_pending_executions() == dataset.get_pending_executions()
+        assert variant.get_progress_by_window() == dataset.get_progress_by_window()
+        assert variant.get_progress_by_robot() == dataset.get_progress_by_robot()
+        assert variant.get_completion_percentage() == pytest.approx(dataset.get_completion_percentage())
+        assert variant.all_executions_complete() == dataset.all_executions_complete()
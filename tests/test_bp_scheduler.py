@@ -0,0 +1,84 @@
+import os
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from bp_scheduler import BPScheduler
+from execution_dataset import ExecutionDataset
+from machines import Machines
+from simulation import Simulation
+from simulation_log import SimulationLog
+
+START_TIME = datetime(2025, 1, 1, 8, 0)
+ROWS = 60
+
+
+def _schedule_file(write_csv, seed, shuffled=True):
+    rng = random.Random(seed)
+    # Poucos horários distintos: muitos empates, que precisam manter a ordem do arquivo
+    times = [START_TIME + timedelta(minutes=rng.randrange(0, 48 * 60, 15)) for _ in range(ROWS)]
+    if not shuffled:
+        times.sort()
+    rows = [(f"R{rng.randint(1, 4)}", f"M{rng.randint(1, 3)}", start.strftime("%Y-%m-%d"), start.strftime("%H:%M")) for start in times]
+    return write_csv("bp_scheduler.csv", ["robot", "machine", "date", "start_time"], rows)
+
+
+def _dataset_file(write_csv):
+    rows = [(number, f"R{number % 4 + 1}", number % 3 + 1, 20, None, None, False) for number in range(1, 41)]
+    return write_csv("execution_dataset.csv", ["execution_id", "robot", "items", "time_per_item", "start_window", "end_window", "completed"], rows)
+
+
+def _executions(scheduler):
+    return [(execution.start_time, execution.robot.name, execution.machine_name) for execution in scheduler.iter_executions()]
+
+
+@pytest.mark.parametrize("shuffled", [True, False])
+@pytest.mark.parametrize("chunk_size", [1, 7, 16, ROWS + 1])
+@pytest.mark.parametrize("seed", range(5))
+def test_streaming_matches_loaded_schedule(write_csv, seed, chunk_size, shuffled):
+    file_path = _schedule_file(write_csv, seed, shuffled)
+    loaded = BPScheduler(file_path)
+    streaming = BPScheduler(file_path, streaming=True, chunk_size=chunk_size)
+
+    assert _executions(streaming) == _executions(loaded)
+    assert _executions(streaming) == _executions(loaded)  # Pode ser percorrido de novo (retomada de checkpoint)
+    assert streaming.get_machine_names() == loaded.get_machine_names()
+    streaming.close()
+
+
+def test_close_removes_sorted_runs(write_csv):
+    scheduler = BPScheduler(_schedule_file(write_csv, 0), streaming=True, chunk_size=7)
+    run_dir = scheduler._run_dir.name
+    assert len(os.listdir(run_dir)) == -(-ROWS // 7)
+
+    scheduler.close()
+    scheduler.close()
+
+    assert not os.path.exists(run_dir)
+
+
+@pytest.mark.parametrize("lookahead_minutes", [0, 1, 15, 600])
+@pytest.mark.parametrize("seed", range(3))
+def test_lookahead_with_overlapping_runs(write_csv, seed, lookahead_minutes):
+    schedule_file = _schedule_file(write_csv, seed)
+    dataset_file = _dataset_file(write_csv)
+
+    def simulation(scheduler):
+        return Simulation(ExecutionDataset(dataset_file), scheduler, Machines.from_count(3), SimulationLog(None, log_id_mode="sequential"),
+                          START_TIME, START_TIME + timedelta(days=3), lookahead_minutes=lookahead_minutes)
+
+    expected = simulation(BPScheduler(schedule_file))
+    expected.run()
+
+    # Trechos de 7 linhas de um arquivo embaralhado se sobrepõem no tempo: todos participam da intercalação
+    scheduler = BPScheduler(schedule_file, streaming=True, chunk_size=7)
+    streamed = simulation(scheduler)
+    streamed.schedule_initial_events()
+    while streamed.step() is not None:
+        # Nenhuma execução programada ainda não inserida pode ser anterior ao evento processado
+        assert streamed._stream_head is None or streamed.event_scheduler.current_tick <= streamed._stream_head_tick
+    scheduler.close()
+
+    assert streamed.simulation_log.get_logs() == expected.simulation_log.get_logs()
+    assert any(row["event_type"] == "run_over" for row in expected.simulation_log.get_logs())
@@ -0,0 +1,65 @@
+import os
+
+import pytest
+
+from main import main as run_main
+from metrics import read_summary, summary_path
+from simulation import DEFAULT_START_TIME
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+SCENARIOS = {
+    "dynamic_queue": ["-dq", os.path.join(DATA_DIR, "dynamic_queue.csv"), "-eds", os.path.join(DATA_DIR, "ct_04", "ct_4_execution_dataset.csv"),
+                      "-sa", "WEIGHTED_PRIORITY", "-m", "2"],
+    "bp_stream": ["-ubp", "-bsf", os.path.join(DATA_DIR, "ct_04", "ct_4_bp_scheduler.csv"),
+                  "-eds", os.path.join(DATA_DIR, "ct_04", "ct_4_execution_dataset.csv"), "--bp_stream", "--bp_lookahead", "60"],
+}
+
+
+def _run(argv):
+    return run_main(argv + ["--log_id_mode", "sequential", "--no_cache"])
+
+
+@pytest.mark.parametrize("scenario", SCENARIOS)
+def test_resumed_log_matches_full_run(tmp_path, scenario):
+    full_log = str(tmp_path / "full.csv")
+    _run(SCENARIOS[scenario] + ["-lf", full_log])
+
+    # Interrompida por --max_events, a execução grava o checkpoint no ponto de parada
+    log_file = str(tmp_path / "resumed.csv")
+    checkpoint_file = str(tmp_path / "checkpoint.pkl.gz")
+    _run(SCENARIOS[scenario] + ["-lf", log_file, "--checkpoint_minutes", "1440", "--checkpoint_file", checkpoint_file,
+                                "--max_events", "3000"])
+    assert os.path.getsize(log_file) < os.path.getsize(full_log)
+
+    # Sem --max_events a retomada manteria o limite (contado a partir do checkpoint)
+    run_main(["--resume", checkpoint_file, "--max_events", "100000000", "--no_cache"])
+
+    with open(full_log, "rb") as full, open(log_file, "rb") as resumed:
+        assert resumed.read() == full.read()
+    full_summary, resumed_summary = read_summary(summary_path(full_log)), read_summary(summary_path(log_file))
+    assert resumed_summary.pop("max_events") == 100000000
+    full_summary.pop("max_events")
+    assert resumed_summary == full_summary
+
+
+@pytest.mark.parametrize("extension", [".npz", ".parquet", ".arrow"])
+def test_checkpoints_require_csv_log(tmp_path, extension, capsys):
+    with pytest.raises(SystemExit):
+        run_main(SCENARIOS["dynamic_queue"] + ["-lf", str(tmp_path / f"log{extension}"), "--checkpoint_minutes", "1440"])
+    assert "--checkpoint_minutes" in capsys.readouterr().err
+    assert not os.listdir(tmp_path)
+
+
+def test_enable_checkpoints_rejects_columnar_log(tmp_path):
+    from execution_dataset import ExecutionDataset
+    from dynamic_queue import DynamicQueue
+    from machines import Machines
+    from simulation import Simulation
+    from simulation_log import SimulationLog
+
+    simulation = Simulation(ExecutionDataset(os.path.join(DATA_DIR, "execution_dataset.csv")),
+                            DynamicQueue(os.path.join(DATA_DIR, "dynamic_queue.csv")), Machines.from_count(1),
+                            SimulationLog(str(tmp_path / "log.npz")), DEFAULT_START_TIME)
+    with pytest.raises(ValueError):
+        simulation.enable_checkpoints(str(tmp_path / "checkpoint.pkl.gz"), 60)
+    simulation.simulation_log.close()
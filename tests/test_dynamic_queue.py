@@ -0,0 +1,130 @@
+import random
+
+import pytest
+
+from dynamic_queue import DynamicQueue
+from queue_sorting import QueueSortingAlgorithm
+from robot import Robot
+
+STRATEGIES = ["FIFO", "PRIORITY", "WEIGHTED_PRIORITY"]
+
+
+class ListQueue:
+    """
+    Fila de referência: a implementação original em lista, reordenada com QueueSortingAlgorithm.sort
+    a cada inserção e retirando sempre o primeiro robô.
+    """
+
+    def __init__(self, robots, strategy):
+        self.sorter = QueueSortingAlgorithm(strategy)
+        self.robots, self.data = self.sorter.sort(list(robots), {})
+
+    def add_robot(self, robot):
+        self.robots.append(robot)
+        self.robots, self.data = self.sorter.sort(self.robots, self.data)
+
+    def get_next_robot(self):
+        return self.robots.pop(0) if self.robots else None
+
+
+def _queue_file(write_csv, robots):
+    return write_csv("dynamic_queue.csv", ["queue_position", "robot", "priority"],
+                     [(position, name, priority) for position, (name, priority) in enumerate(robots, start=1)])
+
+
+def _random_robots(rng, count):
+    # Poucas prioridades para forçar empates
+    return [(f"R{number}", rng.choice((1, 2, 3))) for number in range(1, count + 1)]
+
+
+def _names(robots):
+    return [robot.name for robot in robots]
+
+
+@pytest.mark.parametrize("strategy", STRATEGIES)
+def test_initial_order_matches_sort(write_csv, strategy):
+    robots = [("R1", 2), ("R2", 1), ("R3", 2), ("R4", 3), ("R5", 1), ("R6", 2)]
+    dynamic_queue = DynamicQueue(_queue_file(write_csv, robots), sorting_algorithm=strategy)
+    reference = ListQueue([Robot(name, priority) for name, priority in robots], strategy)
+
+    assert _names(dynamic_queue.robots) == _names(reference.robots)
+
+
+@pytest.mark.parametrize("strategy", ["FIFO", "PRIORITY"])
+def test_ties_keep_arrival_order(write_csv, strategy):
+    robots = [("R1", 1), ("R2", 1), ("R3", 1), ("R4", 1)]
+    dynamic_queue = DynamicQueue(_queue_file(write_csv, robots), sorting_algorithm=strategy)
+
+    first = dynamic_queue.get_next_robot()
+    dynamic_queue.add_robot(first)
+
+    assert _names(dynamic_queue.robots) == ["R2", "R3", "R4", "R1"]
+
+
+@pytest.mark.parametrize("strategy", STRATEGIES)
+@pytest.mark.parametrize("seed", range(20))
+def test_dispatch_order_matches_sort(write_csv, strategy, seed):
+    rng = random.Random(seed)
+    robots = _random_robots(rng, rng.randint(1, 12))
+    dynamic_queue = DynamicQueue(_queue_file(write_csv, robots), sorting_algorithm=strategy)
+    reference = ListQueue([Robot(name, priority) for name, priority in robots], strategy)
+    running = []
+
+    for _ in range(300):
+        # Como na simulação: robôs saem da fila para executar e voltam ao terminar
+        if running and (rng.random() < 0.5 or not dynamic_queue.get_queue_size()):
+            robot = running.pop(rng.randrange(len(running)))
+            dynamic_queue.add_robot(robot)
+            reference.add_robot(robot)
+        else:
+            robot = dynamic_queue.get_next_robot()
+            expected = reference.get_next_robot()
+            assert (robot and robot.name) == (expected and expected.name)
+            if robot is not None:
+                running.append(robot)
+
+        assert _names(dynamic_queue.robots) == _names(reference.robots)
+        assert dynamic_queue.get_queue_size() == len(reference.robots)
+        if strategy == "WEIGHTED_PRIORITY":
+            assert dynamic_queue.data == reference.data
+
+
+@pytest.mark.parametrize("strategy", STRATEGIES)
+def test_change_sorting_algorithm_keeps_robots(write_csv, strategy):
+    rng = random.Random(7)
+    dynamic_queue = DynamicQueue(_queue_file(write_csv, _random_robots(rng, 8)), sorting_algorithm="WEIGHTED_PRIORITY")
+    for _ in range(5):
+        dynamic_queue.add_robot(dynamic_queue.get_next_robot())
+    robots = _names(dynamic_queue.robots)
+
+    dynamic_queue.change_sorting_algorithm(strategy)
+
+    assert sorted(_names(dynamic_queue.robots)) == sorted(robots)
+    if strategy == "WEIGHTED_PRIORITY":
+        assert _names(dynamic_queue.robots) == robots
+
+
+@pytest.mark.parametrize("strategy", STRATEGIES)
+@pytest.mark.parametrize("seed", range(10))
+def test_requeue_restores_queue(write_csv, strategy, seed):
+    rng = random.Random(seed)
+    dynamic_queue = DynamicQueue(_queue_file(write_csv, _random_robots(rng, 8)), sorting_algorithm=strategy)
+    for _ in range(6):
+        dynamic_queue.add_robot(dynamic_queue.get_next_robot())
+    robots, data = _names(dynamic_queue.robots), dict(dynamic_queue.data)
+
+    # Robôs retirados sem máquina compatível voltam para a mesma posição, com o mesmo peso
+    skipped = [dynamic_queue.get_next_robot() for _ in range(rng.randint(1, 8))]
+    for robot in reversed(skipped):
+        dynamic_queue.requeue(robot)
+
+    assert _names(dynamic_queue.robots) == robots
+    assert dynamic_queue.data == data
+
+
+@pytest.mark.parametrize("strategy", STRATEGIES)
+def test_duplicate_robots_are_rejected(write_csv, strategy):
+    # `requeue` e os pesos são indexados pelo nome: um robô repetido não pode entrar na fila inicial
+    file_path = _queue_file(write_csv, [("R1", 1), ("R2", 2), ("R1", 3)])
+    with pytest.raises(ValueError, match="R1"):
+        DynamicQueue(file_path, sorting_algorithm=strategy)
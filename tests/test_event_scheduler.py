@@ -0,0 +1,65 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from event_scheduler import CalendarEventScheduler, Event, EventScheduler, TICKS_PER_MINUTE
+from robot import Robot
+
+START_TIME = datetime(2025, 1, 1)
+EVENT_TYPES = ["start_execution", "end_execution"]
+
+
+def _event(rng, current_tick, number):
+    # Muitos eventos no mesmo tick (empates de tipo e de sequência) e alguns a vários baldes de distância
+    offset = rng.choice([0, 0, 1, 59, 60, rng.randint(0, 600), rng.randint(0, 5 * 24 * 60 * TICKS_PER_MINUTE)])
+    tick = current_tick + offset
+    event = Event(START_TIME + timedelta(seconds=tick), rng.choice(EVENT_TYPES), Robot(f"R{number}"), "M1")
+    if rng.random() < 0.5:
+        event.tick = tick  # Como na simulação, parte dos eventos chega com o tick já calculado
+    return event
+
+
+def _entry(event):
+    return (event.tick, event.event_type, event.robot.name) if event is not None else None
+
+
+@pytest.mark.parametrize("bucket_minutes", [1, 0.5, 15])
+@pytest.mark.parametrize("seed", range(20))
+def test_calendar_matches_heap(seed, bucket_minutes):
+    rng = random.Random(seed)
+    heap = EventScheduler(START_TIME)
+    calendar = CalendarEventScheduler(START_TIME, bucket_minutes=bucket_minutes)
+
+    for number in range(2000):
+        if rng.random() < 0.55:
+            # Novos eventos nunca ficam antes do clock (a simulação só agenda no presente ou no futuro)
+            event = _event(rng, heap.current_tick, number)
+            heap.add_event(event)
+            calendar.add_event(Event(event.event_time, event.event_type, event.robot, event.machine_name, event.tick))
+        else:
+            assert _entry(calendar.get_next_event()) == _entry(heap.get_next_event())
+            assert (calendar.current_tick, calendar.current_time) == (heap.current_tick, heap.current_time)
+        assert calendar.peek_tick() == heap.peek_tick()
+        assert len(calendar) == len(heap)
+        assert calendar.has_pending_events() == heap.has_pending_events()
+
+    while heap.has_pending_events():
+        assert _entry(calendar.get_next_event()) == _entry(heap.get_next_event())
+    assert calendar.get_next_event() is None
+
+
+def test_start_before_end_at_same_tick():
+    for scheduler in (EventScheduler(START_TIME), CalendarEventScheduler(START_TIME)):
+        end = Event(START_TIME, "end_execution", Robot("R1"), "M1")
+        start = Event(START_TIME, "start_execution", Robot("R2"), "M1")
+        later = Event(START_TIME + timedelta(days=2), "start_execution", Robot("R3"), "M1")
+        for event in (later, end, start):
+            scheduler.add_event(event)
+
+        assert [scheduler.get_next_event() for _ in range(3)] == [start, end, later]
+
+
+def test_calendar_shares_base_setup():
+    calendar = CalendarEventScheduler(START_TIME)
+    assert vars(EventScheduler(START_TIME)).keys() <= set(dir(calendar))
@@ -0,0 +1,138 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from execution_dataset import ExecutionDataset
+
+BASE_TIME = datetime(2025, 1, 1)
+HEADER = ["execution_id", "robot", "items", "time_per_item", "start_window", "end_window", "completed"]
+
+
+def _random_rows(rng, count):
+    rows = []
+    for execution_id in range(1, count + 1):
+        if rng.random() < 0.8:
+            start_window = BASE_TIME + timedelta(minutes=rng.randint(0, 100))
+            end_window = start_window + timedelta(minutes=rng.randint(0, 40))
+        else:
+            start_window = end_window = None
+        rows.append((execution_id, f"R{rng.randint(1, 3)}", rng.randint(1, 5), rng.randint(1, 10),
+                     start_window and start_window.strftime("%Y-%m-%d %H:%M"),
+                     end_window and end_window.strftime("%Y-%m-%d %H:%M"), rng.random() < 0.2))
+    return rows
+
+
+class BruteForce:
+    """
+    Referência por varredura completa das execuções (o comportamento anterior ao índice).
+    """
+
+    def __init__(self, executions):
+        self.executions = executions
+        self.completed = {record.execution_id for record in executions if record.completed}
+
+    def pending(self, robot=None):
+        return [record for record in self.executions
+                if record.execution_id not in self.completed and (robot is None or record.robot == robot)]
+
+    def covering(self, robot, execution_time):
+        pending = self.pending(robot)
+        covering = [record for record in pending if record.has_window() and record.start_window <= execution_time <= record.end_window]
+        if covering:
+            return min(covering, key=lambda record: (record.start_window, self.executions.index(record)))
+        return next((record for record in pending if not record.has_window()), None)
+
+    def expiring_before(self, execution_time, robot=None):
+        return [record for record in self.pending(robot) if record.has_window() and record.end_window < execution_time]
+
+    def progress(self, records):
+        completed = [record for record in records if record.execution_id in self.completed]
+        total_work = sum(record.work for record in records)
+        completed_work = sum(record.work for record in completed)
+        return {
+            "completed_work": completed_work,
+            "remaining_work": total_work - completed_work,
+            "total_work": total_work,
+            "completed_executions": len(completed),
+            "total_executions": len(records),
+            "completion_percentage": completed_work / total_work * 100 if total_work else 0.0
+        }
+
+
+def _execution_id(execution):
+    return execution and execution["execution_id"]
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_index_matches_brute_force(write_csv, seed):
+    rng = random.Random(seed)
+    execution_dataset = ExecutionDataset(write_csv("execution_dataset.csv", HEADER, _random_rows(rng, rng.randint(0, 60))))
+    reference = BruteForce(execution_dataset.executions)
+
+    for _ in range(150):
+        robot = f"R{rng.randint(1, 4)}"
+        execution_time = BASE_TIME + timedelta(minutes=rng.randint(-5, 150))
+
+        # first_covering (e o cursor das execuções sem janela)
+        execution = execution_dataset.get_execution_by_robot_and_time(robot, execution_time)
+        expected = reference.covering(robot, execution_time)
+        assert _execution_id(execution) == (expected and expected.execution_id)
+
+        # next_expiring: pendentes por robô em ordem de end_window e de todos os robôs ordenados por end_window
+        expiring = execution_dataset.get_executions_expiring_before(execution_time, robot)
+        expected = sorted(reference.expiring_before(execution_time, robot),
+                          key=lambda record: (record.end_window, record.start_window, reference.executions.index(record)))
+        assert [item["execution_id"] for item in expiring] == [record.execution_id for record in expected]
+        expiring = execution_dataset.get_executions_expiring_before(execution_time)
+        assert sorted(item["execution_id"] for item in expiring) == sorted(record.execution_id for record in reference.expiring_before(execution_time))
+        assert [item["end_window"] for item in expiring] == sorted(item["end_window"] for item in expiring)
+
+        satisfiable = any(not record.has_window() or record.end_window >= execution_time for record in reference.pending())
+        assert execution_dataset.has_satisfiable_executions(execution_time) == satisfiable
+
+        # Conclusões: da execução encontrada ou de uma qualquer (inclusive já concluída ou de outro robô)
+        if execution and rng.random() < 0.5:
+            execution_id = execution["execution_id"]
+        elif execution_dataset.executions and rng.random() < 0.3:
+            execution_id = rng.choice(execution_dataset.executions).execution_id
+        else:
+            continue
+        newly_completed = execution_id not in reference.completed
+        assert execution_dataset.mark_execution_complete(execution_id) == newly_completed
+        reference.completed.add(execution_id)
+
+        # Contadores de progresso
+        executions = reference.executions
+        overall = reference.progress(executions)
+        assert execution_dataset.get_completed_work() == overall["completed_work"]
+        assert execution_dataset.get_remaining_work() == overall["remaining_work"]
+        assert execution_dataset.get_completion_percentage() == pytest.approx(overall["completion_percentage"])
+        assert execution_dataset.all_executions_complete() == (overall["completed_executions"] == len(executions))
+        assert execution_dataset.get_progress_by_robot() == {
+            robot: reference.progress([record for record in executions if record.robot == robot]) for robot in {record.robot for record in executions}}
+        windows = {(record.start_window, record.end_window) if record.has_window() else (None, None) for record in executions}
+        assert execution_dataset.get_progress_by_window() == {
+            window: reference.progress([record for record in executions
+                                        if ((record.start_window, record.end_window) if record.has_window() else (None, None)) == window])
+            for window in windows}
+
+
+def test_covering_prefers_earliest_start_then_file_order(write_csv):
+    rows = [
+        (1, "R1", 1, 1, "2025-01-01 02:00", "2025-01-01 05:00", False),
+        (2, "R1", 1, 1, "2025-01-01 01:00", "2025-01-01 03:00", False),
+        (3, "R1", 1, 1, "2025-01-01 01:00", "2025-01-01 04:00", False),
+        (4, "R1", 1, 1, None, None, False),
+    ]
+    execution_dataset = ExecutionDataset(write_csv("execution_dataset.csv", HEADER, rows))
+    at = datetime(2025, 1, 1, 2, 30)
+
+    assert execution_dataset.get_execution_by_robot_and_time("R1", at)["execution_id"] == 2
+    execution_dataset.mark_execution_complete(2)
+    assert execution_dataset.get_execution_by_robot_and_time("R1", at)["execution_id"] == 3
+    execution_dataset.mark_execution_complete(3)
+    assert execution_dataset.get_execution_by_robot_and_time("R1", at)["execution_id"] == 1
+    execution_dataset.mark_execution_complete(1)
+    assert execution_dataset.get_execution_by_robot_and_time("R1", at)["execution_id"] == 4
+    assert execution_dataset.get_execution_by_robot_and_time("R2", at) is None
@@ -0,0 +1,96 @@
+import random
+
+import pytest
+
+from machines import Machines
+
+
+@pytest.mark.parametrize("spec", ["0", "", " , ", "auto"])
+def test_empty_spec_is_rejected(spec):
+    with pytest.raises(ValueError):
+        Machines.from_spec(spec)
+
+
+def test_empty_pool_is_rejected(write_csv):
+    with pytest.raises(ValueError):
+        Machines([])
+    with pytest.raises(ValueError):
+        Machines.from_count(0)
+    with pytest.raises(ValueError):
+        Machines.from_csv(write_csv("machines.csv", ["machine", "robots"], []))
+
+
+def test_from_spec_builds_the_pool(write_csv):
+    assert list(Machines.from_spec("3").machines) == ["M1", "M2", "M3"]
+    assert list(Machines.from_spec("B, A,B").machines) == ["B", "A"]
+    assert list(Machines.from_spec("auto", ["X", "Y"]).machines) == ["X", "Y"]
+    file_path = write_csv("machines.csv", ["machine", "robots"], [["M1", "R1;R2"], ["M2", ""]])
+    machines = Machines.from_spec(file_path)
+    assert machines.machines["M1"].capabilities == {"R1", "R2"}
+    assert machines.machines["M2"].capabilities is None
+
+
+def test_capability_matching():
+    machines = Machines(["M1", "M2", "M3"], {"M1": ["R1"], "M2": ["R2", "R3"]})
+    assert machines.machine_accepts("M1", "R1")
+    assert not machines.machine_accepts("M1", "R2")
+    assert machines.machine_accepts("M3", "R9")
+    assert not machines.machine_accepts("M9", "R1")
+
+    assert machines.get_next_idle_machine("R1") == "M1"
+    assert machines.get_next_idle_machine("R3") == "M2"
+    assert machines.get_next_idle_machine("R9") == "M3"
+    assert machines.get_next_idle_machine() == "M1"
+
+    machines.make_machine_busy("M3")
+    assert machines.get_next_idle_machine("R9") is None
+    assert machines.get_next_idle_machine("R2") == "M2"
+    machines.make_machine_busy("M2")
+    assert machines.get_next_idle_machine("R2") is None
+    assert machines.get_next_idle_machine("R1") == "M1"
+
+    machines.make_machine_idle("M3")
+    assert machines.get_next_idle_machine("R2") == "M3"
+    assert machines.get_idle_count() == 2
+
+
+def test_preferred_machine():
+    machines = Machines(["M1", "M2", "M3"], {"M2": ["R1"]})
+    # A preferida vence a ordem de declaração se estiver ociosa e aceitar o robô
+    assert machines.get_next_idle_machine("R1", preferred="M3") == "M3"
+    assert machines.get_next_idle_machine("R1", preferred="M2") == "M2"
+    assert machines.get_next_idle_machine(preferred="M2") == "M2"
+    # Caso contrário, segue a ordem de declaração
+    assert machines.get_next_idle_machine("R2", preferred="M2") == "M1"
+    assert machines.get_next_idle_machine("R1", preferred="M9") == "M1"
+    machines.make_machine_busy("M3")
+    assert machines.get_next_idle_machine("R1", preferred="M3") == "M1"
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_next_idle_machine_matches_a_linear_scan(seed):
+    rng = random.Random(seed)
+    names = [f"M{number}" for number in range(rng.randint(1, 12))]
+    robots = [f"R{number}" for number in range(4)]
+    capabilities = {name: rng.sample(robots, rng.randint(1, 3)) for name in names if rng.random() < 0.5}
+    machines = Machines(names, capabilities)
+    busy = set()
+
+    for _ in range(200):
+        name = rng.choice(names)
+        if name in busy:
+            machines.make_machine_idle(name)
+            busy.discard(name)
+        else:
+            machines.make_machine_busy(name)
+            busy.add(name)
+
+        robot_name = rng.choice(robots + [None])
+        preferred = rng.choice(names + [None])
+        expected = next((name for name in names if name not in busy and
+                         (robot_name is None or name not in capabilities or robot_name in capabilities[name])), None)
+        if preferred is not None and preferred not in busy and \
+                (robot_name is None or preferred not in capabilities or robot_name in capabilities[preferred]):
+            expected = preferred
+        assert machines.get_next_idle_machine(robot_name, preferred=preferred) == expected
+        assert machines.get_idle_count() == len(names) - len(busy)
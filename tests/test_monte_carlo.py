@@ -0,0 +1,96 @@
+import os
+from datetime import timedelta
+
+import numpy as np
+import pytest
+
+import monte_carlo
+from monte_carlo import DURATION_DISTRIBUTIONS, DurationSampler, run_replication, sample
+from simulation import DEFAULT_START_TIME
+
+ALGORITHMS = ["FIFO", "PRIORITY", "WEIGHTED_PRIORITY", "BP"]
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.mark.parametrize("cv", [0.0, -1.0, 0.3])
+def test_sample_rejects_unknown_distribution(cv):
+    # Mesmo sem variação (cv <= 0) o nome precisa ser validado
+    with pytest.raises(ValueError):
+        sample(np.random.default_rng(0), [1.0, 2.0], "lognorml", cv)
+
+
+@pytest.mark.parametrize("distribution", DURATION_DISTRIBUTIONS)
+def test_sample_without_variation_returns_mean(distribution):
+    mean = [0.0, 1.5, 3.0]
+    assert sample(np.random.default_rng(0), mean, distribution, 0.0).tolist() == mean
+
+
+def _config(**overrides):
+    config = {
+        "execution_dataset_file": "data/execution_dataset.csv",
+        "dynamic_queue_file": "data/dynamic_queue.csv",
+        "bp_scheduler_file": "data/bp_scheduler.csv",
+        "algorithms": ALGORITHMS,
+        "machines": "M1,M2",
+        "start_time": DEFAULT_START_TIME,
+        "finish_time": DEFAULT_START_TIME + timedelta(hours=8),
+        "seed": 42,
+        "duration_distribution": "lognormal",
+        "duration_cv": 0.3,
+        "items_distribution": "poisson",
+        "confidence": 0.95
+    }
+    config.update(overrides)
+    return config
+
+
+@pytest.fixture
+def draws(monkeypatch):
+    """
+    Substitui o DurationSampler do Monte Carlo por um que registra os sorteios entregues a cada estratégia:
+    duração por execution_id e, para execuções fora do dataset, a k-ésima duração de cada robô.
+    """
+    recorded = []
+
+    class RecordingSampler(DurationSampler):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.draws = {}
+            self.fallback_counts = {}
+            recorded.append(self.draws)
+
+        def __call__(self, execution, robot_name):
+            duration = super().__call__(execution, robot_name)
+            if execution is None:
+                count = self.fallback_counts[robot_name] = self.fallback_counts.get(robot_name, 0) + 1
+                self.draws[("fallback", robot_name, count)] = duration
+            else:
+                self.draws[execution["execution_id"]] = duration
+            return duration
+
+    monkeypatch.chdir(REPO_DIR)
+    monkeypatch.setattr(monte_carlo, "DurationSampler", RecordingSampler)
+    return recorded
+
+
+def test_policies_share_random_numbers(draws):
+    run_replication(_config(), replication=3)
+    assert len(draws) == len(ALGORITHMS)
+
+    # Toda execução sorteada em mais de uma estratégia recebe a mesma duração em todas elas
+    shared = 0
+    for key in set().union(*draws):
+        values = {policy_draws[key] for policy_draws in draws if key in policy_draws}
+        assert len(values) == 1, key
+        shared += sum(key in policy_draws for policy_draws in draws) > 1
+    assert shared > 0
+
+
+def test_replications_use_independent_streams(draws):
+    run_replication(_config(algorithms=["FIFO"]), replication=0)
+    run_replication(_config(algorithms=["FIFO"]), replication=1)
+    run_replication(_config(algorithms=["FIFO"]), replication=0)
+    first, second, repeated = draws
+    assert first == repeated
+    common = set(first) & set(second)
+    assert common and any(first[key] != second[key] for key in common)
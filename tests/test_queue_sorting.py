@@ -0,0 +1,100 @@
+import random
+
+import pytest
+
+from queue_sorting import QueueSortingAlgorithm, WeightedPriorityAging, WEIGHT_INCREMENTS
+from robot import Robot
+
+
+class TickWeights:
+    """
+    Referência do WEIGHTED_PRIORITY com pesos explícitos: a cada tick soma o incremento da prioridade
+    em todos os robôs da fila (atualização original, O(n) por reordenação).
+    """
+
+    def __init__(self):
+        self.queue = []  # [(sequência, robô)]
+        self.weights = {}
+        self.sequence = 0
+
+    def advance(self):
+        for _, robot in self.queue:
+            self.weights[robot.name] += WEIGHT_INCREMENTS.get(robot.priority, 0)
+
+    def push(self, robot, base_weight=0):
+        self.weights[robot.name] = base_weight + WEIGHT_INCREMENTS.get(robot.priority, 0)
+        self.queue.append((self.sequence, robot))
+        self.sequence += 1
+
+    def ordered(self):
+        entries = sorted(self.queue, key=lambda entry: (-self.weights[entry[1].name], entry[1].priority, entry[0]))
+        return [robot for _, robot in entries]
+
+    def pop(self):
+        if not self.queue:
+            return None
+        robot = self.ordered()[0]
+        self.queue = [entry for entry in self.queue if entry[1] is not robot]
+        return robot
+
+
+def _names(robots):
+    return [robot.name for robot in robots]
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_lazy_aging_matches_per_tick_update(seed):
+    rng = random.Random(seed)
+    robots = [Robot(f"R{number}", rng.choice((1, 2, 3, 4))) for number in range(rng.randint(1, 10))]
+    aging, reference = WeightedPriorityAging(), TickWeights()
+    aging.advance()
+    for robot in robots:
+        base_weight = rng.randint(0, 5)
+        aging.push(robot, base_weight)
+        reference.push(robot, base_weight)
+    outside = []
+
+    for _ in range(300):
+        operation = rng.random()
+        if operation < 0.4:
+            robot = aging.pop()
+            expected = reference.pop()
+            assert (robot and robot.name) == (expected and expected.name)
+            if robot is not None:
+                outside.append(robot)
+        elif operation < 0.8 and outside:
+            robot = outside.pop(rng.randrange(len(outside)))
+            aging.advance()
+            reference.advance()
+            aging.push(robot)
+            reference.push(robot)
+        else:
+            aging.advance()
+            reference.advance()
+
+        assert _names(aging.ordered()) == _names(reference.ordered())
+        assert len(aging) == len(reference.queue)
+        # Pesos dos robôs na fila e, para os que saíram, o peso no momento da saída
+        assert aging.weights() == {name: {"weight": weight} for name, weight in reference.weights.items()}
+
+
+def test_lazy_aging_matches_weighted_priority_sort():
+    robots = [Robot("R1", 3), Robot("R2", 1), Robot("R3", 2), Robot("R4", 1), Robot("R5", 3)]
+    sorter = QueueSortingAlgorithm("WEIGHTED_PRIORITY")
+    queue, data = sorter.sort(list(robots), {})
+    aging = WeightedPriorityAging()
+    aging.advance()
+    for robot in robots:
+        aging.push(robot, 0)
+    # A ordenação original zera o último robô da fila antes de somar os incrementos
+    assert _names(aging.ordered()) == _names(queue)
+    assert aging.weights() == data
+
+    for _ in range(6):
+        robot = queue.pop(0)
+        assert aging.pop() is robot
+        queue, data = sorter.sort(queue + [robot], data)
+        aging.advance()
+        aging.push(robot)
+        assert _names(aging.ordered()) == _names(queue)
+        assert aging.weights() == data
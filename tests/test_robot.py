@@ -0,0 +1,28 @@
+import gc
+
+import robot as robot_module
+from robot import Robot
+
+
+def test_intern_shares_instances():
+    robot = Robot.intern("R1", 2)
+
+    assert Robot.intern("R1", 2) is robot
+    assert Robot.intern("R1", 1) is not robot
+
+
+def test_interned_robots_are_released():
+    robot = Robot.intern("R_unused")
+    assert ("R_unused", 0) in robot_module._interned
+
+    del robot
+    gc.collect()
+
+    assert ("R_unused", 0) not in robot_module._interned
+
+
+def test_clear_interned():
+    robot = Robot.intern("R1")
+    Robot.clear_interned()
+
+    assert Robot.intern("R1") is not robot
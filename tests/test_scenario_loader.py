@@ -0,0 +1,85 @@
+import os
+
+import pytest
+
+import scenario_loader
+from scenario_loader import ENGINES, read_bp_schedule, read_dynamic_queue, read_execution_dataset, set_cache
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+READERS = [
+    (read_execution_dataset, os.path.join("ct_04", "ct_4_execution_dataset.csv")),
+    (read_execution_dataset, "execution_dataset.csv"),
+    (read_bp_schedule, os.path.join("ct_04", "ct_4_bp_scheduler.csv")),
+    (read_dynamic_queue, "dynamic_queue.csv"),
+]
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    cache_dir = tmp_path / "cache"
+    set_cache(enabled=True, cache_dir=str(cache_dir))
+    yield cache_dir
+    set_cache(enabled=False)
+
+
+@pytest.fixture
+def digests(monkeypatch):
+    # Conta quantas vezes o conteúdo do CSV é lido para o hash
+    calls = []
+    digest = scenario_loader._content_digest
+    monkeypatch.setattr(scenario_loader, "_content_digest", lambda file_path: calls.append(file_path) or digest(file_path))
+    return calls
+
+
+@pytest.mark.parametrize("reader, file_name", READERS)
+def test_engines_agree(reader, file_name):
+    file_path = os.path.join(DATA_DIR, file_name)
+    assert reader(file_path, "csv") == reader(file_path, "pandas")
+
+
+def _queue(write_csv, robots):
+    return write_csv("dynamic_queue.csv", ["queue_position", "robot", "priority"],
+                     [(position, robot, priority) for position, (robot, priority) in enumerate(robots, start=1)])
+
+
+def test_cache_hit_skips_hash(write_csv, cache_dir, digests):
+    file_path = _queue(write_csv, [("R1", 1), ("R2", 2)])
+    rows = read_dynamic_queue(file_path, "csv")
+    digests.clear()
+
+    assert read_dynamic_queue(file_path, "csv") == rows
+    assert digests == []
+
+
+@pytest.mark.parametrize("robots", [[("R1", 1), ("R3", 2)], [("R1", 1), ("R2", 2), ("R3", 3)]])
+def test_changed_csv_is_reloaded(write_csv, cache_dir, robots):
+    file_path = _queue(write_csv, [("R1", 1), ("R2", 2)])
+    read_dynamic_queue(file_path, "csv")
+    stat = os.stat(file_path)
+
+    # O primeiro caso tem o mesmo tamanho: a mudança é detectada pelo mtime e confirmada pelo hash
+    _queue(write_csv, robots)
+    os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+    assert read_dynamic_queue(file_path, "csv") == robots
+
+
+def test_touched_csv_keeps_cache(write_csv, cache_dir, digests, monkeypatch):
+    file_path = _queue(write_csv, [("R1", 1), ("R2", 2)])
+    rows = read_dynamic_queue(file_path, "csv")
+    stat = os.stat(file_path)
+    os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    monkeypatch.setattr(scenario_loader, "_read_rows", None)  # Um acerto de cache não interpreta o CSV
+    digests.clear()
+
+    assert read_dynamic_queue(file_path, "csv") == rows
+    assert read_dynamic_queue(file_path, "csv") == rows
+    assert len(digests) == 1  # Só a primeira leitura depois do toque recalcula o hash
+
+
+def test_engine_is_part_of_the_key(write_csv, cache_dir):
+    file_path = _queue(write_csv, [("R1", 1), ("R2", 2)])
+    for engine in ENGINES:
+        read_dynamic_queue(file_path, engine)
+
+    assert len(os.listdir(cache_dir)) == len(ENGINES)
@@ -0,0 +1,107 @@
+from datetime import timedelta
+
+import pytest
+
+from dynamic_queue import DynamicQueue
+from execution_dataset import ExecutionDataset
+from machines import Machines
+from simulation import Simulation
+from simulation_log import SimulationLog
+from test_execution_dataset import BASE_TIME, HEADER
+
+FINISH_TIME = BASE_TIME + timedelta(days=1)
+
+
+def _window(minutes):
+    return (BASE_TIME + timedelta(minutes=minutes)).strftime("%Y-%m-%d %H:%M")
+
+
+@pytest.fixture
+def scenario(write_csv):
+    """
+    Cenário em que as janelas acabam nas primeiras horas e parte das execuções não cabe nelas (R2 tem duas
+    execuções longas na mesma janela): depois disso só restam execuções fora do dataset até o finish_time.
+    """
+    dataset_file = write_csv("execution_dataset.csv", HEADER, [
+        (1, "R1", 3, 5, _window(0), _window(60), False),
+        (2, "R1", 2, 5, _window(60), _window(180), False),
+        (3, "R2", 10, 6, _window(30), _window(90), False),
+        (4, "R2", 10, 6, _window(30), _window(90), False),
+        (5, "R3", 1, 4, None, None, True),
+    ])
+    queue_file = write_csv("dynamic_queue.csv", ["queue_position", "robot", "priority"],
+                           [(1, "R1", 1), (2, "R2", 2), (3, "R3", 3)])
+
+    def build(**termination):
+        return Simulation(ExecutionDataset(dataset_file), DynamicQueue(queue_file), Machines.from_count(2),
+                          SimulationLog(None, log_id_mode="sequential"), BASE_TIME, FINISH_TIME, **termination)
+    return build
+
+
+def test_without_policies_runs_until_finish_time(scenario):
+    result = scenario().run()
+    assert result.termination_reason == "finish_time"
+    assert not result.all_executions_complete
+
+
+def test_unsatisfiable_stops_early_and_keeps_the_log(scenario):
+    full = scenario()
+    full.run()
+    full_logs = full.simulation_log.get_logs()
+
+    simulation = scenario(termination_policies=["unsatisfiable"])
+    result = simulation.run()
+    logs = simulation.simulation_log.get_logs()
+
+    assert result.termination_reason == "unsatisfiable"
+    assert result.termination_policies == ("unsatisfiable",)
+    assert not result.all_executions_complete
+    # Para logo depois que a janela da última execução pendente (R2, até 90 minutos) termina
+    pending = simulation.execution_dataset.get_pending_executions()
+    assert pending and all(execution["robot"] == "R2" for execution in pending)
+    assert BASE_TIME + timedelta(minutes=90) < simulation.clock < BASE_TIME + timedelta(hours=2)
+    assert 0 < len(logs) < len(full_logs)
+    # A parada antecipada só interrompe a simulação: as linhas já registradas são as mesmas da execução completa
+    assert logs == full_logs[:len(logs)]
+    assert not simulation.execution_dataset.has_satisfiable_executions(simulation.clock)
+
+
+def test_all_complete_takes_precedence_over_unsatisfiable(write_csv):
+    dataset_file = write_csv("execution_dataset.csv", HEADER, [(1, "R1", 1, 1, _window(0), _window(60), False)])
+    queue_file = write_csv("dynamic_queue.csv", ["queue_position", "robot", "priority"], [(1, "R1", 1)])
+    simulation = Simulation(ExecutionDataset(dataset_file), DynamicQueue(queue_file), Machines.from_count(1),
+                            SimulationLog(None), BASE_TIME, FINISH_TIME,
+                            termination_policies=["unsatisfiable", "all_complete"])
+    assert simulation.run().termination_reason == "all_complete"
+
+
+@pytest.mark.parametrize("max_events", [0, 1, 7, 50])
+def test_max_events_caps_processed_events(scenario, max_events):
+    full = scenario()
+    full.run()
+    assert full.events_processed > max_events
+
+    simulation = scenario(max_events=max_events)
+    result = simulation.run()
+
+    assert result.termination_reason == "max_events"
+    assert result.max_events == max_events
+    assert simulation.events_processed == max_events
+    logs = simulation.simulation_log.get_logs()
+    assert logs == full.simulation_log.get_logs()[:len(logs)]
+
+
+def test_max_events_counts_from_set_termination(scenario):
+    simulation = scenario(max_events=10)
+    simulation.run()
+    # Um novo limite vale a partir dos eventos já processados (ex: simulação retomada de um checkpoint)
+    simulation.set_termination(max_events=5)
+    while simulation.advance():
+        pass
+    assert simulation.termination_reason == "max_events"
+    assert simulation.events_processed == 15
+
+
+def test_unknown_policy_is_rejected(scenario):
+    with pytest.raises(ValueError):
+        scenario(termination_policies=["all_completed"])
@@ -0,0 +1,59 @@
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+from simulation_log import SimulationLog, read_log_chunks
+
+
+def _write_log(file_path, log_id_mode):
+    start = datetime(2025, 2, 20, 8, 0)
+    with SimulationLog(file_path, buffer_size=7, log_id_mode=log_id_mode) as simulation_log:
+        for number in range(50):
+            event_time = start + timedelta(minutes=number)
+            if number % 5 == 0:
+                simulation_log.log("run_over", f"R{number % 3}", "M1", event_time, event_time)
+            else:
+                simulation_log.log("robot_execution", f"R{number % 3}", f"M{number % 2}", event_time, event_time + timedelta(minutes=3), number)
+                simulation_log.log("completion_percentage", None, None, event_time, event_time, number, number / 2)
+    return simulation_log
+
+
+def _read(file_path):
+    log = pd.concat(read_log_chunks(file_path), ignore_index=True)
+    return log.astype({column: object for column in ("event_type", "robot", "machine")})
+
+
+@pytest.mark.parametrize("log_id_mode", ["sequential", "uuid"])
+def test_npz_log_matches_csv(tmp_path, log_id_mode):
+    _write_log(str(tmp_path / "log.csv"), "sequential")
+    simulation_log = _write_log(str(tmp_path / "log.npz"), log_id_mode)
+
+    expected = _read(str(tmp_path / "log.csv")).drop(columns="log_id")
+    written = _read(str(tmp_path / "log.npz"))
+
+    pd.testing.assert_frame_equal(written.drop(columns="log_id"), expected, check_dtype=False)
+    assert written["log_id"].is_unique and len(written) == 90
+    assert not [name for name in tmp_path.iterdir() if name.name.startswith(".npz_part_")]
+    assert simulation_log.sink._parts is None
+
+
+def test_npz_close_twice_keeps_log(tmp_path):
+    file_path = str(tmp_path / "log.npz")
+    simulation_log = _write_log(file_path, "sequential")
+    simulation_log.close()
+
+    assert len(_read(file_path)) == 90
+
+
+@pytest.mark.parametrize("chunksize", [1, 7, 90, 1000])
+def test_npz_chunks(tmp_path, chunksize):
+    file_path = str(tmp_path / "log.npz")
+    _write_log(file_path, "sequential")
+    columns = ["execution_id", "event_type", "start_time", "data"]
+
+    chunks = list(read_log_chunks(file_path, columns, chunksize))
+
+    assert [len(chunk) for chunk in chunks[:-1]] == [chunksize] * (len(chunks) - 1)
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), pd.concat(read_log_chunks(file_path, columns, 10 ** 6), ignore_index=True))
+    assert list(chunks[0].columns) == columns